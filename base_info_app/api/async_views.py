@@ -0,0 +1,32 @@
+import asyncio
+
+from django.db.models import Sum
+from core.async_api import AsyncAPIView
+from offers_app.models import Offer
+from profile_app.models import UserProfile
+from reviews_app.models import BusinessRatingSummary
+
+
+class AsyncBaseInfoView(AsyncAPIView):
+    """
+    Async variant of BaseInfoView.
+
+    The business profile count, the offer count and the rating totals are
+    requested together with asyncio.gather instead of one after another.
+    """
+
+    async def get(self, request):
+        business_profile_count, offer_count, ratings = await asyncio.gather(
+            UserProfile.objects.filter(type="business").acount(),
+            Offer.objects.acount(),
+            BusinessRatingSummary.objects.aaggregate(
+                review_count=Sum('review_count'), rating_sum=Sum('rating_sum')),
+        )
+        review_count = ratings['review_count'] or 0
+        average_rating = ratings['rating_sum'] / review_count if review_count else 0
+        return self.render({
+            'review_count': int(review_count),
+            'average_rating': float(round(average_rating, 1)),
+            'business_profile_count': int(business_profile_count),
+            'offer_count': int(offer_count)
+        })
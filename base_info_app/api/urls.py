@@ -1,12 +1,15 @@
 from django.urls import path, include
 from .views import BaseInfoView
+from .async_views import AsyncBaseInfoView
 
 """URL configuration for platform base information endpoint.
 
 Provides a route to retrieve aggregated statistics such as counts of
-business profiles, reviews, offers, and the average review rating.
+business profiles, reviews, offers, and the average review rating,
+and its async variant.
 """
 
 urlpatterns = [
-    path('base-info/', BaseInfoView.as_view(), name="base-info")
+    path('base-info/', BaseInfoView.as_view(), name="base-info"),
+    path('async/base-info/', AsyncBaseInfoView.as_view(), name="base-info-async"),
 ]
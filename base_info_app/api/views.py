@@ -3,8 +3,8 @@ from rest_framework import status
 from rest_framework.views import APIView
 from offers_app.models import Offer
 from profile_app.models import UserProfile
-from reviews_app.models import Review
-from django.db.models import Avg
+from reviews_app.models import BusinessRatingSummary
+from django.db.models import Sum
 from rest_framework.response import Response
 
 
@@ -27,9 +27,10 @@ class BaseInfoView(APIView):
         """
         business_profile_count = UserProfile.objects.filter(
             type="business").count()
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(
-            Avg('rating'))['rating__avg'] or 0
+        ratings = BusinessRatingSummary.objects.aggregate(
+            review_count=Sum('review_count'), rating_sum=Sum('rating_sum'))
+        review_count = ratings['review_count'] or 0
+        average_rating = ratings['rating_sum'] / review_count if review_count else 0
         rounded_average_rating = round(average_rating, 1)
         offer_count = Offer.objects.count()
         return Response({
@@ -1,3 +1,26 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
 
-# Create your tests here.
+from offers_app.models import Offer
+from profile_app.models import UserProfile
+from reviews_app.models import Review
+
+
+class BaseInfoTest(APITestCase):
+
+    def setUp(self):
+        business = User.objects.create(username="Shop")
+        UserProfile.objects.create(user=business, username="Shop", type="business")
+        customer = User.objects.create(username="Ann")
+        Offer.objects.create(user=business, title="Logo", description="A logo")
+        Review.objects.create(business_user=business, reviewer=customer, rating=4, description="Good")
+
+    def test_async_base_info_matches_sync_view(self):
+        sync_response = self.client.get(reverse("base-info"))
+        async_response = self.client.get(reverse("base-info-async"))
+
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json(), sync_response.json())
+        self.assertEqual(async_response.json()["average_rating"], 4.0)
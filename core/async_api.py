@@ -0,0 +1,165 @@
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.views import View
+from rest_framework import exceptions, status
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from user_auth_app.authentication import aauthenticate_key
+
+"""
+Base class for native async read-only endpoints.
+
+The views run on the event loop under ASGI and use the async ORM, so a
+request waiting for the database does not occupy a worker thread. They
+authenticate with the same tokens as the DRF views, are limited by the
+same throttles and answer errors and data in the same JSON format as the
+DRF views.
+"""
+
+
+async def authenticate_token(request):
+    """
+    Return the user of the `Authorization: Token <key>` header, or an
+    AnonymousUser if the header is missing.
+
+    Raises:
+        AuthenticationFailed: If the header is malformed, the token is unknown
+            or expired or the user is inactive (same messages as
+            ExpiringTokenAuthentication).
+    """
+    header = request.headers.get('Authorization', '').split()
+    if not header or header[0].lower() != 'token':
+        return AnonymousUser()
+    if len(header) != 2:
+        raise exceptions.AuthenticationFailed('Invalid token header. No credentials provided.')
+
+    user, _ = await aauthenticate_key(header[1])
+    return user
+
+
+def sse_message(data, event=None, id=None):
+    """
+    Return a Server-Sent Events message with `data` rendered as JSON by the
+    default renderer.
+    """
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    lines = []
+    if id is not None:
+        lines.append(b'id: %d' % id)
+    if event is not None:
+        lines.append(b'event: ' + event.encode())
+    lines.append(b'data: ' + renderer.render(data))
+    return b'\n'.join(lines) + b'\n\n'
+
+
+class AsyncAPIView(View):
+    """
+    Async counterpart of APIView for read-only endpoints.
+
+    Subclasses implement `async def get(self, request, *args, **kwargs)`,
+    where `request` is a DRF Request (for query_params and serializer context)
+    carrying the authenticated user, and return `self.render(data)`.
+
+    Attributes:
+        authentication_required (bool): Reject anonymous requests with 401,
+            like the IsAuthenticated permission.
+        throttle_classes (list): Throttles as for APIView, by default
+            DEFAULT_THROTTLE_CLASSES. ScopedSlidingWindowThrottle reads
+            `throttle_scope` and `throttle_scopes` (by HTTP method).
+    """
+    http_method_names = ['get', 'head', 'options']
+    authentication_required = False
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+
+    async def dispatch(self, request, *args, **kwargs):
+        handler = getattr(self, request.method.lower(), None)
+        if request.method.lower() not in self.http_method_names or handler is None:
+            return self.render(
+                {'detail': f'Method "{request.method}" not allowed.'},
+                status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+        drf_request = Request(request, authenticators=())
+        try:
+            drf_request.user = await authenticate_token(request)
+            self.check_permissions(drf_request)
+            self.request = drf_request
+            # The throttles count in the cache, whose client may block.
+            await sync_to_async(self.check_throttles)(drf_request)
+            return await handler(drf_request, *args, **kwargs)
+        except Http404:
+            return self.handle_exception(exceptions.NotFound())
+        except exceptions.APIException as exc:
+            return self.handle_exception(exc)
+
+    def check_permissions(self, request):
+        """
+        Raise NotAuthenticated if the view requires an authenticated user.
+        """
+        if self.authentication_required and not request.user.is_authenticated:
+            raise exceptions.NotAuthenticated()
+
+    def check_throttles(self, request):
+        """
+        Raise Throttled with the longest wait if any throttle rejects the
+        request, like APIView.check_throttles.
+        """
+        durations = [
+            throttle.wait() for throttle in (throttle_class() for throttle_class in self.throttle_classes)
+            if not throttle.allow_request(request, self)
+        ]
+        if durations:
+            durations = [duration for duration in durations if duration is not None]
+            raise exceptions.Throttled(max(durations, default=None))
+
+    def handle_exception(self, exc):
+        """
+        Render an APIException like the default DRF exception handler.
+        """
+        data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+        response = self.render(data, status=exc.status_code)
+        if isinstance(exc, (exceptions.NotAuthenticated, exceptions.AuthenticationFailed)):
+            response.status_code = status.HTTP_401_UNAUTHORIZED
+            response['WWW-Authenticate'] = 'Token'
+        if isinstance(exc, exceptions.Throttled) and exc.wait is not None:
+            response['Retry-After'] = '%d' % exc.wait
+        return response
+
+    def render(self, data, status=status.HTTP_200_OK):
+        """
+        Render the data with the default renderer of REST_FRAMEWORK.
+        """
+        renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+        content = renderer.render(data, renderer.media_type, {'response': None})
+        content_type = f'{renderer.media_type}; charset={renderer.charset}' if renderer.charset else renderer.media_type
+        return HttpResponse(content, status=status, content_type=content_type)
+
+    def stream_unavailable(self, request):
+        """
+        Return a 501 response for Server-Sent Events requests outside of
+        ASGI, where the stream would block a worker, or None under ASGI.
+        """
+        if isinstance(request._request, ASGIRequest):
+            return None
+        return self.render(
+            {'detail': 'Streams sind nur unter ASGI verfügbar.'},
+            status=status.HTTP_501_NOT_IMPLEMENTED)
+
+    def event_stream(self, messages):
+        """
+        Return a Server-Sent Events response streaming the byte messages of
+        an async iterator.
+        """
+        response = StreamingHttpResponse(messages, content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    async def options(self, request, *args, **kwargs):
+        response = HttpResponse()
+        response.headers['Allow'] = ', '.join(
+            method.upper() for method in self._allowed_methods())
+        response.headers['Content-Length'] = '0'
+        return response
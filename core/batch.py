@@ -0,0 +1,48 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+"""
+Batch lookups by id list, e.g. `/api/offerdetails/?ids=3,1,2`.
+
+All ids are resolved with one `IN` query. The results keep the requested
+order (duplicates once), and ids without a row are reported in `missing`
+instead of failing the whole request:
+
+    {"results": [{"id": 3, ...}, {"id": 1, ...}], "missing": [2]}
+
+At most BATCH_LOOKUP_MAX_IDS ids are accepted per request.
+"""
+
+
+def parse_id_list(param_value, param):
+    """
+    Return the distinct positive integer ids of a comma separated query
+    parameter, in the given order.
+
+    Raises ValidationError for empty lists, invalid ids and more than
+    BATCH_LOOKUP_MAX_IDS ids (duplicates included), before parsing the rest
+    of an oversized list.
+    """
+    max_ids = settings.BATCH_LOOKUP_MAX_IDS
+    ids = {}
+    for position, part in enumerate(param_value.split(',')):
+        if position >= max_ids:
+            raise ValidationError({param: f"Höchstens {max_ids} IDs pro Anfrage erlaubt."})
+        try:
+            value = int(part)
+            if value <= 0:
+                raise ValueError()
+        except ValueError:
+            raise ValidationError({param: f"Ungültige ID '{part.strip()}'. Erwartet sind positive Ganzzahlen, "
+                                          f"durch Kommas getrennt."})
+        ids[value] = None
+    return list(ids)
+
+
+def lookup_batch(queryset, ids, field='pk'):
+    """
+    Return the objects of `queryset` whose `field` is in `ids`, in the order
+    of `ids`, and the ids without an object.
+    """
+    objects = {getattr(obj, field): obj for obj in queryset.filter(**{f'{field}__in': ids})}
+    return [objects[value] for value in ids if value in objects], [value for value in ids if value not in objects]
@@ -0,0 +1,46 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+"""
+Environment driven cache configuration.
+
+CACHE_BACKEND selects the backend of the 'default' cache:
+
+    locmem (default)
+        Per-process memory. Throttle counters and replica stickiness are not
+        shared between worker processes.
+
+    redis
+        CACHE_LOCATION          Redis URL (default: redis://127.0.0.1:6379/1)
+
+    memcached
+        CACHE_LOCATION          host:port (default: 127.0.0.1:11211)
+
+CACHE_KEY_PREFIX separates several deployments that share one cache server.
+"""
+
+BACKENDS = {
+    'locmem': ('django.core.cache.backends.locmem.LocMemCache', 'coderr'),
+    'redis': ('django.core.cache.backends.redis.RedisCache', 'redis://127.0.0.1:6379/1'),
+    'memcached': ('django.core.cache.backends.memcached.PyMemcacheCache', '127.0.0.1:11211'),
+}
+
+
+def cache_config(env=None):
+    """
+    Return the CACHES setting for the backend selected by CACHE_BACKEND.
+    """
+    env = os.environ if env is None else env
+    name = env.get('CACHE_BACKEND', 'locmem')
+    if name not in BACKENDS:
+        raise ImproperlyConfigured(
+            f"Unknown CACHE_BACKEND '{name}', use one of {', '.join(BACKENDS)}")
+    backend, location = BACKENDS[name]
+    return {
+        'default': {
+            'BACKEND': backend,
+            'LOCATION': env.get('CACHE_LOCATION') or location,
+            'KEY_PREFIX': env.get('CACHE_KEY_PREFIX', ''),
+        },
+    }
@@ -0,0 +1,136 @@
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+"""
+Environment driven database configuration.
+
+DB_PROFILE selects the backend profile:
+
+    sqlite (default)
+        DB_NAME                 Database file (default: <BASE_DIR>/db.sqlite3)
+        DB_BUSY_TIMEOUT_MS      How long a writer waits for the lock (default: 5000)
+        DB_SQLITE_MMAP_SIZE     Bytes of the file mapped into memory (default: 128 MiB)
+        DB_SQLITE_CACHE_KB      Page cache size in KiB (default: 20000)
+        DB_SQLITE_TUNED         Set to 0 to fall back to plain SQLite defaults
+
+    postgres
+        DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+        DB_CONN_MAX_AGE         Seconds a persistent connection is reused (default: 600)
+        DB_POOL_MIN_SIZE        Enables psycopg connection pooling when set
+        DB_POOL_MAX_SIZE        Maximum pool size (default: 10)
+        DB_POOL_TIMEOUT         Seconds to wait for a pooled connection (default: 10)
+
+A read replica (see core/db_routers.py) is added as the 'replica' alias with:
+
+    DB_REPLICA_NAME             SQLite file or PostgreSQL database of the replica
+    DB_REPLICA_HOST             PostgreSQL host of the replica (default: DB_HOST)
+
+Persistent connections and the connection pool are mutually exclusive in
+Django, so CONN_MAX_AGE is set to 0 when pooling is enabled.
+"""
+
+
+def _int(env, name, default):
+    value = env.get(name)
+    if value in (None, ''):
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ImproperlyConfigured(f"{name} must be an integer, got '{value}'")
+
+
+def sqlite_init_command(mmap_size, cache_kb):
+    """
+    Return the PRAGMAs executed on every new SQLite connection.
+
+    WAL lets readers run next to a writer, synchronous=NORMAL is safe with WAL
+    and avoids an fsync per commit, and the memory map and page cache keep hot
+    pages out of read() calls.
+    """
+    return ';'.join([
+        'PRAGMA journal_mode=WAL',
+        'PRAGMA synchronous=NORMAL',
+        f'PRAGMA mmap_size={mmap_size}',
+        f'PRAGMA cache_size=-{cache_kb}',
+        'PRAGMA temp_store=MEMORY',
+        'PRAGMA foreign_keys=ON',
+    ])
+
+
+def sqlite_config(env, base_dir):
+    """
+    Return the settings of the tuned SQLite profile.
+
+    Transactions start with BEGIN IMMEDIATE, so a transaction that reads
+    before it writes takes the write lock up front and waits up to the busy
+    timeout for it, instead of failing with "database is locked" when it
+    tries to upgrade its read lock.
+    """
+    config = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': env.get('DB_NAME') or base_dir / 'db.sqlite3',
+    }
+    if env.get('DB_SQLITE_TUNED', '1') == '0':
+        return config
+
+    config['OPTIONS'] = {
+        'timeout': _int(env, 'DB_BUSY_TIMEOUT_MS', 5000) / 1000,
+        'transaction_mode': 'IMMEDIATE',
+        'init_command': sqlite_init_command(
+            _int(env, 'DB_SQLITE_MMAP_SIZE', 128 * 1024 * 1024),
+            _int(env, 'DB_SQLITE_CACHE_KB', 20000),
+        ),
+    }
+    return config
+
+
+def postgres_config(env):
+    """
+    Return the settings of the PostgreSQL profile with either persistent,
+    health-checked connections or a psycopg connection pool.
+    """
+    config = {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': env.get('DB_NAME', 'coderr'),
+        'USER': env.get('DB_USER', 'coderr'),
+        'PASSWORD': env.get('DB_PASSWORD', ''),
+        'HOST': env.get('DB_HOST', 'localhost'),
+        'PORT': env.get('DB_PORT', '5432'),
+        'CONN_MAX_AGE': _int(env, 'DB_CONN_MAX_AGE', 600),
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {},
+    }
+    if env.get('DB_POOL_MIN_SIZE'):
+        config['CONN_MAX_AGE'] = 0
+        config['OPTIONS']['pool'] = {
+            'min_size': _int(env, 'DB_POOL_MIN_SIZE', 2),
+            'max_size': _int(env, 'DB_POOL_MAX_SIZE', 10),
+            'timeout': _int(env, 'DB_POOL_TIMEOUT', 10),
+        }
+    return config
+
+
+def database_config(base_dir, env=None):
+    """
+    Return the DATABASES setting for the profile selected by DB_PROFILE.
+    """
+    env = os.environ if env is None else env
+    profile = env.get('DB_PROFILE', 'sqlite')
+    if profile == 'sqlite':
+        default = sqlite_config(env, base_dir)
+    elif profile == 'postgres':
+        default = postgres_config(env)
+    else:
+        raise ImproperlyConfigured(
+            f"Unknown DB_PROFILE '{profile}', use 'sqlite' or 'postgres'")
+    databases = {'default': default}
+
+    replica_name = env.get('DB_REPLICA_NAME')
+    if replica_name:
+        replica = dict(default, NAME=replica_name, TEST={'MIRROR': 'default'})
+        if profile == 'postgres':
+            replica['HOST'] = env.get('DB_REPLICA_HOST', default['HOST'])
+        databases['replica'] = replica
+    return databases
@@ -0,0 +1,191 @@
+import hashlib
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+"""
+Primary / replica routing with read-your-writes stickiness.
+
+Reads go to one of the REPLICA_DATABASES and writes to the primary
+('default'). Reads are sent to the primary instead when
+
+    - the request is a write (POST, PUT, PATCH, DELETE), so permission checks
+      and validation see the current data,
+    - the request already wrote something (any db_for_write call),
+    - the same client wrote within the last REPLICA_STICKY_SECONDS, so a user
+      always sees their own orders, reviews and offers right after creating them,
+    - the client authenticates with a token that was issued within the last
+      REPLICA_STICKY_SECONDS (see pin_client()), so a replica that has not
+      received the token yet does not reject the first request after login,
+    - the view sets `database_read_alias = 'default'` (per-view override), or
+    - the code runs inside `with read_from_primary():`.
+
+A view can also set `database_read_alias = 'replica'` to always read from
+the replica, even right after a write of the same client.
+"""
+
+_read_alias = ContextVar('read_alias', default=None)
+_pinned = ContextVar('pinned_to_primary', default=False)
+_wrote = ContextVar('wrote_to_primary', default=False)
+
+
+def get_replicas():
+    """
+    Return the configured replica aliases.
+    """
+    return getattr(settings, 'REPLICA_DATABASES', [])
+
+
+@contextmanager
+def read_from_primary():
+    """
+    Route all reads inside the block to the primary database.
+    """
+    token = _read_alias.set(DEFAULT_DB_ALIAS)
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def client_key(credential):
+    """
+    Return the cache key of the stickiness marker of a client credential
+    (Authorization header or session cookie).
+    """
+    digest = hashlib.sha256(credential.encode()).hexdigest()[:32]
+    return f'replica-pin:{digest}'
+
+
+def pin_client(credential):
+    """
+    Pin the client using `credential` to the primary for
+    REPLICA_STICKY_SECONDS, e.g. the Authorization header of a token issued
+    by the current request, which the request itself was not sent with.
+    """
+    if get_replicas():
+        cache.set(client_key(credential), 1, getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+
+
+class PrimaryReplicaRouter:
+    """
+    Database router that sends writes to the primary and reads to a replica
+    unless the current request is pinned to the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = get_replicas()
+        if not replicas:
+            return None
+        alias = _read_alias.get()
+        if alias is not None:
+            return alias
+        if _pinned.get():
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        _pinned.set(True)
+        _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        databases = {DEFAULT_DB_ALIAS, *get_replicas()}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+
+class ReplicaStickinessMiddleware:
+    """
+    Pin requests to the primary while they write and for a short time after
+    a client's last write.
+
+    Clients are identified by their Authorization header or session cookie.
+    A marker that expires after REPLICA_STICKY_SECONDS is stored in the cache
+    after each write, so all worker processes see it. Under ASGI the
+    middleware runs on the event loop, and the context variables are set and
+    reset in the coroutine of the request.
+    """
+    write_methods = ('POST', 'PUT', 'PATCH', 'DELETE')
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not get_replicas():
+            return self.get_response(request)
+
+        pin_key = self.get_client_key(request)
+        pinned = request.method in self.write_methods or (
+            pin_key is not None and cache.get(pin_key) is not None)
+        tokens = (_pinned.set(pinned), _wrote.set(False), _read_alias.set(None))
+        try:
+            response = self.get_response(request)
+            if pin_key is not None and _wrote.get():
+                cache.set(pin_key, 1, getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+            return response
+        finally:
+            for token in tokens:
+                token.var.reset(token)
+
+    async def __acall__(self, request):
+        if not get_replicas():
+            return await self.get_response(request)
+
+        pin_key = self.get_client_key(request)
+        pinned = request.method in self.write_methods or (
+            pin_key is not None and await cache.aget(pin_key) is not None)
+        tokens = (_pinned.set(pinned), _wrote.set(False), _read_alias.set(None))
+        try:
+            response = await self.get_response(request)
+            if pin_key is not None and _wrote.get():
+                await cache.aset(pin_key, 1, getattr(settings, 'REPLICA_STICKY_SECONDS', 5))
+            return response
+        finally:
+            for token in tokens:
+                token.var.reset(token)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.set_read_alias(view_func)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        """
+        process_view() of the async chain, which sets the alias on the event
+        loop, in the context of the request coroutine.
+        """
+        self.set_read_alias(view_func)
+
+    def set_read_alias(self, view_func):
+        """
+        Apply the `database_read_alias` of the view class, if any.
+        """
+        if not get_replicas():
+            return
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        alias = getattr(view_class, 'database_read_alias', None)
+        if alias is not None:
+            if alias == 'replica':
+                alias = random.choice(get_replicas())
+            _read_alias.set(alias)
+
+    def get_client_key(self, request):
+        credential = (
+            request.headers.get('Authorization')
+            or request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        )
+        if not credential:
+            return None
+        return client_key(credential)
@@ -0,0 +1,284 @@
+from types import MethodType
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import ISO_8601, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.instrumentation import measure_serialization
+
+"""
+Read-only list serializers that work on `.values()` rows.
+
+A ModelSerializer creates a model instance per row and then walks its
+fields, resolving every attribute through `get_attribute()`. For large list
+pages this overhead dominates the response time. A ValuesSerializer reads
+the rows as dicts and maps each column with a function compiled once per
+class from the fields of `serializer_class`, so the output (and the
+rendered JSON) is identical to the ModelSerializer's.
+
+Fields that are not plain columns (SerializerMethodFields, nested
+serializers) are built by a `represent_<field>(self, row)` method, which can
+use the `field_values` columns of the field and lookups prepared for the
+whole page in `prepare()`.
+
+Clients can trim and extend the rows:
+
+    ?fields=id,title,min_price      only these fields, and only their columns
+                                    are selected
+    ?expand=reviewer                replace the id of a relation by the object
+                                    (see `expandable`)
+
+Views opt in with FastListMixin and `fast_serializer_class`. Setting
+FAST_LIST_SERIALIZERS to False switches the views back to their regular
+serializer, except for requests with `fields` or `expand`.
+"""
+
+_IDENTITY_FIELDS = (
+    serializers.IntegerField,
+    serializers.CharField,
+    serializers.BooleanField,
+    serializers.ChoiceField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+# Public user fields returned for an expanded user relation.
+USER_EXPANSION_FIELDS = ('username', 'first_name', 'last_name')
+
+
+def fast_serializers_enabled():
+    return getattr(settings, 'FAST_LIST_SERIALIZERS', True)
+
+
+class ValuesSerializer:
+    """
+    Reproduce the list output of `serializer_class` from `.values()` rows.
+
+    Attributes:
+        serializer_class: The ModelSerializer whose output is reproduced.
+        field_values (dict): Columns (also across relations) read by the
+            `represent_<field>` method of a field.
+        expandable (dict): Fields that `?expand=` can replace by an object.
+            Maps a foreign key to the columns of the related object, or to
+            None if `represent_<field>` expands the field itself.
+    """
+    serializer_class = None
+    field_values = {}
+    expandable = {}
+
+    def __init__(self, rows, context=None, fields=None, expand=()):
+        self.rows = rows
+        self.context = context or {}
+        self.fields = fields
+        self.expand = set(expand)
+
+    @classmethod
+    def values(cls, queryset, fields=None, expand=(), extra=()):
+        """
+        Return the values() queryset with the columns of the selected fields
+        (all by default), of the expanded relations and the `extra` columns.
+        """
+        columns = []
+        for name, column, _, _ in cls.get_mappers():
+            if fields is not None and name not in fields:
+                continue
+            if column is not None:
+                columns.append(column)
+            columns.extend(cls.field_values.get(name, ()))
+            if name in expand and cls.expandable.get(name):
+                columns.extend(f'{column}__{related}' for related in cls.expandable[name])
+        columns.extend(extra)
+        return queryset.prefetch_related(None).values(*dict.fromkeys(columns))
+
+    @classmethod
+    def field_names(cls):
+        return [name for name, _, _, _ in cls.get_mappers()]
+
+    @classmethod
+    def parse_query_params(cls, query_params):
+        """
+        Return the (fields, expand) requested with `?fields=` and `?expand=`.
+        fields is None if all fields were requested.
+
+        Raises:
+            ValidationError: For unknown field or relation names.
+        """
+        fields = _split_param(query_params.get('fields'))
+        expand = _split_param(query_params.get('expand')) or []
+        unknown_fields = [name for name in fields or () if name not in cls.field_names()]
+        if unknown_fields:
+            raise ValidationError({'fields': f"Unbekannte Felder: {', '.join(unknown_fields)}. "
+                                             f"Erlaubt sind: {', '.join(cls.field_names())}"})
+        unknown_expand = [name for name in expand if name not in cls.expandable]
+        if unknown_expand:
+            raise ValidationError({'expand': f"Nicht erweiterbar: {', '.join(unknown_expand)}. "
+                                             f"Erlaubt sind: {', '.join(cls.expandable) or '-'}"})
+        if fields is not None:
+            fields = {*fields, *expand}
+        return fields, expand
+
+    @classmethod
+    def get_mappers(cls):
+        """
+        Return (output name, column, mapper, bind) per field, compiled once
+        per class. Mappers with `bind` take the serializer as first argument.
+        """
+        if '_mappers' not in cls.__dict__:
+            cls._mappers = [
+                cls.compile_field(name, field)
+                for name, field in cls.serializer_class().fields.items()
+                if not field.write_only
+            ]
+        return cls._mappers
+
+    @classmethod
+    def compile_field(cls, name, field):
+        represent = getattr(cls, f'represent_{name}', None)
+        if represent is not None:
+            return name, None, represent, True
+        if isinstance(field, (serializers.SerializerMethodField, serializers.BaseSerializer)):
+            raise TypeError(
+                f"{cls.__name__} needs a represent_{name}() method for the field '{name}'")
+
+        if isinstance(field, serializers.FloatField):
+            mapper = float
+        elif isinstance(field, serializers.FileField):
+            return name, field.source, cls.compile_file_field(field), True
+        elif isinstance(field, serializers.DateTimeField):
+            return name, field.source, cls.compile_datetime_field(field), True
+        elif isinstance(field, _IDENTITY_FIELDS) or (
+                isinstance(field, serializers.JSONField) and not field.binary):
+            mapper = None
+        else:
+            mapper = field.to_representation
+        return name, field.source, mapper, False
+
+    @classmethod
+    def compile_file_field(cls, field):
+        """
+        Return a mapper from the stored file name to the URL FileField renders.
+        """
+        storage = cls.serializer_class.Meta.model._meta.get_field(field.source).storage
+
+        def file_url(self, name):
+            if not name:
+                return None
+            url = storage.url(name)
+            request = self.context.get('request')
+            return request.build_absolute_uri(url) if request is not None else url
+
+        return file_url
+
+    @classmethod
+    def compile_datetime_field(cls, field):
+        """
+        Return a mapper for ISO 8601 output that converts aware datetimes to
+        the timezone resolved once per page, and leaves anything else to
+        DateTimeField.to_representation.
+        """
+        output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+        if output_format is None or output_format.lower() != ISO_8601 or hasattr(field, 'timezone'):
+            return lambda self, value: field.to_representation(value)
+
+        def iso_datetime(self, value):
+            if self.timezone is None or isinstance(value, str) or timezone.is_naive(value):
+                return field.to_representation(value)
+            value = value.astimezone(self.timezone).isoformat()
+            return value[:-6] + 'Z' if value.endswith('+00:00') else value
+
+        return iso_datetime
+
+    def compile_expansion(self, name, column):
+        """
+        Return a row mapper that builds the related object of an expanded
+        foreign key from its `<column>__<field>` values.
+        """
+        related = self.expandable[name]
+
+        def expanded(row):
+            if row[column] is None:
+                return None
+            return {'id': row[column], **{field: row[f'{column}__{field}'] for field in related}}
+
+        return expanded
+
+    def selected(self, name):
+        """
+        Return True if the field is part of the output.
+        """
+        return self.fields is None or name in self.fields
+
+    def prepare(self, rows):
+        """
+        Hook for lookups over the whole page before the rows are mapped.
+        """
+
+    @property
+    def data(self):
+        with measure_serialization():
+            rows = list(self.rows)
+            self.prepare(rows)
+            self.timezone = timezone.get_current_timezone() if settings.USE_TZ else None
+            self.mappers = []
+            for name, column, mapper, bind in self.get_mappers():
+                if not self.selected(name):
+                    continue
+                if name in self.expand and self.expandable.get(name):
+                    self.mappers.append((name, None, self.compile_expansion(name, column)))
+                else:
+                    self.mappers.append((name, column, MethodType(mapper, self) if bind else mapper))
+            return [self.to_representation(row) for row in rows]
+
+    def to_representation(self, row):
+        data = {}
+        for name, column, mapper in self.mappers:
+            if column is None:
+                data[name] = mapper(row)
+                continue
+            value = row[column]
+            data[name] = value if value is None or mapper is None else mapper(value)
+        return data
+
+
+class FastListMixin:
+    """
+    Serve the list action of a generic view or viewset with
+    `fast_serializer_class`, a ValuesSerializer, when it is set.
+    Filtering, ordering and pagination work as before, and the list accepts
+    `?fields=` and `?expand=`.
+    """
+    fast_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        serializer_class = self.fast_serializer_class
+        sparse = 'fields' in request.query_params or 'expand' in request.query_params
+        if serializer_class is None or not (fast_serializers_enabled() or sparse):
+            return super().list(request, *args, **kwargs)
+
+        fields, expand = serializer_class.parse_query_params(request.query_params)
+        rows = serializer_class.values(
+            self.filter_queryset(self.get_queryset()), fields, expand, extra=self.get_row_keys())
+        context = self.get_serializer_context()
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(serializer_class(page, context, fields, expand).data)
+        return Response(serializer_class(rows, context, fields, expand).data)
+
+    def get_row_keys(self):
+        """
+        Return the columns pagination needs in every row, even if the client
+        did not select them: the id and the orderable fields.
+        """
+        model = self.fast_serializer_class.serializer_class.Meta.model
+        orderable = [
+            field for field in getattr(self, 'ordering_fields', None) or ()
+            if field in {model_field.name for model_field in model._meta.concrete_fields}
+        ]
+        return ['id', *orderable]
+
+
+def _split_param(value):
+    names = [name.strip() for name in (value or '').split(',') if name.strip()]
+    return names or None
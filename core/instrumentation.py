@@ -0,0 +1,303 @@
+import logging
+import re
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from rest_framework.serializers import BaseSerializer
+
+from core import metrics
+
+"""
+Per-request performance instrumentation.
+
+PerformanceMiddleware measures every request and records it in the metrics
+registry (core/metrics.py), tagged with the route name (`offer-list`,
+`orders-detail`, `reviews-list`, ...). With SERVER_TIMING enabled the
+numbers of the request are also sent in a `Server-Timing` header, which
+browsers show in the network panel:
+
+    Server-Timing: total;dur=18.2, db;dur=6.1;desc="9 queries, 4 duplicate",
+                   serialize;dur=1.3, app;dur=10.8
+
+SQL is measured with an execute wrapper on every database connection.
+Serialization is `serializer.data` (the to_representation of the whole
+serializer tree, see measure_serializers()) plus rendering with
+InstrumentedJSONRenderer (core/renderers.py), minus the queries it runs,
+which count as db time.
+
+With QUERY_INSPECTION set to 'log' or 'raise', a QueryInspector also groups
+the SQL of each request by statement shape and reports N+1 patterns (the
+same shape executed QUERY_REPEAT_THRESHOLD times or more) and queries slower
+than SLOW_QUERY_MS. 'log' writes warnings to the 'core.queries' logger,
+'raise' fails the request with QueryInspectionError, which the test runner
+(core/test_runner.py) enables for the test suite.
+"""
+
+logger = logging.getLogger('core.queries')
+
+_current = ContextVar('request_metrics', default=None)
+
+_IN_LIST = re.compile(r'\bIN \((?:%s|\?)(?:, ?(?:%s|\?))*\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w"])-?\d+(?:\.\d+)?\b')
+_WHITESPACE = re.compile(r'\s+')
+_TRANSACTION_STATEMENTS = ('SAVEPOINT', 'RELEASE SAVEPOINT', 'ROLLBACK TO SAVEPOINT')
+
+
+def normalize_sql(sql):
+    """
+    Return the shape of a statement: literals replaced by '?' and parameter
+    lists of any length collapsed, so `WHERE id = 1` and `WHERE id = 2`, or
+    `IN (%s, %s)` and `IN (%s)`, are the same statement.
+    """
+    sql = _STRING.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class QueryInspectionError(AssertionError):
+    """
+    A request executed an N+1 pattern or a query over the time budget.
+    """
+
+
+class QueryInspector:
+    """
+    Execute wrapper that groups the queries of a request by statement shape.
+
+    Attributes:
+        repeat_threshold (int): Number of executions of one shape that is
+            reported as N+1 pattern.
+        slow_query_ms (float): Time budget of a single query.
+    """
+
+    def __init__(self, repeat_threshold=5, slow_query_ms=100):
+        self.repeat_threshold = repeat_threshold
+        self.slow_query_ms = slow_query_ms
+        self.statements = {}
+        self.slow_queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            if not sql.startswith(_TRANSACTION_STATEMENTS):
+                shape = normalize_sql(sql)
+                self.statements[shape] = self.statements.get(shape, 0) + 1
+                if duration_ms > self.slow_query_ms:
+                    self.slow_queries.append((duration_ms, sql))
+
+    def repeated_statements(self):
+        """
+        Return (count, statement) of every shape at or over the threshold.
+        """
+        return sorted(
+            ((count, shape) for shape, count in self.statements.items()
+             if count >= self.repeat_threshold),
+            reverse=True)
+
+    def problems(self):
+        """
+        Return a description of every N+1 pattern and slow query.
+        """
+        return [
+            *(f'{count}x same query (N+1?): {shape}' for count, shape in self.repeated_statements()),
+            *(f'slow query ({duration:.0f} ms > {self.slow_query_ms} ms): {sql}'
+              for duration, sql in self.slow_queries),
+        ]
+
+
+def query_inspector():
+    """
+    Return a QueryInspector configured from the settings.
+    """
+    return QueryInspector(
+        repeat_threshold=getattr(settings, 'QUERY_REPEAT_THRESHOLD', 5),
+        slow_query_ms=getattr(settings, 'SLOW_QUERY_MS', 100),
+    )
+
+
+class RequestMetrics:
+    """
+    Timings and query statistics of one request. Used as database execute
+    wrapper while the request runs.
+    """
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.db_time = 0.0
+        self.queries = 0
+        self.duplicates = 0
+        self.serialize_time = 0.0
+        self.serializing = False
+        self.statements = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+            statement = (sql, repr(params))
+            if statement in self.statements:
+                self.duplicates += 1
+            else:
+                self.statements.add(statement)
+
+
+def current_metrics():
+    """
+    Return the RequestMetrics of the running request, or None.
+    """
+    return _current.get()
+
+
+@contextmanager
+def measure_serialization():
+    """
+    Add the time spent in the block to the serialization time of the request,
+    except for its queries. Nested blocks are counted once.
+    """
+    request_metrics = _current.get()
+    if request_metrics is None or request_metrics.serializing:
+        yield
+        return
+    request_metrics.serializing = True
+    started = time.perf_counter()
+    db_time = request_metrics.db_time
+    try:
+        yield
+    finally:
+        request_metrics.serializing = False
+        request_metrics.serialize_time += (
+            time.perf_counter() - started - (request_metrics.db_time - db_time))
+
+
+def measure_serializers():
+    """
+    Count the time of `serializer.data` of every DRF serializer as
+    serialization time. DRF has no hook for it, so the `data` property of
+    BaseSerializer, which Serializer.data and ListSerializer.data call, is
+    wrapped once per process.
+    """
+    data = BaseSerializer.data.fget
+    if getattr(data, 'measured', False):
+        return
+
+    def measured_data(serializer):
+        with measure_serialization():
+            return data(serializer)
+
+    measured_data.measured = True
+    BaseSerializer.data = property(measured_data)
+
+
+def route_name(request):
+    """
+    Return the URL name of the matched route, the route pattern for unnamed
+    routes, or 'unmatched'.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.url_name or match.route
+
+
+class PerformanceMiddleware:
+    """
+    Record total time, SQL time, query and duplicate query count,
+    serialization time and response size of every request.
+
+    The middleware is sync and async capable, so under ASGI the requests of
+    async views are measured on the event loop without a thread switch.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        measure_serializers()
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        with self.measure() as (request_metrics, inspector):
+            response = self.get_response(request)
+        return self.finish(request, response, request_metrics, inspector)
+
+    async def __acall__(self, request):
+        with self.measure() as (request_metrics, inspector):
+            response = await self.get_response(request)
+        return self.finish(request, response, request_metrics, inspector)
+
+    @contextmanager
+    def measure(self):
+        """
+        Install the execute wrappers and the RequestMetrics of the request
+        for the duration of the block.
+        """
+        request_metrics = RequestMetrics()
+        inspector = query_inspector() if self.inspection() != 'off' else None
+        token = _current.set(request_metrics)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(request_metrics))
+                    if inspector is not None:
+                        stack.enter_context(connection.execute_wrapper(inspector))
+                yield request_metrics, inspector
+        finally:
+            _current.reset(token)
+
+    def inspection(self):
+        return getattr(settings, 'QUERY_INSPECTION', 'off')
+
+    def finish(self, request, response, request_metrics, inspector):
+        total = time.perf_counter() - request_metrics.started
+        self.record(request, response, request_metrics, total)
+        if inspector is not None:
+            self.report_problems(request, inspector, self.inspection())
+        if getattr(settings, 'SERVER_TIMING', False):
+            response['Server-Timing'] = self.server_timing(request_metrics, total)
+        return response
+
+    def record(self, request, response, request_metrics, total):
+        labels = (route_name(request), request.method)
+        metrics.requests_total.inc(*labels, response.status_code)
+        metrics.request_duration.observe(*labels, value=total)
+        metrics.db_duration.observe(*labels, value=request_metrics.db_time)
+        metrics.db_queries.observe(*labels, value=request_metrics.queries)
+        if request_metrics.duplicates:
+            metrics.duplicate_queries.inc(*labels, amount=request_metrics.duplicates)
+        metrics.serialize_duration.observe(*labels, value=request_metrics.serialize_time)
+        if not response.streaming:
+            metrics.response_size.observe(*labels, value=len(response.content))
+
+    def report_problems(self, request, inspector, inspection):
+        problems = inspector.problems()
+        if not problems:
+            return
+        message = f'{request.method} {request.path} ({route_name(request)}):\n  ' + '\n  '.join(problems)
+        if inspection == 'raise':
+            raise QueryInspectionError(message)
+        logger.warning(message)
+
+    def server_timing(self, request_metrics, total):
+        app_time = total - request_metrics.db_time - request_metrics.serialize_time
+        return ', '.join([
+            f'total;dur={total * 1000:.1f}',
+            f'db;dur={request_metrics.db_time * 1000:.1f};'
+            f'desc="{request_metrics.queries} queries, {request_metrics.duplicates} duplicate"',
+            f'serialize;dur={request_metrics.serialize_time * 1000:.1f}',
+            f'app;dur={max(app_time, 0) * 1000:.1f}',
+        ])
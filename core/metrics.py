@@ -0,0 +1,182 @@
+import ipaddress
+import threading
+from bisect import bisect_left
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+"""
+In-process metrics registry with a Prometheus text endpoint.
+
+Every worker process keeps its own registry, so Prometheus should scrape each
+worker (or the numbers are per process). Metrics are created once at import
+time and updated under a lock; observing a value is a dict lookup and a few
+additions.
+"""
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+
+def _format_labels(labelnames, values, extra=''):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """
+    Monotonically increasing value per label combination.
+    """
+    type = 'counter'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self.lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def samples(self):
+        with self.lock:
+            items = sorted(self.values.items())
+        for labels, value in items:
+            yield f'{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}'
+
+
+class Histogram:
+    """
+    Distribution of observed values in cumulative buckets per label combination.
+    """
+    type = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.values = {}
+        self.lock = threading.Lock()
+
+    def observe(self, *labels, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            state = self.values.get(labels)
+            if state is None:
+                state = self.values[labels] = [[0] * (len(self.buckets) + 1), 0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def samples(self):
+        with self.lock:
+            items = sorted((labels, ([*state[0]], state[1], state[2]))
+                           for labels, state in self.values.items())
+        for labels, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), counts):
+                cumulative += bucket_count
+                label = _format_labels(self.labelnames, labels, f'le="{bound}"')
+                yield f'{self.name}_bucket{label} {cumulative}'
+            label = _format_labels(self.labelnames, labels)
+            yield f'{self.name}_sum{label} {_format_value(total)}'
+            yield f'{self.name}_count{label} {count}'
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered together in the Prometheus text format.
+    """
+
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, *args, **kwargs):
+        return self.register(Counter(*args, **kwargs))
+
+    def histogram(self, *args, **kwargs):
+        return self.register(Histogram(*args, **kwargs))
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.append(f'# HELP {metric.name} {metric.documentation}')
+            lines.append(f'# TYPE {metric.name} {metric.type}')
+            lines.extend(metric.samples())
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+requests_total = registry.counter(
+    'http_requests_total', 'Requests by route, method and status code.',
+    ('route', 'method', 'status'))
+request_duration = registry.histogram(
+    'http_request_duration_seconds', 'Time from the first middleware to the response.',
+    ('route', 'method'))
+db_duration = registry.histogram(
+    'http_request_db_duration_seconds', 'Time spent executing SQL per request.',
+    ('route', 'method'))
+db_queries = registry.histogram(
+    'http_request_db_queries', 'SQL queries per request.',
+    ('route', 'method'), buckets=COUNT_BUCKETS)
+duplicate_queries = registry.counter(
+    'http_request_duplicate_queries_total',
+    'Queries repeated with the same SQL and parameters within one request.',
+    ('route', 'method'))
+serialize_duration = registry.histogram(
+    'http_request_serialize_duration_seconds',
+    'Time spent in serializer.data and rendering the response, without queries.',
+    ('route', 'method'))
+response_size = registry.histogram(
+    'http_response_size_bytes', 'Size of the response body.',
+    ('route', 'method'), buckets=SIZE_BUCKETS)
+
+
+def is_local_request(request):
+    """
+    Return True for requests from a loopback address that did not pass a
+    proxy.
+    """
+    if 'X-Forwarded-For' in request.headers:
+        return False
+    try:
+        return ipaddress.ip_address(request.META.get('REMOTE_ADDR', '')).is_loopback
+    except ValueError:
+        return False
+
+
+def metrics_view(request):
+    """
+    Return the registry in the Prometheus text format.
+
+    When METRICS_TOKEN is set, the scraper must send it as
+    `Authorization: Bearer <token>`. Without a token only direct requests
+    from the same host (loopback address, no X-Forwarded-For header) are
+    answered.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        if request.headers.get('Authorization') != f'Bearer {token}':
+            return HttpResponseForbidden()
+    elif not is_local_request(request):
+        return HttpResponseForbidden()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
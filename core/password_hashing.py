@@ -0,0 +1,153 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+"""
+Bounded worker pool for password hashing.
+
+PBKDF2 with Django's default work factor takes a few hundred milliseconds of
+CPU per hash. Run on the request thread, a burst of logins or registrations
+occupies every worker and CPU core, and all other requests queue behind it.
+
+All hashes (make_password, password checks of login) run on a pool of
+PASSWORD_HASHING_WORKERS threads instead. hashlib releases the GIL while it
+hashes, so the threads use several cores. At most PASSWORD_HASHING_QUEUE
+further hashes wait for a free worker; a request that does not get a slot
+within PASSWORD_HASHING_WAIT_SECONDS fails fast with 503 and a Retry-After
+header instead of piling up. Async callers await the pool without blocking
+the event loop.
+
+PASSWORD_HASHING_WORKERS = 0 hashes on the calling thread, still limited to
+PASSWORD_HASHING_QUEUE concurrent hashes.
+"""
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Zu viele Anmeldungen gleichzeitig, bitte in Kürze erneut versuchen.'
+    default_code = 'password_hashing_busy'
+    # Sent as Retry-After by DRF's exception handler.
+    wait = 1
+
+
+class PasswordHashingPool:
+    """
+    Thread pool with a bounded number of running and waiting hashes.
+
+    Args:
+        workers (int): Hashing threads, 0 to hash on the calling thread.
+        queue_size (int): Hashes that may wait for a free worker.
+        wait_seconds (float): How long a caller waits for a slot.
+    """
+
+    def __init__(self, workers, queue_size, wait_seconds):
+        self.workers = workers
+        self.wait_seconds = wait_seconds
+        self.slots = threading.BoundedSemaphore(max(1, workers + queue_size))
+        self.executor = (
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix='password-hashing')
+            if workers else None
+        )
+
+    def acquire(self, blocking=True):
+        if blocking:
+            acquired = self.slots.acquire(timeout=self.wait_seconds)
+        else:
+            acquired = self.slots.acquire(blocking=False)
+        if not acquired:
+            raise PasswordHashingBusy()
+
+    def submit(self, function, *args, blocking=True):
+        """
+        Queue function(*args) and return its Future.
+
+        Raises:
+            PasswordHashingBusy: If no slot became free in time.
+        """
+        self.acquire(blocking)
+        try:
+            future = self.executor.submit(function, *args)
+        except BaseException:
+            self.slots.release()
+            raise
+        future.add_done_callback(lambda _: self.slots.release())
+        return future
+
+    def run(self, function, *args):
+        """
+        Return function(*args), computed on the pool.
+        """
+        if self.executor is None:
+            self.acquire()
+            try:
+                return function(*args)
+            finally:
+                self.slots.release()
+        return self.submit(function, *args).result()
+
+    async def arun(self, function, *args):
+        """
+        Await function(*args), computed on the pool. Does not wait for a slot
+        but fails right away when the pool is full.
+        """
+        if self.executor is None:
+            return self.run(function, *args)
+        return await asyncio.wrap_future(self.submit(function, *args, blocking=False))
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_hashing_pool():
+    """
+    Return the process wide pool configured by the PASSWORD_HASHING_* settings.
+    """
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = PasswordHashingPool(
+                    workers=getattr(settings, 'PASSWORD_HASHING_WORKERS', min(4, os.cpu_count() or 1)),
+                    queue_size=getattr(settings, 'PASSWORD_HASHING_QUEUE', 32),
+                    wait_seconds=getattr(settings, 'PASSWORD_HASHING_WAIT_SECONDS', 2),
+                )
+    return _pool
+
+
+@receiver(setting_changed)
+def reset_hashing_pool(*, setting, **kwargs):
+    global _pool
+    if setting.startswith('PASSWORD_HASHING_') and _pool is not None:
+        _pool.shutdown()
+        _pool = None
+
+
+def make_password(password):
+    """
+    Return the encoded hash of a raw password, computed on the pool.
+    """
+    return get_hashing_pool().run(hashers.make_password, password)
+
+
+def verify_password(password, encoded):
+    """
+    Return (is_correct, must_update) for a raw password, computed on the pool.
+    """
+    return get_hashing_pool().run(hashers.verify_password, password, encoded)
+
+
+async def averify_password(password, encoded):
+    return await get_hashing_pool().arun(hashers.verify_password, password, encoded)
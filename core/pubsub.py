@@ -0,0 +1,227 @@
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+"""
+Publish/subscribe for live pushes to streaming clients (ASGI).
+
+Subscribers are asyncio queues on the event loop of the ASGI process, so
+an idle client costs one queue and no queries. publish() may be called
+from any thread, e.g. the thread of a sync DRF view, and hands the message
+to the loops of the subscribers.
+
+PUBSUB_BACKEND selects how messages reach the subscribers:
+
+    memory (default)
+        Only the subscribers of the publishing process. Enough when the
+        API runs as a single ASGI process.
+
+    redis
+        PUBSUB_URL              Redis URL (default: redis://127.0.0.1:6379/2)
+
+        Messages are published to Redis (channel prefix PUBSUB_PREFIX), and
+        every process with subscribers listens on one connection and
+        delivers them to its local subscribers. Requires the redis package.
+
+Messages are JSON-serializable dicts. There is no replay: a client that
+reconnects reloads the current state first.
+"""
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """
+    Queue of the messages of one channel for one streaming client, an async
+    context manager that is subscribed while the `async with` block runs.
+
+    Attributes:
+        channel (str): The subscribed channel.
+        overflowed (bool): Messages were dropped because the client did not
+            read them fast enough; the stream should end so the client
+            reconnects and reloads.
+    """
+
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.maxsize = maxsize
+        self.loop = None
+        self.queue = None
+        self.overflowed = False
+
+    async def __aenter__(self):
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(self.maxsize)
+        self.broker.add(self)
+        await self.broker.started(self)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self.broker.remove(self)
+
+    def put(self, message):
+        # Runs on the subscriber's loop.
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout):
+        """
+        Return the next message, or None if none arrived within `timeout`
+        seconds.
+        """
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+
+class MemoryBroker:
+    """
+    Deliver messages to the subscriptions of this process.
+    """
+
+    def __init__(self):
+        self._subscriptions = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        self.deliver(channel, message)
+
+    def deliver(self, channel, message):
+        with self._lock:
+            subscriptions = list(self._subscriptions.get(channel, ()))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.put, message)
+            except RuntimeError:
+                # The loop of the subscriber was closed.
+                pass
+
+    def subscriber_count(self, channel=None):
+        with self._lock:
+            if channel is not None:
+                return len(self._subscriptions.get(channel, ()))
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+    def subscribe(self, channel, maxsize=100):
+        """
+        Return a subscription to a channel, to be used with `async with`.
+        """
+        return Subscription(self, channel, maxsize)
+
+    def add(self, subscription):
+        with self._lock:
+            self._subscriptions[subscription.channel].add(subscription)
+
+    def remove(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.channel, set())
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                self._subscriptions.pop(subscription.channel, None)
+
+    async def started(self, subscription):
+        """Hook for backends that listen for messages of other processes."""
+
+
+class RedisBroker(MemoryBroker):
+    """
+    Publish through Redis and deliver the messages of all processes to the
+    subscriptions of this process.
+    """
+
+    def __init__(self, url, prefix):
+        super().__init__()
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured("PUBSUB_BACKEND 'redis' requires the redis package.")
+        self.url = url
+        self.prefix = prefix
+        self._client = redis.Redis.from_url(url)
+        self._listeners = {}
+
+    def publish(self, channel, message):
+        self._client.publish(self.prefix + channel, json.dumps(message))
+
+    async def started(self, subscription):
+        loop = subscription.loop
+        listener = self._listeners.get(loop)
+        if listener is None or listener.done():
+            self._listeners[loop] = loop.create_task(self.listen())
+
+    async def listen(self):
+        """
+        Deliver the messages of all channels to the local subscriptions,
+        reconnecting after errors.
+        """
+        import redis.asyncio
+
+        while True:
+            try:
+                client = redis.asyncio.Redis.from_url(self.url)
+                async with client.pubsub() as pubsub:
+                    await pubsub.psubscribe(self.prefix + '*')
+                    async for item in pubsub.listen():
+                        if item['type'] != 'pmessage':
+                            continue
+                        channel = item['channel'].decode()[len(self.prefix):]
+                        self.deliver(channel, json.loads(item['data']))
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Pub/sub listener failed, reconnecting')
+                await asyncio.sleep(1)
+
+
+BACKENDS = {
+    'memory': lambda: MemoryBroker(),
+    'redis': lambda: RedisBroker(
+        getattr(settings, 'PUBSUB_URL', 'redis://127.0.0.1:6379/2'),
+        getattr(settings, 'PUBSUB_PREFIX', 'coderr:'),
+    ),
+}
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """
+    Return the process wide broker selected by PUBSUB_BACKEND.
+    """
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                name = getattr(settings, 'PUBSUB_BACKEND', 'memory')
+                if name not in BACKENDS:
+                    raise ImproperlyConfigured(
+                        f"Unknown PUBSUB_BACKEND '{name}', use one of {', '.join(BACKENDS)}")
+                _broker = BACKENDS[name]()
+    return _broker
+
+
+@receiver(setting_changed)
+def reset_broker(*, setting, **kwargs):
+    global _broker
+    if setting.startswith('PUBSUB_'):
+        _broker = None
+
+
+def publish(channel, message):
+    get_broker().publish(channel, message)
+
+
+def subscribe(channel, maxsize=100):
+    return get_broker().subscribe(channel, maxsize)
@@ -13,6 +13,9 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 import os
 from pathlib import Path
 
+from core.cache import cache_config
+from core.database import database_config
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -55,11 +58,16 @@ INSTALLED_APPS = [
     'orders_app',
     'reviews_app',
     'base_info_app',
+    'tools_app',
+    'jobs_app',
+    'events_app',
 ]
 
 MIDDLEWARE = [
+    'core.instrumentation.PerformanceMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'core.db_routers.ReplicaStickinessMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -70,7 +78,7 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework.authentication.TokenAuthentication',
+        'user_auth_app.authentication.ExpiringTokenAuthentication',
     ],
 
     'DEFAULT_PERMISSION_CLASSES': [
@@ -78,8 +86,32 @@ REST_FRAMEWORK = {
     ],
 
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'core.throttling.AnonSlidingWindowThrottle',
+        'core.throttling.UserSlidingWindowThrottle',
+        'core.throttling.ScopedSlidingWindowThrottle',
+    ],
+
+    # Requests per second, minute, hour or day, see core/throttling.py
+    'DEFAULT_THROTTLE_RATES': {
+        'anon': os.environ.get('THROTTLE_RATE_ANON', '300/min'),
+        'user': os.environ.get('THROTTLE_RATE_USER', '1200/min'),
+        'search': os.environ.get('THROTTLE_RATE_SEARCH', '120/min'),
+        'login': os.environ.get('THROTTLE_RATE_LOGIN', '20/min'),
+        'order_create': os.environ.get('THROTTLE_RATE_ORDER_CREATE', '30/min'),
+        'review_create': os.environ.get('THROTTLE_RATE_REVIEW_CREATE', '10/min'),
+        'stream': os.environ.get('THROTTLE_RATE_STREAM', '30/min'),
+    },
+
+    'DEFAULT_RENDERER_CLASSES': [
+        'core.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+
+    # orjson when installed, stdlib json otherwise, see core/renderers.py
+    'DEFAULT_PARSER_CLASSES': [
+        'core.renderers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
     ],
 
     'DEFAULT_FILTER_BACKENDS': ['django_filters.rest_framework.DjangoFilterBackend'],
@@ -107,13 +139,90 @@ WSGI_APPLICATION = 'core.wsgi.application'
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Selected and tuned through environment variables, see core/database.py
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-    }
-}
+DATABASES = database_config(BASE_DIR)
+
+# Reads go to the replicas, writes to 'default', see core/db_routers.py
+DATABASE_ROUTERS = ['core.db_routers.PrimaryReplicaRouter']
+REPLICA_DATABASES = [alias for alias in DATABASES if alias != 'default']
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Selected through environment variables, see core/cache.py
+
+CACHES = cache_config()
+THROTTLE_CACHE = os.environ.get('THROTTLE_CACHE', 'default')
+
+
+# Instrumentation, see core/instrumentation.py and core/metrics.py
+SERVER_TIMING = os.environ.get('SERVER_TIMING', '1') == '1'
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+
+# N+1 and slow query detection: 'off', 'log' or 'raise' (default in tests)
+QUERY_INSPECTION_FROM_ENV = 'QUERY_INSPECTION' in os.environ
+QUERY_INSPECTION = os.environ.get('QUERY_INSPECTION', 'log' if DEBUG else 'off')
+QUERY_REPEAT_THRESHOLD = int(os.environ.get('QUERY_REPEAT_THRESHOLD', 5))
+SLOW_QUERY_MS = int(os.environ.get('SLOW_QUERY_MS', 100))
+TEST_RUNNER = 'core.test_runner.QueryInspectingTestRunner'
+
+
+# Serve list endpoints from .values() rows, see core/fast_serializers.py
+FAST_LIST_SERIALIZERS = os.environ.get('FAST_LIST_SERIALIZERS', '1') == '1'
+
+
+# Password hashing off the request thread, see core/password_hashing.py
+
+AUTHENTICATION_BACKENDS = ['user_auth_app.backends.PooledModelBackend']
+PASSWORD_HASHING_WORKERS = int(os.environ.get('PASSWORD_HASHING_WORKERS', min(4, os.cpu_count() or 1)))
+PASSWORD_HASHING_QUEUE = int(os.environ.get('PASSWORD_HASHING_QUEUE', 32))
+PASSWORD_HASHING_WAIT_SECONDS = float(os.environ.get('PASSWORD_HASHING_WAIT_SECONDS', 2))
+
+# Expiring tokens, see user_auth_app/models.py and user_auth_app/authentication.py
+TOKEN_TTL_SECONDS = int(os.environ.get('TOKEN_TTL_SECONDS', 14 * 24 * 3600))
+TOKEN_ROTATION_SECONDS = int(os.environ.get('TOKEN_ROTATION_SECONDS', 24 * 3600))
+TOKEN_LAST_USED_INTERVAL = int(os.environ.get('TOKEN_LAST_USED_INTERVAL', 300))
+TOKEN_CACHE_SECONDS = int(os.environ.get('TOKEN_CACHE_SECONDS', 60))
+TOKEN_CACHE_SIZE = int(os.environ.get('TOKEN_CACHE_SIZE', 10000))
+
+# Guest login responses kept in memory, see user_auth_app/guests.py
+GUEST_LOGIN_CACHE_SECONDS = int(os.environ.get('GUEST_LOGIN_CACHE_SECONDS', 300))
+
+
+# Deferred side effects of writes, see jobs_app/queue.py
+# JOBS_EAGER runs tasks on enqueue instead of in `run_jobs` (default in tests)
+JOBS_EAGER_FROM_ENV = 'JOBS_EAGER' in os.environ
+JOBS_EAGER = os.environ.get('JOBS_EAGER', '0') == '1'
+JOBS_BATCH_SIZE = int(os.environ.get('JOBS_BATCH_SIZE', 100))
+JOBS_POLL_SECONDS = float(os.environ.get('JOBS_POLL_SECONDS', 1))
+JOBS_MAX_ATTEMPTS = int(os.environ.get('JOBS_MAX_ATTEMPTS', 5))
+JOBS_RETRY_BASE_SECONDS = float(os.environ.get('JOBS_RETRY_BASE_SECONDS', 5))
+JOBS_RETRY_MAX_SECONDS = float(os.environ.get('JOBS_RETRY_MAX_SECONDS', 3600))
+JOBS_LOCK_TIMEOUT_SECONDS = int(os.environ.get('JOBS_LOCK_TIMEOUT_SECONDS', 600))
+JOBS_KEEP_DONE_SECONDS = int(os.environ.get('JOBS_KEEP_DONE_SECONDS', 7 * 24 * 3600))
+
+
+# Change event feed and stream, see events_app
+EVENTS_FEED_LIMIT = int(os.environ.get('EVENTS_FEED_LIMIT', 100))
+EVENTS_FEED_MAX_LIMIT = int(os.environ.get('EVENTS_FEED_MAX_LIMIT', 1000))
+EVENTS_STREAM_POLL_SECONDS = float(os.environ.get('EVENTS_STREAM_POLL_SECONDS', 1))
+EVENTS_STREAM_HEARTBEAT_SECONDS = float(os.environ.get('EVENTS_STREAM_HEARTBEAT_SECONDS', 15))
+EVENTS_STREAM_SECONDS = float(os.environ.get('EVENTS_STREAM_SECONDS', 300))
+EVENTS_KEEP_SECONDS = int(os.environ.get('EVENTS_KEEP_SECONDS', 30 * 24 * 3600))
+
+
+# Batch lookups by id list, see core/batch.py
+BATCH_LOOKUP_MAX_IDS = int(os.environ.get('BATCH_LOOKUP_MAX_IDS', 100))
+
+
+# Live order status pushes, see core/pubsub.py and orders_app/api/async_views.py
+PUBSUB_BACKEND = os.environ.get('PUBSUB_BACKEND', 'memory')
+PUBSUB_URL = os.environ.get('PUBSUB_URL', 'redis://127.0.0.1:6379/2')
+PUBSUB_PREFIX = os.environ.get('PUBSUB_PREFIX', 'coderr:')
+ORDER_STREAM_SECONDS = float(os.environ.get('ORDER_STREAM_SECONDS', 3600))
+ORDER_STREAM_HEARTBEAT_SECONDS = float(os.environ.get('ORDER_STREAM_HEARTBEAT_SECONDS', 15))
 
 
 # Password validation
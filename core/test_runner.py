@@ -0,0 +1,31 @@
+from django.conf import settings
+from django.test import override_settings
+from django.test.runner import DiscoverRunner
+
+
+class QueryInspectingTestRunner(DiscoverRunner):
+    """
+    Test runner that fails requests with N+1 queries or slow queries
+    (see core/instrumentation.py), unless QUERY_INSPECTION is set explicitly
+    in the environment.
+
+    Jobs run on enqueue (see jobs_app/queue.py), unless JOBS_EAGER is set
+    explicitly in the environment.
+
+    The settings are overridden for the test run only and restored in
+    teardown_test_environment().
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        overrides = {}
+        if not settings.QUERY_INSPECTION_FROM_ENV:
+            overrides['QUERY_INSPECTION'] = 'raise'
+        if not settings.JOBS_EAGER_FROM_ENV:
+            overrides['JOBS_EAGER'] = True
+        self.test_settings = override_settings(**overrides)
+        self.test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.test_settings.disable()
+        super().teardown_test_environment(**kwargs)
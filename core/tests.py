@@ -0,0 +1,370 @@
+import asyncio
+import re
+import tempfile
+import time
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import patch
+
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.contrib.auth.models import User
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection, connections
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APITestCase
+
+from core.database import database_config
+from core.db_routers import PrimaryReplicaRouter, ReplicaStickinessMiddleware, read_from_primary
+from core.instrumentation import QueryInspector, RequestMetrics, normalize_sql
+from core.renderers import FastJSONParser, FastJSONRenderer
+from core.throttling import AnonSlidingWindowThrottle
+from offers_app.models import Offer
+from reviews_app.api.serializers import ReviewsListCreateSerializer
+from reviews_app.models import Review
+from user_auth_app.authentication import forget_tokens
+
+
+class DatabaseConfigTest(SimpleTestCase):
+
+    def test_sqlite_profile_is_tuned_by_default(self):
+        config = database_config(Path('/srv'), env={})['default']
+
+        self.assertEqual(config['NAME'], Path('/srv/db.sqlite3'))
+        self.assertEqual(config['OPTIONS']['transaction_mode'], 'IMMEDIATE')
+        self.assertEqual(config['OPTIONS']['timeout'], 5)
+        self.assertIn('PRAGMA journal_mode=WAL', config['OPTIONS']['init_command'])
+
+    def test_postgres_pool_disables_persistent_connections(self):
+        env = {'DB_PROFILE': 'postgres', 'DB_POOL_MIN_SIZE': '4'}
+        config = database_config(Path('/srv'), env=env)['default']
+
+        self.assertEqual(config['CONN_MAX_AGE'], 0)
+        self.assertEqual(config['OPTIONS']['pool']['min_size'], 4)
+        self.assertTrue(config['CONN_HEALTH_CHECKS'])
+
+    def test_replica_mirrors_primary_in_tests(self):
+        databases = database_config(Path('/srv'), env={'DB_REPLICA_NAME': '/srv/replica.sqlite3'})
+
+        self.assertEqual(databases['replica']['NAME'], '/srv/replica.sqlite3')
+        self.assertEqual(databases['replica']['TEST'], {'MIRROR': 'default'})
+        self.assertEqual(databases['replica']['OPTIONS'], databases['default']['OPTIONS'])
+
+    def test_unknown_profile_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            database_config(Path('/srv'), env={'DB_PROFILE': 'oracle'})
+
+
+@override_settings(REPLICA_DATABASES=['replica'], REPLICA_STICKY_SECONDS=5)
+class PrimaryReplicaRouterTest(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.router = PrimaryReplicaRouter()
+        self.factory = RequestFactory()
+
+    def route_reads(self, request, write=False, view_class=None):
+        """Run the middleware and return the alias a read in the view would use."""
+        routed = []
+
+        def view(request):
+            if write:
+                self.router.db_for_write(Offer)
+            routed.append(self.router.db_for_read(Offer))
+            return HttpResponse()
+
+        def get_response(request):
+            middleware.process_view(request, view, (), {})
+            return view(request)
+
+        view.cls = view_class
+        middleware = ReplicaStickinessMiddleware(get_response)
+        middleware(request)
+        return routed[0]
+
+    def test_reads_use_replica_and_writes_use_primary(self):
+        request = self.factory.get('/api/offers/', HTTP_AUTHORIZATION='Token a')
+        self.assertEqual(self.route_reads(request), 'replica')
+        self.assertEqual(self.router.db_for_write(Offer), 'default')
+
+    def test_client_reads_from_primary_after_own_write(self):
+        post = self.factory.post('/api/orders/', HTTP_AUTHORIZATION='Token a')
+        self.assertEqual(self.route_reads(post, write=True), 'default')
+
+        own_read = self.factory.get('/api/orders/', HTTP_AUTHORIZATION='Token a')
+        other_read = self.factory.get('/api/orders/', HTTP_AUTHORIZATION='Token b')
+        self.assertEqual(self.route_reads(own_read), 'default')
+        self.assertEqual(self.route_reads(other_read), 'replica')
+
+    def test_view_can_override_read_database(self):
+        class PrimaryOnlyView:
+            database_read_alias = 'default'
+
+        request = self.factory.get('/api/base-info/')
+        self.assertEqual(self.route_reads(request, view_class=PrimaryOnlyView), 'default')
+        with read_from_primary():
+            self.assertEqual(self.router.db_for_read(Offer), 'default')
+
+    async def test_async_requests_do_not_share_routing_state(self):
+        routed = {}
+
+        async def get_response(request):
+            token = request.headers['Authorization']
+            if request.method == 'POST':
+                self.router.db_for_write(Offer)
+            await asyncio.sleep(0)
+            routed[token] = self.router.db_for_read(Offer)
+            return HttpResponse()
+
+        middleware = ReplicaStickinessMiddleware(get_response)
+        await asyncio.gather(
+            middleware(self.factory.post('/api/orders/', HTTP_AUTHORIZATION='Token a')),
+            middleware(self.factory.get('/api/orders/', HTTP_AUTHORIZATION='Token b')),
+        )
+        await middleware(self.factory.get('/api/orders/', HTTP_AUTHORIZATION='Token a'))
+
+        self.assertEqual(routed, {'Token a': 'default', 'Token b': 'replica'})
+
+
+class LaggingReplicaTest(APITestCase):
+    """
+    Requests against the test database as primary and a second, migrated
+    but empty SQLite file as a replica that has not caught up yet.
+    """
+
+    databases = '__all__'
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directory = tempfile.TemporaryDirectory()
+        default = connections['default'].settings_dict
+        connections.settings['lagging'] = dict(
+            default, NAME=f'{cls.directory.name}/replica.sqlite3', TEST=dict(default['TEST'], MIRROR=None))
+        call_command('migrate', database='lagging', verbosity=0)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        connections['lagging'].close()
+        del connections['lagging']
+        del connections.settings['lagging']
+        cls.directory.cleanup()
+
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(REPLICA_DATABASES=['lagging'])
+    def test_token_issued_by_login_is_read_from_primary(self):
+        User.objects.create_user(username="Joe", password="joe123")
+        login = self.client.post(reverse('login'), {"username": "Joe", "password": "joe123"})
+        forget_tokens()
+
+        response = self.client.get(
+            '/api/profiles/business/', HTTP_AUTHORIZATION=f"Token {login.data['token']}")
+
+        self.assertEqual(login.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class SlidingWindowThrottleTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def make_throttle(self, now, rate='10/min'):
+        throttle = AnonSlidingWindowThrottle()
+        throttle.rate = rate
+        throttle.num_requests, throttle.duration = throttle.parse_rate(rate)
+        throttle.timer = lambda: now
+        return throttle
+
+    def hit(self, now, rate='10/min'):
+        request = Request(self.factory.get('/api/offers/'))
+        request.user = AnonymousUser()
+        throttle = self.make_throttle(now, rate)
+        return throttle.allow_request(request, None), throttle
+
+    def test_previous_window_is_weighted_by_overlap(self):
+        allowed = [self.hit(6000 + second)[0] for second in range(10)]
+        self.assertTrue(all(allowed))
+        self.assertFalse(self.hit(6010)[0])
+
+        # 45 of 60 seconds into the next window a quarter of the 10 allowed
+        # requests of the previous window still counts, so 7 requests fit
+        # and the 8th does not.
+        allowed = [self.hit(6105)[0] for _ in range(8)]
+        self.assertEqual(allowed, [True] * 7 + [False])
+
+    def test_client_over_the_rate_still_gets_the_rate(self):
+        # 12 requests per minute against a limit of 10, over five minutes.
+        allowed_per_window = []
+        for window in range(100, 105):
+            allowed = [self.hit(window * 60 + second)[0] for second in range(0, 60, 5)]
+            allowed_per_window.append(allowed.count(True))
+
+        self.assertEqual(allowed_per_window[0], 10)
+        for allowed in allowed_per_window[1:]:
+            self.assertGreaterEqual(allowed, 9)
+
+    def test_wait_reports_time_until_requests_are_allowed_again(self):
+        for _ in range(10):
+            self.hit(6000)
+        allowed, throttle = self.hit(6030)
+        self.assertFalse(allowed)
+        self.assertEqual(throttle.wait(), 30)
+
+    @override_settings(REST_FRAMEWORK={
+        'DEFAULT_AUTHENTICATION_CLASSES': ['rest_framework.authentication.TokenAuthentication'],
+        'DEFAULT_THROTTLE_RATES': {'login': '2/min'},
+    })
+    def test_login_attempts_are_limited_per_client(self):
+        url = '/api/login/'
+        data = {'username': 'nobody', 'password': 'wrong'}
+        statuses = [self.client.post(url, data, format='json').status_code for _ in range(3)]
+
+        self.assertEqual(statuses, [400, 400, 429])
+
+
+class InstrumentationTest(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+    def test_response_carries_server_timing(self):
+        response = self.client.get('/api/offers/')
+
+        timing = response['Server-Timing']
+        self.assertIn('total;dur=', timing)
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="\d+ queries, \d+ duplicate"')
+        self.assertIn('serialize;dur=', timing)
+
+    def test_metrics_endpoint_reports_requests_by_route(self):
+        self.client.get('/api/offers/')
+        response = self.client.get('/metrics')
+
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE http_request_duration_seconds histogram', body)
+        self.assertRegex(body, r'http_requests_total\{route="offer-list",method="GET",status="200"\} \d+')
+        self.assertIn('http_request_db_queries_count{route="offer-list",method="GET"}', body)
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_metrics_endpoint_requires_token_when_configured(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 403)
+        response = self.client.get('/metrics', HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(response.status_code, 200)
+
+    def test_metrics_endpoint_is_local_only_without_token(self):
+        remote = self.client.get('/metrics', REMOTE_ADDR='203.0.113.5')
+        proxied = self.client.get('/metrics', HTTP_X_FORWARDED_FOR='203.0.113.5')
+
+        self.assertEqual(remote.status_code, 403)
+        self.assertEqual(proxied.status_code, 403)
+
+    @override_settings(SERVER_TIMING=True)
+    def test_serializer_time_counts_as_serialization(self):
+        calls = []
+        original = ReviewsListCreateSerializer.to_representation
+
+        def slow_to_representation(serializer, instance):
+            calls.append(instance)
+            time.sleep(0.01)
+            return original(serializer, instance)
+
+        reviewer = User.objects.create(username="Kim")
+        business = User.objects.create(username="Shop")
+        Review.objects.create(reviewer=reviewer, business_user=business, rating=5, description="Top")
+        self.client.force_authenticate(reviewer)
+        with override_settings(FAST_LIST_SERIALIZERS=False), \
+                patch.object(ReviewsListCreateSerializer, 'to_representation', slow_to_representation):
+            response = self.client.get('/api/reviews/')
+
+        serialize_ms = float(re.search(r'serialize;dur=([\d.]+)', response['Server-Timing']).group(1))
+        self.assertEqual(len(calls), 1)
+        self.assertGreaterEqual(serialize_ms, 10)
+
+    @override_settings(DEBUG=True)
+    async def test_async_view_runs_without_sync_adaptation(self):
+        with self.assertNoLogs('django.request', 'DEBUG'):
+            response = await self.async_client.get('/api/async/base-info/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('total;dur=', response['Server-Timing'])
+
+    def test_duplicate_queries_are_counted(self):
+        request_metrics = RequestMetrics()
+        with connection.execute_wrapper(request_metrics):
+            for _ in range(3):
+                list(Offer.objects.filter(pk=1))
+            list(Offer.objects.filter(pk=2))
+
+        self.assertEqual(request_metrics.queries, 4)
+        self.assertEqual(request_metrics.duplicates, 2)
+
+
+class QueryInspectorTest(SimpleTestCase):
+
+    def test_statements_are_grouped_by_shape(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'x' LIMIT 21"),
+            normalize_sql("SELECT * FROM t WHERE id IN (%s) AND name = 'y' LIMIT 1"),
+        )
+
+    def test_repeated_and_slow_queries_are_reported(self):
+        inspector = QueryInspector(repeat_threshold=3, slow_query_ms=10)
+
+        def execute(sql, params, many, context):
+            if sql == 'SLOW':
+                time.sleep(0.02)
+
+        for user_id in range(3):
+            inspector(execute, 'SELECT * FROM auth_user WHERE id = %s', [user_id], False, {})
+        inspector(execute, 'SELECT * FROM offers_app_offer', [], False, {})
+        inspector(execute, 'SLOW', [], False, {})
+
+        problems = inspector.problems()
+        self.assertEqual(len(problems), 2)
+        self.assertTrue(problems[0].startswith('3x same query (N+1?): SELECT * FROM auth_user'))
+        self.assertRegex(problems[1], r'^slow query \(\d+ ms > 10 ms\): SLOW$')
+
+
+class FastJSONTest(SimpleTestCase):
+    payload = {
+        'count': 1,
+        'results': [{
+            'id': 7,
+            'title': 'Logo Design – Premium',
+            'price': Decimal('149.90'),
+            'features': ['Logo', 'Visitenkarte'],
+            'created_at': datetime(2025, 5, 1, 12, 30, 15, 250000, tzinfo=timezone.utc),
+            'delivery_date': date(2025, 5, 8),
+            'rating': 4.5,
+            'user_details': None,
+        }],
+    }
+
+    def test_fast_renderer_matches_drf_renderer(self):
+        expected = JSONRenderer().render(self.payload)
+        self.assertEqual(FastJSONRenderer().render(self.payload), expected)
+        with patch('core.renderers.orjson', None):
+            self.assertEqual(FastJSONRenderer().render(self.payload), expected)
+
+    def test_fast_parser_matches_drf_parser(self):
+        body = '{"title": "Grafikdesign – Basic", "features": ["Logo"], "price": 100.5}'.encode()
+
+        self.assertEqual(
+            FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": '))
@@ -0,0 +1,170 @@
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+"""
+Sliding window throttles.
+
+A client's requests are counted in fixed windows of the rate's duration, and
+the count of the previous window is weighted by how much of it still
+overlaps the sliding window:
+
+    estimate = previous * (1 - elapsed / duration) + current
+
+Counting costs one atomic cache.incr() per request, which a rejected request
+takes back with cache.decr(). A finished window does
+not change anymore, so its count is read once per window and process and
+kept in memory. Counters live in the cache named by THROTTLE_CACHE
+(default: 'default'), which must be shared (redis, memcached) for the limits
+to hold across worker processes.
+"""
+
+_previous_counts = {}
+_previous_lock = threading.Lock()
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    """
+    Base class of the sliding window throttles. Subclasses set `scope` and
+    implement `get_cache_key()` like for SimpleRateThrottle.
+    """
+    cache_format = 'throttle:%(scope)s:%(ident)s'
+
+    @property
+    def cache(self):
+        return caches[getattr(settings, 'THROTTLE_CACHE', 'default')]
+
+    def get_rate(self):
+        """
+        Return the rate of the scope, read on every request so that changed
+        settings take effect without a restart of the throttle classes.
+        """
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window = int(now // self.duration)
+        self.elapsed = now - window * self.duration
+        counter = f'{self.key}:{window}'
+        self.current = self.increment(counter)
+        self.previous = self.get_previous_count(window - 1)
+
+        estimate = self.previous * (1 - self.elapsed / self.duration) + self.current
+        if estimate > self.num_requests:
+            # Only allowed requests count, otherwise a client that keeps
+            # sending faster than the rate would be locked out for good.
+            self.cache.decr(counter)
+            return self.throttle_failure()
+        return self.throttle_success()
+
+    def throttle_success(self):
+        return True
+
+    def increment(self, key):
+        """
+        Count the request in the window and return the new count.
+        """
+        try:
+            return self.cache.incr(key)
+        except ValueError:
+            # First request of the window. If another process created the
+            # counter in the meantime, add() fails and we increment it.
+            if self.cache.add(key, 1, timeout=2 * self.duration):
+                return 1
+            return self.cache.incr(key)
+
+    def get_previous_count(self, window):
+        """
+        Return the count of the finished window, from memory if it was read
+        before in this process.
+        """
+        cached = _previous_counts.get(self.duration)
+        if cached is None or cached[0] != window:
+            with _previous_lock:
+                cached = _previous_counts.get(self.duration)
+                if cached is None or cached[0] != window:
+                    cached = (window, {})
+                    _previous_counts[self.duration] = cached
+        counts = cached[1]
+        if self.key not in counts:
+            counts[self.key] = self.cache.get(f'{self.key}:{window}', 0)
+        return counts[self.key]
+
+    def wait(self):
+        """
+        Return the seconds until the estimate is below the limit again.
+        """
+        if self.current > self.num_requests or not self.previous:
+            return self.duration - self.elapsed
+        overlap = (self.num_requests - self.current) / self.previous
+        return max(self.duration * (1 - overlap) - self.elapsed, 0)
+
+
+class AnonSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Limit anonymous requests per IP address (rate 'anon').
+    """
+    scope = 'anon'
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
+
+
+class UserSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Limit requests of authenticated users per user (rate 'user').
+    """
+    scope = 'user'
+
+    def get_cache_key(self, request, view):
+        if not (request.user and request.user.is_authenticated):
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': request.user.pk}
+
+
+class ScopedSlidingWindowThrottle(SlidingWindowThrottle):
+    """
+    Limit the requests of an endpoint family, per user or IP address.
+
+    Views select the scope with `throttle_scope` for all requests, or with
+    `throttle_scopes`, a dict from viewset action or HTTP method to scope,
+    e.g. `{'create': 'order_create'}`. Requests without a scope are not limited.
+    """
+
+    def __init__(self):
+        # The scope is only known once the view is.
+        pass
+
+    def allow_request(self, request, view):
+        scopes = getattr(view, 'throttle_scopes', {})
+        self.scope = (
+            scopes.get(getattr(view, 'action', None))
+            or scopes.get(request.method)
+            or getattr(view, 'throttle_scope', None)
+        )
+        if not self.scope:
+            return True
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+        return super().allow_request(request, view)
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = request.user.pk
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {'scope': self.scope, 'ident': ident}
@@ -0,0 +1,6 @@
+from django.contrib import admin
+from .models import ChangeEvent
+
+# Register your models here.
+
+admin.site.register(ChangeEvent)
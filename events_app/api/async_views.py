@@ -0,0 +1,56 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+
+from core.async_api import AsyncAPIView, sse_message
+from .functions import parse_since, visible_events
+from .serializers import ChangeEventSerializer
+
+
+class ChangeEventStreamView(AsyncAPIView):
+    """
+    Server-Sent Events stream of the change feed (see ChangeEventFeedView).
+
+    Sends the events after `since` (or the `Last-Event-ID` header of a
+    reconnecting client), then polls for new events every
+    EVENTS_STREAM_POLL_SECONDS on the event loop and sends a comment line
+    as heartbeat while there are none. The stream ends after
+    EVENTS_STREAM_SECONDS and the client reconnects with Last-Event-ID.
+
+    Requires an authenticated user and ASGI: a WSGI worker would be blocked
+    for the whole stream. Connections are limited by the 'stream' rate.
+    """
+    authentication_required = True
+    throttle_scope = 'stream'
+
+    async def get(self, request):
+        unavailable = self.stream_unavailable(request)
+        if unavailable:
+            return unavailable
+        since = request.headers.get('Last-Event-ID') or request.query_params.get('since')
+        since = await sync_to_async(parse_since)(since)
+        # Validates the topics parameter before the stream starts.
+        visible_events(request, since)
+        return self.event_stream(self.stream(request, since))
+
+    async def stream(self, request, since):
+        loop = asyncio.get_running_loop()
+        closes_at = loop.time() + settings.EVENTS_STREAM_SECONDS
+        heartbeat_at = loop.time() + settings.EVENTS_STREAM_HEARTBEAT_SECONDS
+        limit = settings.EVENTS_FEED_LIMIT
+        yield b'retry: 3000\n\n'
+        while loop.time() < closes_at:
+            events = [event async for event in visible_events(request, since)[:limit]]
+            for event in events:
+                yield sse_message(
+                    ChangeEventSerializer(event).data, event=f'{event.topic}.{event.action}', id=event.id)
+            if events:
+                since = events[-1].id
+                heartbeat_at = loop.time() + settings.EVENTS_STREAM_HEARTBEAT_SECONDS
+                if len(events) == limit:
+                    continue
+            elif loop.time() >= heartbeat_at:
+                yield b': keepalive\n\n'
+                heartbeat_at = loop.time() + settings.EVENTS_STREAM_HEARTBEAT_SECONDS
+            await asyncio.sleep(settings.EVENTS_STREAM_POLL_SECONDS)
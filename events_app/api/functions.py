@@ -0,0 +1,83 @@
+from django.conf import settings
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from events_app.models import ChangeEvent, events_in_commit_order
+
+
+class FeedUnavailable(APIException):
+    """
+    The database does not number events in commit order, so `since` could
+    skip events.
+    """
+    status_code = status.HTTP_501_NOT_IMPLEMENTED
+    default_detail = 'Der Änderungs-Feed ist mit dieser Datenbank nicht verfügbar.'
+
+
+def parse_since(value):
+    """
+    Return the event id after which the feed continues. 'latest' means the
+    newest recorded event, so a client can start following changes without
+    reading the history.
+
+    Raises ValidationError if the value is not a non-negative number.
+    """
+    if value in (None, ''):
+        return 0
+    if value == 'latest':
+        return ChangeEvent.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    try:
+        since = int(value)
+        if since < 0:
+            raise ValueError()
+    except ValueError:
+        raise ValidationError({'since': 'since muss eine Event-ID (Zahl ab 0) oder "latest" sein.'})
+    return since
+
+
+def parse_limit(value):
+    """
+    Return the number of events per response, at most EVENTS_FEED_MAX_LIMIT.
+
+    Raises ValidationError if the value is not a positive number.
+    """
+    if value in (None, ''):
+        return settings.EVENTS_FEED_LIMIT
+    try:
+        limit = int(value)
+        if limit < 1:
+            raise ValueError()
+    except ValueError:
+        raise ValidationError({'limit': 'limit muss eine positive Zahl sein.'})
+    return min(limit, settings.EVENTS_FEED_MAX_LIMIT)
+
+
+def filter_with_topics_param(queryset, topics):
+    """
+    Filter the events by a comma separated list of topics.
+
+    Raises ValidationError for unknown topics.
+    """
+    names = [name.strip() for name in topics.split(',') if name.strip()]
+    allowed = [value for value, _ in ChangeEvent.TOPICS]
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise ValidationError(
+            {'topics': f"Unbekannte Topics: {', '.join(unknown)}. Erlaubt sind: {', '.join(allowed)}"})
+    return queryset.filter(topic__in=names) if names else queryset
+
+
+def visible_events(request, since):
+    """
+    Return the events after `since` the user of the request may see,
+    filtered by the `topics` parameter.
+
+    Raises FeedUnavailable on databases without commit-ordered event ids.
+    """
+    if not events_in_commit_order():
+        raise FeedUnavailable()
+    queryset = ChangeEvent.objects.visible_to(request.user).after(since)
+    topics = request.query_params.get('topics')
+    if topics:
+        queryset = filter_with_topics_param(queryset, topics)
+    return queryset
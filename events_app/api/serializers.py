@@ -0,0 +1,13 @@
+from rest_framework import serializers
+
+from events_app.models import ChangeEvent
+
+
+class ChangeEventSerializer(serializers.ModelSerializer):
+    """
+    Serializer for change events of the feed and the event stream.
+    """
+
+    class Meta:
+        model = ChangeEvent
+        fields = ['id', 'topic', 'action', 'object_id', 'data', 'created_at']
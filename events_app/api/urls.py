@@ -0,0 +1,15 @@
+from django.urls import path
+from .views import ChangeEventFeedView
+from .async_views import ChangeEventStreamView
+
+"""URL configuration for the change event feed.
+
+Routes:
+    /events/ (incremental feed, `?since=<event_id>`)
+    /async/events/stream/ (Server-Sent Events stream, ASGI only)
+"""
+
+urlpatterns = [
+    path('events/', ChangeEventFeedView.as_view(), name='event-feed'),
+    path('async/events/stream/', ChangeEventStreamView.as_view(), name='event-stream'),
+]
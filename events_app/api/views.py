@@ -0,0 +1,36 @@
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from .functions import parse_limit, parse_since, visible_events
+from .serializers import ChangeEventSerializer
+
+
+class ChangeEventFeedView(APIView):
+    """
+    Incremental feed of the changes of offers, offer details, orders and
+    reviews.
+
+    Query parameters:
+        since: Return the events after this event id (default 0). 'latest'
+            returns no events but the id to continue from.
+        topics: Comma separated topics (offer, offer_detail, order, review).
+        limit: Events per response (default EVENTS_FEED_LIMIT).
+
+    Clients store `last_event_id` and pass it as `since` on the next call,
+    immediately again while `has_more` is true. Order events are only
+    visible to the customer and business user of the order.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        since = parse_since(request.query_params.get('since'))
+        limit = parse_limit(request.query_params.get('limit'))
+        events = list(visible_events(request, since)[:limit + 1])
+        has_more = len(events) > limit
+        events = events[:limit]
+        return Response({
+            'events': ChangeEventSerializer(events, many=True).data,
+            'last_event_id': events[-1].id if events else since,
+            'has_more': has_more,
+        })
@@ -0,0 +1,9 @@
+from django.apps import AppConfig
+
+
+class EventsAppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'events_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
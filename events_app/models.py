@@ -0,0 +1,131 @@
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, models, router, transaction
+from django.db.models import Q
+
+# Key of the PostgreSQL advisory lock that serializes event inserts.
+EVENT_ORDER_LOCK = 470047
+
+# Backends on which event ids follow the commit order (see lock_event_order).
+COMMIT_ORDERED_VENDORS = ('sqlite', 'postgresql')
+
+
+def snapshot(instance):
+    """
+    Return the column values of a model instance as a JSON-ready dict.
+    Files are represented by their name.
+    """
+    data = {}
+    for field in instance._meta.concrete_fields:
+        value = field.value_from_object(instance)
+        if isinstance(field, models.FileField):
+            value = value.name or None
+        data[field.attname] = value
+    return data
+
+
+def lock_event_order(connection):
+    """
+    Keep other transactions from recording events until the current one
+    commits, so event ids are assigned in commit order.
+
+    SQLite runs one writing transaction at a time. On PostgreSQL concurrent
+    transactions could commit out of id order, and a client that already
+    read a higher id would skip the late event for good. A transaction-level
+    advisory lock, released at commit or rollback, prevents that.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [EVENT_ORDER_LOCK])
+
+
+def events_in_commit_order():
+    """
+    Return True if the event database numbers events in commit order, which
+    the feed needs.
+    """
+    return connections[ChangeEvent.objects.db].vendor in COMMIT_ORDERED_VENDORS
+
+
+class ChangeEventQuerySet(models.QuerySet):
+
+    def visible_to(self, user):
+        """
+        Public events, and the order events of the user's own orders.
+        """
+        return self.filter(
+            Q(customer_user_id__isnull=True, business_user_id__isnull=True)
+            | Q(customer_user_id=user.pk) | Q(business_user_id=user.pk)
+        )
+
+    def after(self, event_id):
+        return self.filter(id__gt=event_id).order_by('id')
+
+
+class ChangeEvent(models.Model):
+    """
+    A create, update or delete of an offer, offer detail, order or review,
+    recorded in the transaction of the write (see events_app/signals.py).
+
+    Events are numbered in commit order of their transactions (see
+    lock_event_order), so `id > since` returns every change a client has
+    not seen yet. On PostgreSQL this serializes the transactions that record
+    events from their first event to their commit.
+
+    Attributes:
+        topic (str): offer, offer_detail, order or review.
+        action (str): created, updated or deleted.
+        object_id (int): Primary key of the changed row.
+        data (dict): Column values after the write, the last values for
+            deletes.
+        customer_user_id, business_user_id (int): Participants of an order.
+            Order events are only visible to them, all other events to every
+            authenticated user.
+        created_at (datetime): Time of the write.
+    """
+
+    TOPICS = (
+        ('offer', 'Offer'),
+        ('offer_detail', 'Offer detail'),
+        ('order', 'Order'),
+        ('review', 'Review'),
+    )
+    ACTIONS = (
+        ('created', 'Created'),
+        ('updated', 'Updated'),
+        ('deleted', 'Deleted'),
+    )
+
+    topic = models.CharField(max_length=20, choices=TOPICS)
+    action = models.CharField(max_length=10, choices=ACTIONS)
+    object_id = models.PositiveBigIntegerField()
+    data = models.JSONField(default=dict, encoder=DjangoJSONEncoder)
+    customer_user_id = models.IntegerField(null=True, blank=True)
+    business_user_id = models.IntegerField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    objects = ChangeEventQuerySet.as_manager()
+
+    def __str__(self):
+        return f"{self.topic} {self.object_id} {self.action}"
+
+    @classmethod
+    def record(cls, topic, instance, action, private=False):
+        """
+        Record a change of `instance`. Private events (orders) are visible
+        only to the instance's customer_user and business_user.
+        """
+        using = router.db_for_write(cls, instance=instance)
+        with transaction.atomic(using=using):
+            lock_event_order(connections[using])
+            return cls.objects.using(using).create(
+                topic=topic,
+                action=action,
+                object_id=instance.pk,
+                data=snapshot(instance),
+                customer_user_id=instance.customer_user_id if private else None,
+                business_user_id=instance.business_user_id if private else None,
+            )
+
+    class Meta:
+        verbose_name = 'Change Event'
+        verbose_name_plural = 'Change Events'
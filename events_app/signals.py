@@ -0,0 +1,33 @@
+from django.db.models.signals import post_delete, post_save
+
+from events_app.models import ChangeEvent
+from offers_app.models import Offer, OfferDetails
+from orders_app.models import Order
+from reviews_app.models import Review
+
+# Recorded models: topic and whether the events are private to the order participants
+TOPICS = {
+    Offer: ('offer', False),
+    OfferDetails: ('offer_detail', False),
+    Order: ('order', True),
+    Review: ('review', False),
+}
+
+
+def record_save(sender, instance, created, raw=False, **kwargs):
+    """Record the create or update of a row."""
+    if raw:
+        return
+    topic, private = TOPICS[sender]
+    ChangeEvent.record(topic, instance, 'created' if created else 'updated', private)
+
+
+def record_delete(sender, instance, **kwargs):
+    """Record the delete of a row, including cascaded deletes."""
+    topic, private = TOPICS[sender]
+    ChangeEvent.record(topic, instance, 'deleted', private)
+
+
+for model in TOPICS:
+    post_save.connect(record_save, sender=model, dispatch_uid=f'events_save_{model._meta.label}')
+    post_delete.connect(record_delete, sender=model, dispatch_uid=f'events_delete_{model._meta.label}')
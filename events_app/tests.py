@@ -0,0 +1,105 @@
+from decimal import Decimal
+from unittest.mock import MagicMock, patch
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from events_app.models import EVENT_ORDER_LOCK, ChangeEvent, lock_event_order
+from offers_app.models import Offer, OfferDetails
+from orders_app.models import Order
+from user_auth_app.models import ExpiringToken
+
+
+class ChangeEventFeedTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create(username="Shop")
+        self.customer = User.objects.create(username="Ann")
+        self.stranger = User.objects.create(username="Ben")
+        self.url = reverse("event-feed")
+
+    def create_order(self):
+        offer = Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        detail = OfferDetails.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=Decimal("50.00"), features=["Logo"], offer_type="basic")
+        return Order.objects.create(
+            offer_detail=detail, customer_user=self.customer, business_user=self.business,
+            title="Basic", revisions=1, delivery_time_in_days=3, price=Decimal("50.00"),
+            features=["Logo"], offer_type="basic")
+
+    def test_feed_returns_changes_after_since(self):
+        self.client.force_authenticate(self.customer)
+        start = self.client.get(self.url, {"since": "latest"}).json()["last_event_id"]
+        offer = Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        offer.title = "Logos"
+        offer.save()
+        offer.delete()
+
+        response = self.client.get(self.url, {"since": start, "limit": 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([event["action"] for event in response.data["events"]], ["created", "updated"])
+        self.assertEqual(response.data["events"][1]["data"]["title"], "Logos")
+        self.assertTrue(response.data["has_more"])
+
+        response = self.client.get(self.url, {"since": response.data["last_event_id"]})
+        self.assertEqual([event["action"] for event in response.data["events"]], ["deleted"])
+        self.assertFalse(response.data["has_more"])
+
+    def test_order_events_are_private_to_participants(self):
+        order = self.create_order()
+        order.status = "completed"
+        order.save()
+
+        for user, expected in [(self.customer, ["created", "updated"]), (self.stranger, [])]:
+            self.client.force_authenticate(user)
+            response = self.client.get(self.url, {"topics": "order"})
+            self.assertEqual([event["action"] for event in response.data["events"]], expected)
+
+    def test_unknown_topic_is_rejected(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(self.url, {"topics": "user"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_postgres_event_inserts_wait_for_earlier_commits(self):
+        postgres = MagicMock(vendor='postgresql')
+        lock_event_order(postgres)
+
+        postgres.cursor().__enter__().execute.assert_called_once_with(
+            'SELECT pg_advisory_xact_lock(%s)', [EVENT_ORDER_LOCK])
+
+    def test_feed_is_refused_without_commit_ordered_ids(self):
+        self.client.force_authenticate(self.customer)
+        with patch.object(connection, 'vendor', 'mysql'):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_501_NOT_IMPLEMENTED)
+
+    @override_settings(EVENTS_STREAM_SECONDS=0.05, EVENTS_STREAM_POLL_SECONDS=0.01)
+    async def test_stream_sends_events_after_last_event_id(self):
+        order = await Order.objects.acreate(**await self.aorder_fields())
+        token = await ExpiringToken.objects.acreate(user=self.customer)
+        first = await ChangeEvent.objects.filter(topic="order").afirst()
+
+        response = await self.async_client.get(
+            reverse("event-stream"), {"topics": "order"},
+            headers={"Authorization": f"Token {token.key}", "Last-Event-ID": str(first.id - 1)})
+        body = b"".join([chunk async for chunk in response.streaming_content])
+
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        self.assertIn(b"id: %d\nevent: order.created\n" % first.id, body)
+        self.assertIn(b'"object_id":%d' % order.id, body)
+
+    async def aorder_fields(self):
+        detail = await OfferDetails.objects.acreate(
+            offer=await Offer.objects.acreate(user=self.business, title="Logo", description="Logo"),
+            title="Basic", revisions=1, delivery_time_in_days=3, price=Decimal("50.00"),
+            features=["Logo"], offer_type="basic")
+        return {
+            "offer_detail": detail, "customer_user": self.customer, "business_user": self.business,
+            "title": "Basic", "revisions": 1, "delivery_time_in_days": 3, "price": Decimal("50.00"),
+            "features": ["Logo"], "offer_type": "basic",
+        }
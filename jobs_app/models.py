@@ -0,0 +1,67 @@
+from django.db import models
+from django.db.models import Q
+from django.utils import timezone
+
+
+class Job(models.Model):
+    """
+    A unit of deferred work, run by the `run_jobs` worker (see
+    jobs_app/queue.py).
+
+    Attributes:
+        task (str): Name of the registered task.
+        payload (dict): Keyword arguments of the task.
+        key (str): Optional idempotency key. A job with a key is queued at
+            most once, later enqueues with the same key are ignored.
+        dedupe_key (str): Task and payload of a queued job. An identical job
+            is not queued again until the worker has picked this one up.
+        status (str): queued, running, done or failed.
+        attempts (int): Number of runs so far.
+        max_attempts (int): Runs before the job is marked as failed.
+        run_at (datetime): Earliest time of the next run.
+        locked_by (str): Worker that is running the job.
+        locked_at (datetime): When the worker picked up the job.
+        last_error (str): Traceback of the last failed run.
+        finished_at (datetime): When the job was done or gave up.
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    )
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    dedupe_key = models.CharField(max_length=255, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUSES, default=QUEUED)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.task} ({self.status})"
+
+    class Meta:
+        verbose_name = 'Job'
+        verbose_name_plural = 'Jobs'
+        indexes = [
+            # Due jobs in order, and stale locks
+            models.Index(fields=['status', 'run_at', 'id'], name='job_status_run_at_idx'),
+            models.Index(fields=['status', 'finished_at'], name='job_status_finished_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'], condition=Q(status='queued'), name='job_queued_dedupe_uniq'),
+        ]
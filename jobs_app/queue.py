@@ -0,0 +1,253 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Job
+
+"""
+Database-backed job queue for the side effects of writes.
+
+Apps declare tasks in a `tasks.py` module (found by JobsAppConfig.ready):
+
+    @task('orders.sync_completed_order_counts', batch=True)
+    def sync_completed_order_counts(payloads):
+        Order.sync_profiles({payload['business_user_id'] for payload in payloads})
+
+and enqueue them while handling a request:
+
+    sync_completed_order_counts.enqueue(business_user_id=order.business_user_id)
+
+Enqueueing is one INSERT in the transaction of the write, so a rolled back
+write queues nothing. `python manage.py run_jobs` runs the queued jobs:
+
+- Identical jobs (same task and payload) are queued once until a worker
+  picks them up.
+- A job with an idempotency key (`enqueue(key=...)`) is queued at most once.
+- Batch tasks receive the payloads of up to JOBS_BATCH_SIZE due jobs in one
+  call, other tasks one call per job. Every call runs in a transaction.
+- A failed job is retried after JOBS_RETRY_BASE_SECONDS, doubling up to
+  JOBS_RETRY_MAX_SECONDS, and marked failed after its max_attempts.
+- Jobs of a worker that died are queued again after JOBS_LOCK_TIMEOUT_SECONDS.
+
+Tasks must be idempotent, a retried batch runs every payload again. With
+JOBS_EAGER (the default in tests) enqueue runs the task immediately instead.
+"""
+
+logger = logging.getLogger(__name__)
+
+_tasks = {}
+
+
+class Task:
+    """
+    A function that runs as a job.
+
+    Attributes:
+        name (str): Name of the task, stored with its jobs.
+        func (callable): Called with the payload as keyword arguments, or
+            with the list of payloads for batch tasks.
+        batch (bool): Run the due jobs of the task in one call.
+        max_attempts (int): Runs before a job is marked as failed. Defaults
+            to JOBS_MAX_ATTEMPTS.
+    """
+
+    def __init__(self, func, name, batch=False, max_attempts=None):
+        self.func = func
+        self.name = name
+        self.batch = batch
+        self.max_attempts = max_attempts
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def enqueue(self, key=None, delay=None, **payload):
+        """
+        Queue a job of this task with the keyword arguments as payload.
+        """
+        enqueue(self.name, payload, key=key, delay=delay)
+
+    def run(self, payloads):
+        """
+        Run the task for the payloads of one or more jobs.
+        """
+        if self.batch:
+            unique = {json.dumps(payload, sort_keys=True): payload for payload in payloads}
+            self.func(list(unique.values()))
+        else:
+            for payload in payloads:
+                self.func(**payload)
+
+
+def task(name=None, batch=False, max_attempts=None):
+    """
+    Register the decorated function as a task (see Task).
+    """
+    def register(func):
+        registered = Task(func, name or f'{func.__module__}.{func.__name__}', batch, max_attempts)
+        _tasks[registered.name] = registered
+        return registered
+    return register
+
+
+def get_task(name):
+    return _tasks.get(name)
+
+
+def payload_digest(name, payload):
+    """
+    Return the dedupe key of a job: the task name and a hash of the payload.
+    """
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode()
+    return f'{name}:{hashlib.sha1(encoded).hexdigest()}'
+
+
+def enqueue(name, payload=None, key=None, delay=None):
+    """
+    Queue a job of the task `name`, unless an identical job is already
+    queued or a job with the same idempotency key exists.
+
+    Args:
+        name (str): Name of a registered task.
+        payload (dict): JSON serializable keyword arguments of the task.
+        key (str): Optional idempotency key.
+        delay (float): Seconds before the job may run.
+    """
+    payload = payload or {}
+    registered = _tasks[name]
+    if settings.JOBS_EAGER:
+        registered.run([payload])
+        return
+    job = Job(
+        task=name,
+        payload=payload,
+        key=key,
+        dedupe_key=payload_digest(name, payload),
+        max_attempts=registered.max_attempts or settings.JOBS_MAX_ATTEMPTS,
+        run_at=timezone.now() + timedelta(seconds=delay or 0),
+    )
+    # Conflicts with the dedupe or idempotency key mean the work is already queued.
+    Job.objects.bulk_create([job], ignore_conflicts=True)
+
+
+def retry_delay(attempts):
+    """
+    Return the seconds before the next run of a job that failed `attempts`
+    times: exponential backoff capped at JOBS_RETRY_MAX_SECONDS.
+    """
+    delay = settings.JOBS_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    return min(delay, settings.JOBS_RETRY_MAX_SECONDS)
+
+
+def worker_name():
+    return f'{socket.gethostname()}:{os.getpid()}'
+
+
+def _jobs():
+    # The queue is always read from the primary, never from a replica.
+    return Job.objects.using(router.db_for_write(Job))
+
+
+def claim_jobs(worker, limit):
+    """
+    Mark up to `limit` due jobs of the task of the oldest due job as
+    running for `worker` and return them.
+
+    Jobs are claimed with one UPDATE that only matches queued rows, so
+    concurrent workers never run the same job. PostgreSQL additionally
+    skips rows another worker is claiming.
+    """
+    jobs = _jobs()
+    now = timezone.now()
+    with transaction.atomic(using=jobs.db):
+        due = jobs.filter(status=Job.QUEUED, run_at__lte=now).order_by('run_at', 'id')
+        if connections[jobs.db].features.has_select_for_update_skip_locked:
+            due = due.select_for_update(skip_locked=True)
+        name = due.values_list('task', flat=True).first()
+        if name is None:
+            return []
+        ids = list(due.filter(task=name).values_list('id', flat=True)[:limit])
+        jobs.filter(id__in=ids, status=Job.QUEUED).update(
+            status=Job.RUNNING, locked_by=worker, locked_at=now, attempts=F('attempts') + 1)
+    return list(jobs.filter(id__in=ids, status=Job.RUNNING, locked_by=worker, locked_at=now).order_by('id'))
+
+
+def complete_jobs(jobs):
+    _jobs().filter(id__in=[job.id for job in jobs]).update(
+        status=Job.DONE, locked_by='', finished_at=timezone.now())
+
+
+def fail_jobs(jobs, error, retry=True):
+    """
+    Queue the jobs again after their backoff delay, or mark them as failed
+    after their last attempt. Retried jobs give up their dedupe key, an
+    identical job may have been queued meanwhile.
+    """
+    now = timezone.now()
+    for job in jobs:
+        if retry and job.attempts < job.max_attempts:
+            changes = {
+                'status': Job.QUEUED, 'dedupe_key': None,
+                'run_at': now + timedelta(seconds=retry_delay(job.attempts)),
+            }
+        else:
+            changes = {'status': Job.FAILED, 'finished_at': now}
+        _jobs().filter(id=job.id).update(locked_by='', last_error=error, **changes)
+        logger.warning('Job %s (%s) failed, attempt %s of %s',
+                       job.id, job.task, job.attempts, job.max_attempts)
+
+
+def run_due_jobs(worker, limit):
+    """
+    Claim and run one batch of due jobs. Returns the number of jobs run.
+    """
+    jobs = claim_jobs(worker, limit)
+    if not jobs:
+        return 0
+    registered = get_task(jobs[0].task)
+    if registered is None:
+        fail_jobs(jobs, f'Unknown task {jobs[0].task}', retry=False)
+        return len(jobs)
+    groups = [jobs] if registered.batch else [[job] for job in jobs]
+    for group in groups:
+        try:
+            with transaction.atomic(using=router.db_for_write(Job)):
+                registered.run([job.payload for job in group])
+        except Exception:
+            fail_jobs(group, traceback.format_exc())
+        else:
+            complete_jobs(group)
+    return len(jobs)
+
+
+def release_stale_jobs():
+    """
+    Queue the running jobs of workers that stopped without finishing them
+    again, or mark them as failed after their last attempt.
+    """
+    now = timezone.now()
+    stale = _jobs().filter(
+        status=Job.RUNNING, locked_at__lt=now - timedelta(seconds=settings.JOBS_LOCK_TIMEOUT_SECONDS))
+    released = stale.filter(attempts__lt=F('max_attempts')).update(
+        status=Job.QUEUED, locked_by='', dedupe_key=None, run_at=now)
+    failed = stale.update(
+        status=Job.FAILED, locked_by='', finished_at=now, last_error='Worker lock timed out')
+    return released + failed
+
+
+def purge_finished_jobs():
+    """
+    Delete the jobs that were done more than JOBS_KEEP_DONE_SECONDS ago.
+    Failed jobs are kept for inspection.
+    """
+    before = timezone.now() - timedelta(seconds=settings.JOBS_KEEP_DONE_SECONDS)
+    deleted, _ = _jobs().filter(status=Job.DONE, finished_at__lt=before).delete()
+    return deleted
@@ -0,0 +1,79 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from jobs_app.models import Job
+from jobs_app.queue import enqueue, run_due_jobs, task
+from orders_app.tasks import sync_completed_order_counts
+
+calls = []
+
+
+@task('tests.record_batch', batch=True)
+def record_batch(payloads):
+    calls.append(sorted(payload['value'] for payload in payloads))
+
+
+@task('tests.always_fails', max_attempts=2)
+def always_fails():
+    raise RuntimeError("kaputt")
+
+
+@override_settings(JOBS_EAGER=False, JOBS_RETRY_BASE_SECONDS=10)
+class JobQueueTest(TestCase):
+
+    def setUp(self):
+        calls.clear()
+
+    def test_identical_jobs_are_queued_once(self):
+        for value in [1, 1, 2]:
+            record_batch.enqueue(value=value)
+        enqueue('tests.record_batch', {'value': 3}, key='import-3')
+        enqueue('tests.record_batch', {'value': 4}, key='import-3')
+
+        self.assertEqual(Job.objects.count(), 3)
+
+    def test_due_jobs_of_a_batch_task_run_in_one_call(self):
+        for value in [3, 1, 2]:
+            record_batch.enqueue(value=value)
+        record_batch.enqueue(value=4, delay=60)
+
+        self.assertEqual(run_due_jobs('test-worker', 10), 3)
+        self.assertEqual(calls, [[1, 2, 3]])
+        self.assertEqual(Job.objects.filter(status=Job.DONE).count(), 3)
+        self.assertEqual(run_due_jobs('test-worker', 10), 0)
+
+    def test_identical_job_can_be_queued_again_once_picked_up(self):
+        record_batch.enqueue(value=1)
+        run_due_jobs('test-worker', 10)
+        record_batch.enqueue(value=1)
+
+        self.assertEqual(Job.objects.filter(status=Job.QUEUED).count(), 1)
+
+    def test_failed_job_is_retried_with_backoff_then_marked_failed(self):
+        always_fails.enqueue()
+        with self.assertLogs('jobs_app.queue', 'WARNING'):
+            run_due_jobs('test-worker', 10)
+
+        job = Job.objects.get()
+        self.assertEqual((job.status, job.attempts), (Job.QUEUED, 1))
+        self.assertIn("kaputt", job.last_error)
+        self.assertGreater(job.run_at, timezone.now() + timedelta(seconds=5))
+
+        Job.objects.update(run_at=timezone.now())
+        with self.assertLogs('jobs_app.queue', 'WARNING'):
+            run_due_jobs('test-worker', 10)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.FAILED, 2))
+
+    def test_worker_command_runs_queued_side_effects(self):
+        business = User.objects.create(username="Shop")
+        sync_completed_order_counts.enqueue(business_user_id=business.id)
+
+        call_command('run_jobs', '--once', stdout=StringIO())
+
+        self.assertEqual(Job.objects.get().status, Job.DONE)
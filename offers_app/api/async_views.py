@@ -0,0 +1,46 @@
+from rest_framework.exceptions import NotFound
+from core.async_api import AsyncAPIView
+from offers_app.models import Offer
+from .functions import details_included
+from .serializers import OfferListSerializer, OfferRetrieveSerializer, OfferWithDetailsSerializer
+from .views import OfferViewSet
+
+
+class AsyncOfferListView(AsyncAPIView):
+    """
+    Async variant of the offer list (OfferViewSet.list).
+
+    Accepts the same filters, search, ordering and pagination parameters and
+    returns the same payload, but counts and fetches the page with the
+    async ORM. Limited by the 'search' rate like the sync list.
+    """
+    throttle_scopes = {'GET': 'search'}
+
+    async def get(self, request):
+        view = OfferViewSet(request=request, action='list', format_kwarg=None, args=(), kwargs={})
+        queryset = view.filter_queryset(view.get_queryset())
+        paginator = view.paginator
+        page = await paginator.apaginate_queryset(queryset, request, view=view)
+        serializer = OfferListSerializer(page, many=True, context=view.get_serializer_context())
+        return self.render(paginator.get_paginated_response(serializer.data).data)
+
+
+class AsyncOfferDetailView(AsyncAPIView):
+    """
+    Async variant of the offer retrieval (OfferViewSet.retrieve).
+    Requires an authenticated user and accepts `?include=details`.
+    """
+    authentication_required = True
+
+    async def get(self, request, id):
+        queryset = Offer.objects.prefetch_related('details')
+        serializer_class = OfferRetrieveSerializer
+        if details_included(request.query_params):
+            queryset = queryset.select_related('user')
+            serializer_class = OfferWithDetailsSerializer
+        try:
+            offer = await queryset.aget(id=id)
+        except Offer.DoesNotExist:
+            raise NotFound('No Offer matches the given query.')
+        serializer = serializer_class(offer, context={'request': request})
+        return self.render(serializer.data)
@@ -9,6 +9,15 @@ def check_parameters(query_params):
     pass
 
 
+def details_included(query_params):
+    """
+    Return True if the client asked for the complete offer details with
+    `?include=details`.
+    """
+    include = query_params.get('include', '')
+    return 'details' in include.split(',')
+
+
 def filter_with_creator_id_param(queryset, creator_id):
     """
     Filter the queryset by creator ID.
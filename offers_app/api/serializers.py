@@ -1,3 +1,4 @@
+from core.fast_serializers import ValuesSerializer
 from .functions import validate_details_function, create_offer_instance
 from offers_app.models import Offer, OfferDetails
 from rest_framework import serializers
@@ -228,3 +229,70 @@ class OfferRetrieveSerializer(OfferSerializer):
             "min_price",
             "min_delivery_time",
         ]
+
+
+class OfferWithDetailsSerializer(OfferRetrieveSerializer):
+    """
+    Serializer for retrieving a single Offer with `?include=details`.
+    Embeds the complete OfferDetails and the owner summary, so the offer page
+    needs no further requests.
+    """
+    details = OfferDetailsSerializer(many=True, read_only=True)
+    user_details = serializers.SerializerMethodField()
+
+    class Meta(OfferRetrieveSerializer.Meta):
+        """
+        Metadata configuration for the serializer.
+        """
+        fields = OfferRetrieveSerializer.Meta.fields + ["user_details"]
+
+    get_user_details = OfferListSerializer.get_user_details
+
+
+class OfferDetailsValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of OfferDetailsSerializer (see core/fast_serializers.py).
+    """
+    serializer_class = OfferDetailsSerializer
+
+
+class OfferListValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of OfferListSerializer for the offer list, built from
+    `.values()` rows (see core/fast_serializers.py).
+
+    `?expand=details` returns the complete details instead of their URLs.
+    """
+    serializer_class = OfferListSerializer
+    field_values = {
+        'details': ('id',),
+        'user_details': ('user__first_name', 'user__last_name', 'user__username'),
+    }
+    expandable = {'details': None}
+
+    def prepare(self, rows):
+        """
+        Load the details of all offers of the page with one query.
+        """
+        if not self.selected('details'):
+            return
+        self.details = {row['id']: [] for row in rows}
+        if 'details' in self.expand:
+            details = list(OfferDetailsValuesSerializer.values(
+                OfferDetails.objects.filter(offer_id__in=self.details), extra=['offer_id']))
+            for detail, data in zip(details, OfferDetailsValuesSerializer(details).data):
+                self.details[detail['offer_id']].append(data)
+        else:
+            details = OfferDetails.objects.filter(offer_id__in=self.details).values_list('offer_id', 'id')
+            for offer_id, detail_id in details:
+                self.details[offer_id].append({"id": detail_id, "url": f"/offerdetails/{detail_id}/"})
+
+    def represent_details(self, row):
+        return self.details[row['id']]
+
+    def represent_user_details(self, row):
+        return {
+            "first_name": row['user__first_name'],
+            "last_name": row['user__last_name'],
+            "username": row['user__username'],
+        }
@@ -1,6 +1,7 @@
 from django.urls import path, include
 from .views import OfferViewSet, OfferDetailListView, OffersDetailsSingleView, OfferOfBusinessUserView
 from rest_framework import routers
+from .async_views import AsyncOfferListView, AsyncOfferDetailView
 
 """
 URL configuration for the offers application.
@@ -16,6 +17,8 @@ Routes:
     /<business_user_id>/ (list offers of a specific business user)
     /offerdetails/ (list, create offer details)
     /offerdetails/<pk>/ (retrieve, update, delete single offer detail)
+    /async/offers/ (async list)
+    /async/offers/<id>/ (async retrieve)
 """
 
 router = routers.SimpleRouter()
@@ -44,5 +47,9 @@ urlpatterns = [
         'offerdetails/<int:pk>/',
         OffersDetailsSingleView.as_view(),
         name="offerdetails-detail"
-    )
+    ),
+
+    # Async read-only variants of the offer list and detail endpoints
+    path('async/offers/', AsyncOfferListView.as_view(), name="offer-list-async"),
+    path('async/offers/<int:id>/', AsyncOfferDetailView.as_view(), name="offer-detail-async"),
 ]
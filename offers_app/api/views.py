@@ -1,22 +1,29 @@
 from django.forms import ValidationError
-from rest_framework.views import APIView
 from offers_app.models import Offer, OfferDetails
+from offers_app.tasks import refresh_offer_aggregates
+from profile_app.models import UserProfile
 from .serializers import OfferSerializer, OfferDetailsSerializer, OfferListSerializer, OfferRetrieveSerializer
+from .serializers import OfferListValuesSerializer, OfferWithDetailsSerializer
+from core.batch import lookup_batch, parse_id_list
+from core.fast_serializers import FastListMixin
 from rest_framework import viewsets, generics, filters
+from rest_framework.exceptions import NotFound
 from rest_framework.response import Response
-from rest_framework import status, permissions
+from rest_framework import permissions
 from .pagination import OfferPagination
 from .permissions import IsBusinessUserOrReadOnlyOffers, IsOwnerForPatchDeleteOrReadOnlyOffers
 from .functions import filter_with_min_delivery_time_param, filter_with_creator_id_param, filter_with_min_price_param, check_parameters
+from .functions import details_included
 
 
-class OfferViewSet(viewsets.ModelViewSet):
+class OfferViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Offer instances.
     Supports CRUD operations with filtering, searching, ordering, and pagination.
     """
 
     serializer_class = OfferSerializer
+    fast_serializer_class = OfferListValuesSerializer
     pagination_class = OfferPagination
     filter_backends = [filters.SearchFilter, filters.OrderingFilter]
     search_fields = ['title', 'description']
@@ -27,6 +34,7 @@ class OfferViewSet(viewsets.ModelViewSet):
         IsOwnerForPatchDeleteOrReadOnlyOffers
     ]
     lookup_field = 'id'
+    throttle_scopes = {'list': 'search'}
 
     def get_permissions(self):
         permission_classes = [permissions.AllowAny]
@@ -46,8 +54,18 @@ class OfferViewSet(viewsets.ModelViewSet):
         Return filtered queryset based on optional query parameters:
         - creator_id: filter offers by user ID
         - max_delivery_time: filter offers with min_delivery_time <= given value
+
+        The list loads the owners and details of the page in two extra
+        queries instead of two per offer. The retrieval with
+        `?include=details` joins the owner and prefetches the details.
         """
         queryset = Offer.objects.all()
+        if self.action == 'list':
+            queryset = queryset.select_related('user').prefetch_related('details')
+        elif self.action == 'retrieve':
+            queryset = queryset.prefetch_related('details')
+            if details_included(self.request.query_params):
+                queryset = queryset.select_related('user')
         creator_id = self.request.query_params.get('creator_id')
         min_delivery_time = self.request.query_params.get('max_delivery_time')
         min_price = self.request.query_params.get('min_price')
@@ -82,16 +100,27 @@ class OfferViewSet(viewsets.ModelViewSet):
             min_delivery_time=min_delivery_time
         )
 
+    def perform_update(self, serializer):
+        """
+        Save the offer and queue the recomputation of min_price and
+        min_delivery_time from its details.
+        """
+        offer = serializer.save()
+        refresh_offer_aggregates.enqueue(offer_id=offer.id)
+
     def get_serializer_class(self):
         """
         Return the appropriate serializer based on the action:
         - list -> OfferListSerializer
-        - retrieve -> OfferRetrieveSerializer
+        - retrieve -> OfferRetrieveSerializer, or OfferWithDetailsSerializer
+          with `?include=details`
         - create/update/partial_update -> OfferSerializer
         """
         if self.action == "list":
             return OfferListSerializer
         if self.action == "retrieve":
+            if details_included(self.request.query_params):
+                return OfferWithDetailsSerializer
             return OfferRetrieveSerializer
         return OfferSerializer
 
@@ -100,53 +129,80 @@ class OfferDetailListView(generics.ListCreateAPIView):
     """
     API view to list all OfferDetails or create a new one.
     Requires authenticated user.
+
+    `?ids=3,1,2` returns only the given details in the requested order and
+    the ids that do not exist (see core/batch.py).
     """
     queryset = OfferDetails.objects.all()
     serializer_class = OfferDetailsSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def list(self, request, *args, **kwargs):
+        if 'ids' not in request.query_params:
+            return super().list(request, *args, **kwargs)
+        ids = parse_id_list(request.query_params['ids'], 'ids')
+        details, missing = lookup_batch(self.get_queryset(), ids)
+        serializer = self.get_serializer(details, many=True)
+        return Response({"results": serializer.data, "missing": missing})
+
+    def perform_create(self, serializer):
+        detail = serializer.save()
+        refresh_offer_aggregates.enqueue(offer_id=detail.offer_id)
+
 
 class OffersDetailsSingleView(generics.RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a single OfferDetails instance.
     Requires authenticated user.
+
+    Changes queue the recomputation of the offer's min_price and
+    min_delivery_time.
     """
     queryset = OfferDetails.objects.all()
     serializer_class = OfferDetailsSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def perform_update(self, serializer):
+        detail = serializer.save()
+        refresh_offer_aggregates.enqueue(offer_id=detail.offer_id)
+
+    def perform_destroy(self, instance):
+        offer_id = instance.offer_id
+        instance.delete()
+        refresh_offer_aggregates.enqueue(offer_id=offer_id)
 
-class OfferOfBusinessUserView(APIView):
+
+class OfferOfBusinessUserView(FastListMixin, generics.ListAPIView):
     """
-    API view for retrieving offers belonging to a specific business user.
+    API view listing the offers of a single business user (storefront).
 
-    Provides an endpoint to fetch offers associated with a given business user ID.
-    If the user exists and is of type "business", their offer is returned.
-    Otherwise, a message indicating that the customer user has no offers is returned.
+    The offers are paginated and ordered like the main offer list and accept
+    `ordering`, `fields` and `expand`. The business profile check is a join
+    of the offer query, so a page needs a constant number of queries. Only
+    an empty result looks up the profile, to answer 404 for users that do
+    not exist or are no business users.
     """
+    serializer_class = OfferListSerializer
+    fast_serializer_class = OfferListValuesSerializer
+    pagination_class = OfferPagination
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['min_price', 'updated_at']
+    ordering = ['-updated_at']
 
-    def get(self, request, business_user_id):
+    def get_queryset(self):
         """
-        Handle GET requests.
-
-        Retrieve offers created by a specific business user, identified by their ID.
-        If the user type is "business", return their offer data.
-
-        Parameters:
-            request: Request
-                The HTTP request object.
-            business_user_id: int
-                The ID of the business user whose offers are requested.
-
-        Returns:
-            Response:
-                - On success: JSON response containing the offer data and HTTP 200 OK.
-                - If no business offers exist: JSON message indicating absence of offers.
+        Return the offers of the business user given in the URL.
         """
-        offers = Offer.objects.filter(user=business_user_id)
-        for offer in offers:
-            if offer.user.type == "business":
-                serializer = OfferSerializer(offer)
-                return Response(serializer.data, status=status.HTTP_200_OK)
+        return Offer.objects.filter(
+            user_id=self.kwargs['business_user_id'], user__profile__type="business"
+        ).select_related('user').prefetch_related('details')
 
-        return Response({"message": "The customer user do not have offers"})
+    def list(self, request, *args, **kwargs):
+        """
+        List the offers, or answer 404 if the user is no business user.
+        """
+        response = super().list(request, *args, **kwargs)
+        if not response.data['count'] and not UserProfile.objects.filter(
+                user_id=kwargs['business_user_id'], type="business").exists():
+            raise NotFound("Der Geschäftsnutzer existiert nicht")
+        return response
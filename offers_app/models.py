@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Min, OuterRef, Subquery
 from django.contrib.auth.models import User
 from profile_app.models import UserProfile
 
@@ -32,6 +33,27 @@ class Offer(models.Model):
     def __str__(self):
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Save the offer and record its change event in the same transaction
+        (see events_app.signals).
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def refresh_aggregates(cls, offer_ids):
+        """
+        Recompute min_price and min_delivery_time of the offers from their
+        details with one UPDATE.
+        """
+        details = OfferDetails.objects.filter(offer=OuterRef("pk")).order_by().values("offer")
+        cls.objects.filter(pk__in=offer_ids).update(
+            min_price=Subquery(details.annotate(value=Min("price")).values("value")),
+            min_delivery_time=Subquery(
+                details.annotate(value=Min("delivery_time_in_days")).values("value")),
+        )
+
     class Meta:
         verbose_name = 'Offer'
         verbose_name_plural = 'Offers'
@@ -63,6 +85,14 @@ class OfferDetails(models.Model):
     def __str__(self):
         return self.title
     
+    def save(self, *args, **kwargs):
+        """
+        Save the offer detail and record its change event in the same transaction
+        (see events_app.signals).
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
     class Meta:
         verbose_name = 'Offer Detail'
 
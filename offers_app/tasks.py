@@ -0,0 +1,8 @@
+from jobs_app.queue import task
+from offers_app.models import Offer
+
+
+@task('offers.refresh_offer_aggregates', batch=True)
+def refresh_offer_aggregates(payloads):
+    """Recompute min_price and min_delivery_time of the offers of the payloads."""
+    Offer.refresh_aggregates({payload['offer_id'] for payload in payloads})
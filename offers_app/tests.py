@@ -1,11 +1,18 @@
-from django.test import TestCase
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 
 from offers_app.api.serializers import OfferSerializer
-from offers_app.models import Offer
+from offers_app.models import Offer, OfferDetails
+from profile_app.models import UserProfile
+from user_auth_app.models import ExpiringToken
 
 
 class OfferTest(APITestCase):
@@ -22,3 +29,194 @@ class OfferTest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data, expexted_data)
         self.assertContains(response, 'title')
+
+
+class AsyncOfferViewsTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username="Shop", first_name="Sam")
+        self.token = ExpiringToken.objects.create(user=self.user)
+        for index in range(8):
+            offer = Offer.objects.create(
+                user=self.user, title=f"Offer {index}", description="Logo design", min_price=10 + index)
+            OfferDetails.objects.create(
+                offer=offer, title="Basic", revisions=1, delivery_time_in_days=2,
+                price=10 + index, features=["Logo"], offer_type="basic")
+
+    def test_async_list_matches_sync_list(self):
+        params = {"page": 2, "ordering": "min_price", "search": "logo"}
+        sync_response = self.client.get(reverse("offer-list"), params)
+        async_response = self.client.get(reverse("offer-list-async"), params)
+
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(async_response.json()["count"], sync_response.json()["count"])
+        self.assertEqual(async_response.json()["results"], sync_response.json()["results"])
+        self.assertEqual(
+            async_response.json()["previous"].replace("/async", ""), sync_response.json()["previous"])
+
+    def test_async_detail_requires_token(self):
+        offer = Offer.objects.first()
+        url = reverse("offer-detail-async", kwargs={"id": offer.id})
+
+        anonymous = self.client.get(url)
+        invalid = self.client.get(url, HTTP_AUTHORIZATION="Token wrong")
+        response = self.client.get(url, HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+        self.assertEqual(anonymous.status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(invalid.json(), {"detail": "Invalid token."})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["id"], offer.id)
+
+    @override_settings(REST_FRAMEWORK={
+        'DEFAULT_AUTHENTICATION_CLASSES': ['user_auth_app.authentication.ExpiringTokenAuthentication'],
+        'DEFAULT_THROTTLE_RATES': {'search': '2/min'},
+    })
+    def test_async_list_shares_the_search_limit(self):
+        cache.clear()
+        self.client.get(reverse("offer-list"))
+        self.client.get(reverse("offer-list-async"))
+        response = self.client.get(reverse("offer-list-async"))
+
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn("Retry-After", response)
+
+
+class OfferIncludeDetailsTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username="Shop", first_name="Sam")
+        self.token = ExpiringToken.objects.create(user=self.user)
+        self.offer = Offer.objects.create(
+            user=self.user, title="Offer", description="Logo design", min_price=10)
+        OfferDetails.objects.create(
+            offer=self.offer, title="Basic", revisions=1, delivery_time_in_days=2,
+            price=10, features=["Logo"], offer_type="basic")
+        self.client.credentials(HTTP_AUTHORIZATION=f"Token {self.token.key}")
+
+    def test_detail_with_included_details_embeds_packages(self):
+        url = reverse("offer-detail", kwargs={"id": self.offer.id})
+        self.client.get(url)
+
+        with CaptureQueriesContext(connection) as linked:
+            self.client.get(url)
+        with CaptureQueriesContext(connection) as included:
+            response = self.client.get(url, {"include": "details"})
+        async_response = self.client.get(
+            reverse("offer-detail-async", kwargs={"id": self.offer.id}), {"include": "details"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["details"][0]["title"], "Basic")
+        self.assertEqual(response.json()["details"][0]["features"], ["Logo"])
+        self.assertEqual(
+            response.json()["user_details"], {"first_name": "Sam", "last_name": "", "username": "Shop"})
+        self.assertEqual(len(included), len(linked))
+        self.assertEqual(async_response.json(), response.json())
+
+
+class OfferDetailsBatchLookupTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username="Shop")
+        for index in range(4):
+            offer = Offer.objects.create(
+                user=self.user, title=f"Offer {index}", description="Logo design", min_price=10)
+            OfferDetails.objects.create(
+                offer=offer, title="Basic", revisions=1, delivery_time_in_days=2,
+                price=10, features=["Logo"], offer_type="basic")
+        self.client.force_authenticate(self.user)
+
+    def test_offer_details_keep_requested_order_and_report_missing(self):
+        ids = list(OfferDetails.objects.order_by("-id").values_list("id", flat=True)[:3])
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("offerdetails-list"), {"ids": ",".join(map(str, ids + [999]))})
+
+        self.assertEqual([detail["id"] for detail in response.data["results"]], ids)
+        self.assertEqual(response.data["missing"], [999])
+
+
+class OfferListQueryTest(APITestCase):
+
+    def test_offer_list_queries_do_not_grow_with_page_size(self):
+        for index in range(6):
+            user = User.objects.create(username=f"Shop {index}")
+            offer = Offer.objects.create(user=user, title=f"Offer {index}", description="Logo design")
+            for offer_type in ("basic", "standard", "premium"):
+                OfferDetails.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=2,
+                    price=10, features=[], offer_type=offer_type)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse("offer-list"))
+
+        self.assertEqual(len(response.json()["results"]), 6)
+        self.assertEqual(response.json()["results"][0]["user_details"]["username"], "Shop 5")
+
+    def test_fast_offer_list_is_byte_identical(self):
+        user = User.objects.create(username="Shop", first_name="Sam", last_name="Smith")
+        for index in range(4):
+            offer = Offer.objects.create(
+                user=user, title=f"Offer {index}", description="Logo design",
+                image="offer-images/logo.png" if index % 2 else None,
+                min_price=Decimal("10.50") + index, min_delivery_time=index + 1)
+            OfferDetails.objects.create(
+                offer=offer, title="Basic", revisions=1, delivery_time_in_days=2,
+                price=10, features=["Logo"], offer_type="basic")
+
+        params = {"ordering": "min_price", "search": "logo"}
+        fast = self.client.get(reverse("offer-list"), params)
+        with override_settings(FAST_LIST_SERIALIZERS=False):
+            regular = self.client.get(reverse("offer-list"), params)
+
+        self.assertEqual(fast.json()["count"], 4)
+        self.assertEqual(fast.content, regular.content)
+
+    def test_sparse_fieldset_trims_payload_and_columns(self):
+        user = User.objects.create(username="Shop")
+        offer = Offer.objects.create(user=user, title="Logo", description="Logo design", min_price=10)
+        OfferDetails.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=2,
+            price=10, features=["Logo"], offer_type="basic")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("offer-list"), {"fields": "id,min_price"})
+        self.assertEqual(response.json()["results"], [{"id": offer.id, "min_price": 10.0}])
+        self.assertNotIn("description", queries.captured_queries[-1]["sql"])
+
+        response = self.client.get(reverse("offer-list"), {"fields": "id", "expand": "details"})
+        self.assertEqual(response.json()["results"][0]["details"][0]["features"], ["Logo"])
+
+        response = self.client.get(reverse("offer-list"), {"fields": "id,secret"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class OfferOfBusinessUserTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create(username="Shop")
+        UserProfile.objects.create(user=self.business, username="Shop", type="business")
+        for index in range(8):
+            offer = Offer.objects.create(user=self.business, title=f"Offer {index}", description="Logo")
+            for offer_type in ("basic", "standard", "premium"):
+                OfferDetails.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=2,
+                    price=10, features=[], offer_type=offer_type)
+
+    def test_storefront_is_paginated_with_constant_queries(self):
+        url = reverse("offer_business_user", kwargs={"business_user_id": self.business.id})
+        for fast in (True, False):
+            with override_settings(FAST_LIST_SERIALIZERS=fast), self.assertNumQueries(3):
+                response = self.client.get(url)
+
+            self.assertEqual(response.json()["count"], 8)
+            self.assertEqual(len(response.json()["results"]), 6)
+            self.assertEqual(len(response.json()["results"][0]["details"]), 3)
+
+    def test_customer_has_no_storefront(self):
+        customer = User.objects.create(username="Ann")
+        UserProfile.objects.create(user=customer, username="Ann", type="customer")
+        Offer.objects.create(user=customer, title="Not for sale", description="-")
+
+        url = reverse("offer_business_user", kwargs={"business_user_id": customer.id})
+        self.assertEqual(self.client.get(url).status_code, status.HTTP_404_NOT_FOUND)
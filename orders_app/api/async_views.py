@@ -0,0 +1,48 @@
+import asyncio
+
+from django.conf import settings
+
+from core.async_api import AsyncAPIView, sse_message
+from core.pubsub import subscribe
+from .functions import order_channel
+
+
+class OrderStatusStreamView(AsyncAPIView):
+    """
+    Server-Sent Events stream of the status changes of the user's orders,
+    as customer or business user.
+
+    Replaces polling the order list and the count views: the stream waits
+    on an in-process subscription (see core/pubsub.py) and runs no queries
+    while idle, a comment line is sent as heartbeat every
+    ORDER_STREAM_HEARTBEAT_SECONDS. Every change is sent as an
+    `order.status` event. The stream ends after ORDER_STREAM_SECONDS, or
+    when the client falls behind, and the client reconnects and reloads
+    its orders.
+
+    Requires an authenticated user and ASGI. Connections are limited by the
+    'stream' rate.
+    """
+    authentication_required = True
+    throttle_scope = 'stream'
+
+    async def get(self, request):
+        unavailable = self.stream_unavailable(request)
+        if unavailable:
+            return unavailable
+        return self.event_stream(self.stream(order_channel(request.user.pk)))
+
+    async def stream(self, channel):
+        loop = asyncio.get_running_loop()
+        closes_at = loop.time() + settings.ORDER_STREAM_SECONDS
+        async with subscribe(channel) as subscription:
+            yield b'retry: 3000\n\n'
+            while not subscription.overflowed:
+                remaining = closes_at - loop.time()
+                if remaining <= 0:
+                    break
+                message = await subscription.get(min(settings.ORDER_STREAM_HEARTBEAT_SECONDS, remaining))
+                if message is None:
+                    yield b': keepalive\n\n'
+                else:
+                    yield sse_message(message, event='order.status')
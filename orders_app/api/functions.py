@@ -1,3 +1,5 @@
+from rest_framework import serializers
+from core.pubsub import publish
 from orders_app.models import Order
 
 def create_new_order(offer_detail, validated_data):
@@ -12,3 +14,25 @@ def create_new_order(offer_detail, validated_data):
         features=offer_detail.features,
         offer_type=offer_detail.offer_type,
     )
+
+
+def order_channel(user_id):
+    """Return the pub/sub channel of the order status stream of a user."""
+    return f'orders.user.{user_id}'
+
+
+def publish_status_change(order, previous_status):
+    """
+    Push a status change of an order to the streams of its customer and
+    business user (see OrderStatusStreamView).
+    """
+    message = {
+        'id': order.id,
+        'status': order.status,
+        'previous_status': previous_status,
+        'customer_user': order.customer_user_id,
+        'business_user': order.business_user_id,
+        'updated_at': serializers.DateTimeField().to_representation(order.updated_at),
+    }
+    for user_id in {order.customer_user_id, order.business_user_id}:
+        publish(order_channel(user_id), message)
@@ -1,11 +1,13 @@
 from django.contrib.auth.models import User
+from django.db import transaction
+from core.fast_serializers import USER_EXPANSION_FIELDS, ValuesSerializer
 from rest_framework import serializers
 from rest_framework.exceptions import NotFound
 from orders_app.models import Order
 from offers_app.models import OfferDetails
 from profile_app.models import UserProfile
 from offers_app.api.serializers import OfferDetailsSerializer
-from .functions import create_new_order
+from .functions import create_new_order, publish_status_change
 
 
 class OrderListSerializer(serializers.ModelSerializer):
@@ -155,3 +157,28 @@ class OrderUpdateSerializer(serializers.ModelSerializer):
                 {"status": "Zulässige Werte sind: in_progress, cancelled or completed"})
 
         return status
+
+    def update(self, instance, validated_data):
+        """
+        Update the order and, once the transaction is committed, push a
+        status change to the order streams of its customer and business user.
+        """
+        previous_status = instance.status
+        order = super().update(instance, validated_data)
+        if order.status != previous_status:
+            transaction.on_commit(lambda: publish_status_change(order, previous_status))
+        return order
+
+
+class OrderListValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of OrderListSerializer for the order list, built from
+    `.values()` rows (see core/fast_serializers.py).
+
+    `?expand=customer_user,business_user` returns the users instead of their ids.
+    """
+    serializer_class = OrderListSerializer
+    expandable = {
+        'customer_user': USER_EXPANSION_FIELDS,
+        'business_user': USER_EXPANSION_FIELDS,
+    }
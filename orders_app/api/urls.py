@@ -1,12 +1,13 @@
 from django.urls import path, include
 from .views import OrdersViewSet, OrderCountView, CompletedOrderCountView
 from rest_framework import routers
+from .async_views import OrderStatusStreamView
 
 """URL configuration for Order-related API endpoints.
 
 This module defines the routes for managing orders, including CRUD operations,
-retrieving the total order count for a business user, and retrieving the count
-of completed orders.
+retrieving the total order count for a business user, retrieving the count
+of completed orders, and the live order status stream (ASGI).
 """
 
 router = routers.SimpleRouter()
@@ -17,5 +18,6 @@ urlpatterns = [
     path('order-count/<int:business_user_id>/',
          OrderCountView.as_view(), name="order_count-detail"),
     path('completed-order-count/<int:business_user_id>/',
-         CompletedOrderCountView.as_view(), name="completed_order_count-detail")
+         CompletedOrderCountView.as_view(), name="completed_order_count-detail"),
+    path('async/orders/stream/', OrderStatusStreamView.as_view(), name="order-status-stream"),
 ]
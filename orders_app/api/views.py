@@ -3,7 +3,8 @@ from django.shortcuts import get_object_or_404
 from django.db.models import Q
 from profile_app.models import UserProfile
 from django.contrib.auth.models import User
-from .serializers import OrderListSerializer, OrderCreateSerializer, OrderUpdateSerializer
+from .serializers import OrderListSerializer, OrderCreateSerializer, OrderUpdateSerializer, OrderListValuesSerializer
+from core.fast_serializers import FastListMixin
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from orders_app.models import Order
@@ -12,7 +13,7 @@ from rest_framework.views import APIView
 from .permissions import IsCustomerUserForPostOrReadOnlyOrders, IsBusinessUserForUpdateOrder
 
 
-class OrdersViewSet(viewsets.ModelViewSet):
+class OrdersViewSet(FastListMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Order instances.
     Supports CRUD operations with permissions based on user role.
@@ -22,6 +23,8 @@ class OrdersViewSet(viewsets.ModelViewSet):
         IsBusinessUserForUpdateOrder,
         IsAuthenticated
     ]
+    throttle_scopes = {'create': 'order_create'}
+    fast_serializer_class = OrderListValuesSerializer
 
     def get_queryset(self):
         """
@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from offers_app.models import Offer, OfferDetails
 from profile_app.models import UserProfile, User
 
@@ -28,6 +30,28 @@ class Order(models.Model):
     def __str__(self):
         return self.status
 
+    def save(self, *args, **kwargs):
+        """
+        Save the order and record its change event in the same transaction
+        (see events_app.signals).
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    @classmethod
+    def sync_profiles(cls, business_user_ids):
+        """
+        Store the number of completed orders of the business users in
+        UserProfile.completed_order_count (ranking of the business
+        directory) with one UPDATE.
+        """
+        completed = (
+            cls.objects.filter(business_user_id=OuterRef("user_id"), status="completed")
+            .order_by().values("business_user_id").annotate(count=Count("id")).values("count")[:1]
+        )
+        UserProfile.objects.filter(user_id__in=business_user_ids).update(
+            completed_order_count=Coalesce(Subquery(completed), 0))
+
     class Meta:
         verbose_name = 'Order'
         verbose_name_plural = 'Orders'
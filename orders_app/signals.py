@@ -0,0 +1,18 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from orders_app.models import Order
+from orders_app.tasks import sync_completed_order_counts
+
+
+@receiver(post_save, sender=Order)
+def update_completed_order_count_on_save(sender, instance, created, raw=False, **kwargs):
+    """Queue a recount of the completed orders of the order's business user."""
+    if raw or created and instance.status != "completed":
+        return
+    sync_completed_order_counts.enqueue(business_user_id=instance.business_user_id)
+
+
+@receiver(post_delete, sender=Order)
+def update_completed_order_count_on_delete(sender, instance, **kwargs):
+    """Queue a recount of the completed orders of the deleted order's business user."""
+    sync_completed_order_counts.enqueue(business_user_id=instance.business_user_id)
@@ -0,0 +1,8 @@
+from jobs_app.queue import task
+from orders_app.models import Order
+
+
+@task('orders.sync_completed_order_counts', batch=True)
+def sync_completed_order_counts(payloads):
+    """Recount the completed orders of the business users of the payloads."""
+    Order.sync_profiles({payload['business_user_id'] for payload in payloads})
@@ -1,3 +1,97 @@
-from django.test import TestCase
+import asyncio
+import json
+from decimal import Decimal
 
-# Create your tests here.
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.pubsub import get_broker
+from offers_app.models import Offer, OfferDetails
+from orders_app.models import Order
+from profile_app.models import UserProfile
+from user_auth_app.models import ExpiringToken
+
+
+class OrderListValuesSerializerTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create(username="Shop")
+        self.customer = User.objects.create(username="Ann")
+        offer = Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        detail = OfferDetails.objects.create(
+            offer=offer, title="Premium", revisions=-1, delivery_time_in_days=7,
+            price=Decimal("249.90"), features=["Logo", "Flyer"], offer_type="premium")
+        for index in range(3):
+            Order.objects.create(
+                offer_detail=detail, customer_user=self.customer, business_user=self.business,
+                title=f"Logo {index}", revisions=-1, delivery_time_in_days=7,
+                price=Decimal("249.90") + index, features=["Logo", "Flyer"], offer_type="premium")
+
+    def test_fast_order_list_is_byte_identical(self):
+        self.client.force_authenticate(self.customer)
+        fast = self.client.get(reverse("orders-list"))
+        with override_settings(FAST_LIST_SERIALIZERS=False):
+            regular = self.client.get(reverse("orders-list"))
+
+        self.assertEqual(len(fast.json()), 3)
+        self.assertEqual(fast.content, regular.content)
+
+    @override_settings(FAST_LIST_SERIALIZERS=False)
+    def test_expand_returns_users_even_without_fast_default(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(reverse("orders-list"), {"fields": "id,price", "expand": "business_user"})
+
+        self.assertEqual(response.json()[0], {
+            "id": Order.objects.order_by("id").first().id,
+            "business_user": {"id": self.business.id, "username": "Shop", "first_name": "", "last_name": ""},
+            "price": 249.9,
+        })
+
+
+class OrderStatusStreamTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create(username="Shop")
+        self.customer = User.objects.create(username="Ann")
+        UserProfile.objects.create(user=self.business, username="Shop", type="business")
+        offer = Offer.objects.create(user=self.business, title="Logo", description="Logo design")
+        detail = OfferDetails.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=Decimal("50.00"), features=["Logo"], offer_type="basic")
+        self.order = Order.objects.create(
+            offer_detail=detail, customer_user=self.customer, business_user=self.business,
+            title="Basic", revisions=1, delivery_time_in_days=3, price=Decimal("50.00"),
+            features=["Logo"], offer_type="basic")
+        self.token = ExpiringToken.objects.create(user=self.customer)
+
+    def complete_order(self):
+        self.client.force_authenticate(self.business)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                reverse("orders-detail", kwargs={"pk": self.order.id}), {"status": "completed"}, format="json")
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(ORDER_STREAM_SECONDS=0.5, ORDER_STREAM_HEARTBEAT_SECONDS=0.1)
+    async def test_status_change_is_pushed_to_customer(self):
+        response = await self.async_client.get(
+            reverse("order-status-stream"), headers={"Authorization": f"Token {self.token.key}"})
+        chunks = aiter(response.streaming_content)
+        self.assertEqual(await anext(chunks), b"retry: 3000\n\n")
+
+        await sync_to_async(self.complete_order)()
+        message = await asyncio.wait_for(anext(chunks), 1)
+        rest = [chunk async for chunk in chunks]
+
+        self.assertTrue(message.startswith(b"event: order.status\ndata: "))
+        self.assertEqual(json.loads(message.split(b"data: ")[1])["status"], "completed")
+        self.assertIn(b": keepalive\n\n", rest)
+        self.assertEqual(get_broker().subscriber_count(), 0)
+
+    def test_stream_requires_asgi(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(
+            reverse("order-status-stream"), HTTP_AUTHORIZATION=f"Token {self.token.key}")
+        self.assertEqual(response.status_code, 501)
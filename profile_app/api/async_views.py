@@ -0,0 +1,34 @@
+from core.async_api import AsyncAPIView
+from profile_app.models import UserProfile
+from .serializers import BusinessUserProfileSerializer, CustomerUserProfileSerializer
+
+
+class AsyncBusinessProfilesListView(AsyncAPIView):
+    """
+    Async variant of BusinessProfilesListView.
+    Requires an authenticated user.
+    """
+    authentication_required = True
+
+    async def get(self, request):
+        queryset = UserProfile.objects.filter(
+            type="business").select_related('user__rating_summary')
+        user_profiles = [profile async for profile in queryset]
+        serializer = BusinessUserProfileSerializer(
+            user_profiles, many=True, context={'request': request})
+        return self.render(serializer.data)
+
+
+class AsyncCustomerProfilesListView(AsyncAPIView):
+    """
+    Async variant of CustomerProfilesListView.
+    Requires an authenticated user.
+    """
+    authentication_required = True
+
+    async def get(self, request):
+        queryset = UserProfile.objects.filter(type="customer")
+        user_profiles = [profile async for profile in queryset]
+        serializer = CustomerUserProfileSerializer(
+            user_profiles, many=True, context={'request': request})
+        return self.render(serializer.data)
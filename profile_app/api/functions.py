@@ -0,0 +1,49 @@
+from rest_framework.exceptions import ValidationError
+from profile_app.models import UserProfile
+from profile_app.search import filter_search
+
+
+def filter_with_type_param(queryset, profile_type):
+    """
+    Filter the queryset by profile type ('business' or 'customer').
+
+    Raises ValidationError for other types.
+    """
+    types = [value for value, _ in UserProfile.USER_TYPES]
+    if profile_type not in types:
+        raise ValidationError(
+            {'type': f"Ungültiger Profiltyp. Erlaubt sind: {', '.join(types)}"})
+    return queryset.filter(type=profile_type)
+
+
+def filter_with_search_param(queryset, search):
+    """
+    Filter the queryset by words of location, description and working
+    hours (prefix matches, all words must match) through the full-text
+    index.
+    """
+    return filter_search(queryset, search)
+
+
+def filter_with_location_param(queryset, location):
+    """
+    Filter the queryset by words of the location (prefix matches) through
+    the full-text index.
+    """
+    return filter_search(queryset, location, location_only=True)
+
+
+def filter_with_min_rating_param(queryset, min_rating):
+    """
+    Filter the queryset to profiles with an average rating of at least
+    `min_rating` (0 to 5).
+
+    Raises ValidationError if the value is invalid.
+    """
+    try:
+        min_rating = float(min_rating)
+        if not 0 <= min_rating <= 5:
+            raise ValueError()
+    except ValueError:
+        raise ValidationError({'min_rating': 'min_rating muss eine Zahl zwischen 0 und 5 sein.'})
+    return queryset.filter(rating_average__gte=min_rating)
@@ -0,0 +1,46 @@
+from functools import partial
+
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from rest_framework.pagination import PageNumberPagination
+
+
+class CountQuerysetPaginator(Paginator):
+    """
+    Paginator that counts `count_queryset` instead of the paginated rows.
+
+    The rows of the fast list path are a values() queryset joined to every
+    serialized relation; counting the plain filtered queryset skips those
+    joins.
+    """
+
+    def __init__(self, object_list, per_page, count_queryset=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_queryset = count_queryset
+
+    @cached_property
+    def count(self):
+        if self.count_queryset is None:
+            return super().count
+        return self.count_queryset.count()
+
+
+class DirectoryPagination(PageNumberPagination):
+    """
+    Pagination of the business directory.
+
+    The total is counted on the view's `get_count_queryset()`.
+
+    Attributes:
+        page_size (int): Profiles per page. Default is 20.
+        page_size_query_param (str): Lets clients choose the page size.
+        max_page_size (int): The maximum page size. Default is 100.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+    def paginate_queryset(self, queryset, request, view=None):
+        count_queryset = view.get_count_queryset() if hasattr(view, 'get_count_queryset') else None
+        self.django_paginator_class = partial(CountQuerysetPaginator, count_queryset=count_queryset)
+        return super().paginate_queryset(queryset, request, view)
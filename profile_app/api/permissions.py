@@ -6,14 +6,17 @@ class IsOwnerForPatchDeleteOrReadOnlyProfiles(BasePermission):
     """Permission class that allows owners to modify their objects.
 
     Grants full access to the object's owner for PUT, PATCH, or DELETE requests,
-    while allowing read-only access (safe methods) for other users.
+    while allowing read-only access (safe methods) for other users. Guest
+    accounts, which log in without a password, can only change their own
+    profile.
     """
 
     def has_object_permission(self, request, view, obj):
         """Determine whether the requesting user has permission on the object.
 
         Returns True if the request is read-only.
-        Returns True if the user is the owner of the object for update or delete.
+        Returns True if the user is the owner of the object or a superuser for
+        update or delete.
         Returns False otherwise.
         """
         if request.method in SAFE_METHODS:
@@ -23,9 +26,7 @@ class IsOwnerForPatchDeleteOrReadOnlyProfiles(BasePermission):
             return True
 
         if request.method in ('PUT', 'PATCH', 'DELETE'):
-            is_superuser = request.user.is_superuser
-            is_guest_user = (request.user.username == "GuestBusiness") or (
-                request.user.username == "GuestCustomer")
-            is_owner = request.user == obj.user
-            return is_owner or is_superuser or is_guest_user
+            # Compare ids, so the profile's user is not loaded.
+            is_owner = request.user.pk == obj.user_id
+            return is_owner or request.user.is_superuser
         return False
@@ -1,19 +1,31 @@
 from profile_app.models import UserProfile
-from user_auth_app.api.serializers import UserSerializer
+from user_auth_app.api.serializers import UserSerializer, email_taken
+from user_auth_app.guests import is_guest
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.exceptions import PermissionDenied
+from reviews_app.api.serializers import RatingSummarySerializer
+from reviews_app.api.functions import get_rating_summary
+from reviews_app.models import BusinessRatingSummary
+from core.fast_serializers import ValuesSerializer
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
     """Serializer for the UserProfile model.
 
-    Serializes UserProfile instances along with nested User data.
-    Supports updating both the UserProfile fields and the related User
-    object in a single request.
+    The profile holds the user-facing copy of the name fields. An update
+    writes the changed USER_FIELDS to the related User in the same
+    transaction, so both rows always agree and readers can use whichever
+    row they already have (e.g. the offer list the joined User). Only the
+    owner of the profile or a superuser may change the User.
     """
 
     user = serializers.PrimaryKeyRelatedField(read_only=True)
 
+    # Profile fields that are copied to the User.
+    USER_FIELDS = ('username', 'first_name', 'last_name', 'email')
+
     class Meta:
         """Meta options for the UserProfileSerializer."""
 
@@ -23,6 +35,51 @@ class UserProfileSerializer(serializers.ModelSerializer):
             'description', 'working_hours', 'type', 'created_at'
         ]
 
+    def validate_username(self, value):
+        """
+        Reject usernames of other users and renaming a guest account.
+        """
+        if self.instance is None or value == self.instance.username:
+            return value
+        if is_guest(self.instance.username):
+            raise serializers.ValidationError(
+                'Der Benutzername eines Gastzugangs kann nicht geändert werden.')
+        if User.objects.filter(username=value).exclude(pk=self.instance.user_id).exists():
+            raise serializers.ValidationError('Dieser Benutzername ist bereits vergeben.')
+        return value
+
+    def validate_email(self, value):
+        """
+        Reject email addresses of other users (ignoring case).
+        """
+        if self.instance is not None and email_taken(value, exclude_user_id=self.instance.user_id):
+            raise serializers.ValidationError('Diese E-Mail-Adresse ist bereits vergeben.')
+        return value
+
+    def update(self, instance, validated_data):
+        """
+        Update the profile and copy changed name fields to the User, in one
+        transaction and without loading the User.
+        """
+        request = self.context.get('request')
+        if request is not None and not (request.user.pk == instance.user_id or request.user.is_superuser):
+            raise PermissionDenied('Nur der Inhaber kann sein Profil ändern.')
+        user_changes = {
+            field: validated_data[field] for field in self.USER_FIELDS
+            if field in validated_data and validated_data[field] != getattr(instance, field)
+        }
+        try:
+            with transaction.atomic():
+                instance = super().update(instance, validated_data)
+                if user_changes:
+                    # save() with update_fields runs a single UPDATE and
+                    # still sends post_save (token and guest caches).
+                    User(pk=instance.user_id, **user_changes).save(update_fields=list(user_changes))
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {'detail': 'Benutzername oder E-Mail-Adresse ist bereits vergeben.'})
+        return instance
+
 
 class BusinessUserProfileSerializer(serializers.ModelSerializer):
     """
@@ -34,8 +91,13 @@ class BusinessUserProfileSerializer(serializers.ModelSerializer):
     The 'user' field is represented as a PrimaryKeyRelatedField, which
     uses the User model's primary key (ID). It is set as read-only,
     meaning it cannot be created or modified through this serializer.
+
+    The 'rating_summary' field contains the precomputed rating aggregates
+    of the business user. Select 'user__rating_summary' in the queryset to
+    serialize a list of profiles without one query per profile.
     """
     user = serializers.PrimaryKeyRelatedField(read_only=True)
+    rating_summary = serializers.SerializerMethodField()
 
     class Meta:
         """
@@ -48,9 +110,25 @@ class BusinessUserProfileSerializer(serializers.ModelSerializer):
         fields = [
             'user', 'username', 'first_name',
             'last_name', 'file','location', 'tel', 'description',
-            'working_hours', 'type'
+            'working_hours', 'type', 'rating_summary'
         ]
 
+    def get_rating_summary(self, obj):
+        """
+        Return the rating summary of the business user.
+        """
+        return RatingSummarySerializer(get_rating_summary(obj.user)).data
+
+
+class BusinessDirectorySerializer(BusinessUserProfileSerializer):
+    """
+    Entry of the business directory: a business profile with its rating
+    summary and number of completed orders.
+    """
+
+    class Meta(BusinessUserProfileSerializer.Meta):
+        fields = BusinessUserProfileSerializer.Meta.fields + ['completed_order_count']
+
 
 class CustomerUserProfileSerializer(serializers.ModelSerializer):
     """
@@ -78,3 +156,45 @@ class CustomerUserProfileSerializer(serializers.ModelSerializer):
             'user', 'username', 'first_name',
             'last_name', 'file', 'type'
         ]
+
+
+class BusinessUserProfileValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of BusinessUserProfileSerializer for the business profile
+    list, built from `.values()` rows (see core/fast_serializers.py).
+    """
+    serializer_class = BusinessUserProfileSerializer
+    summary_fields = ('review_count', 'rating_sum', 'rating_1', 'rating_2', 'rating_3', 'rating_4', 'rating_5')
+    field_values = {
+        'rating_summary': tuple(f'user__rating_summary__{field}' for field in summary_fields),
+    }
+
+    def represent_rating_summary(self, row):
+        """
+        Build the rating summary like RatingSummarySerializer, with an empty
+        summary for business users without reviews.
+        """
+        summary = BusinessRatingSummary()
+        if row['user__rating_summary__review_count'] is not None:
+            for field in self.summary_fields:
+                setattr(summary, field, row[f'user__rating_summary__{field}'])
+        return {
+            'review_count': summary.review_count,
+            'average_rating': summary.average_rating,
+            'histogram': summary.histogram,
+        }
+
+
+class BusinessDirectoryValuesSerializer(BusinessUserProfileValuesSerializer):
+    """
+    Fast read path of BusinessDirectorySerializer for the directory.
+    """
+    serializer_class = BusinessDirectorySerializer
+
+
+class CustomerUserProfileValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of CustomerUserProfileSerializer for the customer profile
+    list, built from `.values()` rows (see core/fast_serializers.py).
+    """
+    serializer_class = CustomerUserProfileSerializer
@@ -1,16 +1,24 @@
 from django.urls import path, include
-from .views import BusinessProfilesListView, CustomerProfilesListView, ProfileView
+from .views import BusinessProfilesListView, CustomerProfilesListView, ProfileView, BusinessDirectoryView
+from .views import ProfileListView
 from rest_framework import routers
+from .async_views import AsyncBusinessProfilesListView, AsyncCustomerProfilesListView
 
 """URL configuration for UserProfile-related API endpoints.
 
-This module defines routes for managing user profiles, including the standard
-CRUD operations via a viewset, and custom endpoints for listing business and
-customer profiles separately.
+This module defines routes for managing user profiles, including batch
+lookups of profiles by user id, the standard CRUD operations via a
+viewset, and custom endpoints for listing business and customer profiles
+separately, with async read-only variants of both lists, and the searchable
+business directory.
 """
 
 urlpatterns = [
+    path('profiles/', ProfileListView.as_view(), name='profile-list'),
     path('profile/<int:user>/', ProfileView.as_view(), name='profile-detail'),
     path('profiles/business/', BusinessProfilesListView.as_view()),
     path('profiles/customer/', CustomerProfilesListView.as_view()),
+    path('profiles/directory/', BusinessDirectoryView.as_view(), name='profile-directory'),
+    path('async/profiles/business/', AsyncBusinessProfilesListView.as_view()),
+    path('async/profiles/customer/', AsyncCustomerProfilesListView.as_view()),
 ]
@@ -1,5 +1,13 @@
 
 from .serializers import UserProfileSerializer, BusinessUserProfileSerializer,  CustomerUserProfileSerializer
+from .serializers import BusinessUserProfileValuesSerializer, CustomerUserProfileValuesSerializer
+from .serializers import BusinessDirectorySerializer, BusinessDirectoryValuesSerializer
+from .functions import filter_with_type_param, filter_with_search_param, filter_with_location_param, filter_with_min_rating_param
+from .pagination import DirectoryPagination
+from core.batch import lookup_batch, parse_id_list
+from core.fast_serializers import FastListMixin, fast_serializers_enabled
+from rest_framework import filters
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework import viewsets
 from django.shortcuts import get_object_or_404
@@ -37,7 +45,11 @@ class BusinessProfilesListView(APIView):
                       and HTTP 200 OK status.
         """
         user_profiles = UserProfile.objects.filter(type="business")
-        serializer = BusinessUserProfileSerializer(user_profiles, many=True)
+        if fast_serializers_enabled():
+            rows = BusinessUserProfileValuesSerializer.values(user_profiles)
+            return Response(BusinessUserProfileValuesSerializer(rows).data, status=status.HTTP_200_OK)
+        serializer = BusinessUserProfileSerializer(
+            user_profiles.select_related('user__rating_summary'), many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
@@ -66,10 +78,93 @@ class CustomerProfilesListView(APIView):
                       and HTTP 200 OK status.
         """
         user_profiles = UserProfile.objects.filter(type="customer")
+        if fast_serializers_enabled():
+            rows = CustomerUserProfileValuesSerializer.values(user_profiles)
+            return Response(CustomerUserProfileValuesSerializer(rows).data, status=status.HTTP_200_OK)
         serializer = CustomerUserProfileSerializer(user_profiles, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+class BusinessDirectoryView(FastListMixin, generics.ListAPIView):
+    """
+    Searchable, ranked directory of business profiles.
+
+    Query parameters:
+        search: Words of location, description or working hours (prefix
+            matches, all words must match), served by the full-text index
+            (see profile_app/search.py).
+        location: Words of the location (prefix matches).
+        type: Profile type, 'business' (default) or 'customer'.
+        min_rating: Minimum average rating.
+        ordering: 'rating_average' or 'completed_order_count', descending
+            with '-'. Defaults to the best rated, then most completed orders.
+
+    Supports `?fields=`, `page` and `page_size` like the offer list.
+    """
+    serializer_class = BusinessDirectorySerializer
+    fast_serializer_class = BusinessDirectoryValuesSerializer
+    pagination_class = DirectoryPagination
+    permission_classes = [IsAuthenticated]
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['rating_average', 'completed_order_count']
+    ordering = ['-rating_average', '-completed_order_count', 'user']
+    throttle_scopes = {'GET': 'search'}
+
+    def get_queryset(self):
+        """
+        Return the profiles of the requested type matching the search,
+        location and min_rating parameters.
+        """
+        params = self.request.query_params
+        queryset = UserProfile.objects.select_related('user__rating_summary')
+        queryset = filter_with_type_param(queryset, params.get('type', 'business'))
+
+        if params.get('search'):
+            queryset = filter_with_search_param(queryset, params['search'])
+
+        if params.get('location'):
+            queryset = filter_with_location_param(queryset, params['location'])
+
+        if params.get('min_rating'):
+            queryset = filter_with_min_rating_param(queryset, params['min_rating'])
+
+        return queryset
+
+    def get_count_queryset(self):
+        """
+        Return the matching profiles for the page count, without the joins
+        of the serialized rating summary.
+        """
+        return self.get_queryset().select_related(None)
+
+
+class ProfileListView(APIView):
+    """
+    API view to retrieve the profiles of several users at once.
+
+    `?user_ids=3,1,2` (required) returns the profiles of the given users in
+    the requested order and the user ids without a profile (see
+    core/batch.py), with one query. Listing profiles is left to the
+    paginated business directory.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Handle GET requests.
+
+        Returns:
+            Response: An object with the serialized profiles as `results`
+                      and the user ids without a profile as `missing`.
+        """
+        if 'user_ids' not in request.query_params:
+            raise ValidationError({'user_ids': 'user_ids ist erforderlich, z. B. ?user_ids=3,1,2.'})
+        user_ids = parse_id_list(request.query_params['user_ids'], 'user_ids')
+        profiles, missing = lookup_batch(UserProfile.objects.all(), user_ids, field='user_id')
+        serializer = UserProfileSerializer(profiles, many=True)
+        return Response({"results": serializer.data, "missing": missing}, status=status.HTTP_200_OK)
+
+
 class ProfileView(generics.RetrieveUpdateAPIView):
     """
     API view to retrieve and update a single user profile.
@@ -77,6 +172,10 @@ class ProfileView(generics.RetrieveUpdateAPIView):
     Allows authenticated users to retrieve or update their own UserProfile.
     Permissions enforce that only the owner can modify the profile, 
     while read-only access is allowed otherwise.
+
+    A retrieve is one query for the profile row; the User is never loaded.
+    An update writes the profile and the changed name fields of the User
+    in one transaction (see UserProfileSerializer.update).
     """
     queryset = UserProfile.objects.all()
     serializer_class = UserProfileSerializer
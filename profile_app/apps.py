@@ -1,6 +1,26 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_index(sender, using, **kwargs):
+    """
+    Recreate the profile search index after migrations that rebuilt the
+    profile table and refresh its statistics (see profile_app/search.py).
+    """
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+    from .search import analyze_profiles, install_search_index
+
+    connection = connections[using]
+    applied = MigrationRecorder(connection).applied_migrations()
+    if ('profile_app', '0002_directory_ranking') in applied:
+        install_search_index(connection)
+        analyze_profiles(connection)
 
 
 class ProfileAppConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'profile_app'
+
+    def ready(self):
+        post_migrate.connect(ensure_search_index, sender=self)
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.1 on 2026-10-19 08:52
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models.functions import Cast, Coalesce
+
+from profile_app.search import drop_search_index, install_search_index
+
+
+def fill_ranking(apps, schema_editor):
+    """
+    Copy the average rating and the number of completed orders of every
+    user to the new ranking columns.
+    """
+    UserProfile = apps.get_model('profile_app', 'UserProfile')
+    BusinessRatingSummary = apps.get_model('reviews_app', 'BusinessRatingSummary')
+    Order = apps.get_model('orders_app', 'Order')
+    average = (
+        BusinessRatingSummary.objects.filter(business_user_id=models.OuterRef('user_id'), review_count__gt=0)
+        .annotate(average=Cast('rating_sum', models.FloatField()) / models.F('review_count'))
+        .values('average')[:1]
+    )
+    completed = (
+        Order.objects.filter(business_user_id=models.OuterRef('user_id'), status='completed')
+        .order_by().values('business_user_id').annotate(count=models.Count('id')).values('count')[:1]
+    )
+    UserProfile.objects.update(
+        rating_average=Coalesce(models.Subquery(average), 0.0),
+        completed_order_count=Coalesce(models.Subquery(completed), 0),
+    )
+
+
+def create_search_index(apps, schema_editor):
+    install_search_index(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    drop_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profile_app', '0001_initial'),
+        ('orders_app', '0001_initial'),
+        ('reviews_app', '0004_unique_review_per_business_user'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='completed_order_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='userprofile',
+            name='rating_average',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='userprofile',
+            index=models.Index(fields=['type', '-rating_average', '-completed_order_count', 'user'], name='profile_directory_rank_idx'),
+        ),
+        migrations.RunPython(fill_ranking, migrations.RunPython.noop),
+        migrations.RunPython(create_search_index, remove_search_index),
+    ]
@@ -9,6 +9,9 @@ class UserProfile(models.Model):
     data such as profile image, location, contact details, description,
     working hours, user type (customer or business), and the timestamp of
     profile creation.
+
+    location, description and working_hours are full-text indexed for the
+    business directory (see profile_app/search.py).
     """
 
     USER_TYPES = (
@@ -29,12 +32,21 @@ class UserProfile(models.Model):
     type = models.CharField(max_length=50, choices=USER_TYPES)
     created_at= models.DateTimeField(auto_now_add=True, blank=True)
     uploaded_at = models.DateTimeField(auto_now=True, blank=True)
+    # Ranking of the business directory, kept up to date by jobs queued by
+    # the Review and Order signals (see reviews_app/tasks.py, orders_app/tasks.py).
+    rating_average = models.FloatField(default=0)
+    completed_order_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
-        """Return the username associated with this profile."""
-        return self.user.username
+        """Return the username stored on the profile (no query for the user)."""
+        return self.username
     
     class Meta:
         verbose_name = 'User Profile'
         verbose_name_plural = 'User Profiles'
         ordering = ['user']
+        indexes = [
+            models.Index(
+                fields=['type', '-rating_average', '-completed_order_count', 'user'],
+                name='profile_directory_rank_idx'),
+        ]
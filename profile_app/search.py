@@ -0,0 +1,149 @@
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, Q
+from django.db.models.expressions import RawSQL
+
+"""
+Full-text index over the location, description and working hours of the
+user profiles, used by the business directory.
+
+SQLite
+    An FTS5 table (profile_app_userprofile_fts) with the profile table as
+    external content, kept in sync by triggers. Queries select matching
+    rowids from the FTS index, prefix queries of 2 and 3 characters use
+    dedicated prefix indexes.
+PostgreSQL
+    GIN indexes over to_tsvector('simple', ...) of all three fields and of
+    the location alone, queried with prefix tsqueries (`ber:*`).
+Other databases
+    Unindexed icontains filters.
+
+Search text is split into words; every word must match as a prefix.
+Table rebuilds of later SQLite migrations drop the triggers, so
+install_search_index() also runs after every migrate (see apps.py) and
+recreates and refills a missing index. analyze_profiles() runs after every
+migrate and import, so the planner knows how many rows the ranking index
+covers.
+"""
+
+PROFILE_TABLE = 'profile_app_userprofile'
+FTS_TABLE = 'profile_app_userprofile_fts'
+SEARCH_COLUMNS = ('location', 'description', 'working_hours')
+MAX_TERMS = 8
+
+_SQLITE_TRIGGERS = {
+    f'{FTS_TABLE}_ai': f"""
+        CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {PROFILE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, location, description, working_hours)
+            VALUES (new.id, new.location, new.description, new.working_hours);
+        END""",
+    f'{FTS_TABLE}_ad': f"""
+        CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {PROFILE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, location, description, working_hours)
+            VALUES ('delete', old.id, old.location, old.description, old.working_hours);
+        END""",
+    f'{FTS_TABLE}_au': f"""
+        CREATE TRIGGER {FTS_TABLE}_au AFTER UPDATE OF location, description, working_hours
+        ON {PROFILE_TABLE} BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, location, description, working_hours)
+            VALUES ('delete', old.id, old.location, old.description, old.working_hours);
+            INSERT INTO {FTS_TABLE}(rowid, location, description, working_hours)
+            VALUES (new.id, new.location, new.description, new.working_hours);
+        END""",
+}
+
+_POSTGRES_DOCUMENT = (
+    f"to_tsvector('simple', {PROFILE_TABLE}.location || ' ' || "
+    f"{PROFILE_TABLE}.description || ' ' || {PROFILE_TABLE}.working_hours)"
+)
+_POSTGRES_LOCATION = f"to_tsvector('simple', {PROFILE_TABLE}.location)"
+
+
+def install_search_index(connection):
+    """
+    Create the search index of the connection's database if it is missing.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE name = %s OR type = 'trigger' AND tbl_name = %s",
+                [FTS_TABLE, PROFILE_TABLE])
+            existing = {row[0] for row in cursor.fetchall()}
+            if {FTS_TABLE, *_SQLITE_TRIGGERS} <= existing:
+                return
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+                f"location, description, working_hours, content='{PROFILE_TABLE}', "
+                f"content_rowid='id', tokenize='unicode61 remove_diacritics 2', prefix='2 3')")
+            for name, sql in _SQLITE_TRIGGERS.items():
+                if name not in existing:
+                    cursor.execute(sql)
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif connection.vendor == 'postgresql':
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS profile_search_idx ON {PROFILE_TABLE} "
+                f"USING gin ({_POSTGRES_DOCUMENT})")
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS profile_location_search_idx ON {PROFILE_TABLE} "
+                f"USING gin ({_POSTGRES_LOCATION})")
+
+
+def analyze_profiles(connection):
+    """
+    Refresh the planner statistics of the profile table. Without them
+    SQLite assumes `type = 'business'` is selective and scans the ranking
+    index instead of starting from the FTS matches, which makes counting
+    search results about ten times slower.
+    """
+    if connection.vendor in ('sqlite', 'postgresql'):
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {PROFILE_TABLE}")
+
+
+def drop_search_index(connection):
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            for name in _SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+        elif connection.vendor == 'postgresql':
+            cursor.execute("DROP INDEX IF EXISTS profile_search_idx")
+            cursor.execute("DROP INDEX IF EXISTS profile_location_search_idx")
+
+
+def search_terms(text):
+    """
+    Return the lowercase words of a search text. Only word characters are
+    kept, so the terms are safe inside FTS5 and tsquery syntax.
+    """
+    return re.findall(r'\w+', (text or '').lower())[:MAX_TERMS]
+
+
+def filter_search(queryset, text, location_only=False):
+    """
+    Return the profiles whose location, description or working hours (or
+    only location) contain a word starting with each word of the text.
+    """
+    terms = search_terms(text)
+    if not terms:
+        return queryset
+    vendor = connections[queryset.db].vendor
+    if vendor == 'sqlite':
+        match = ' '.join(f'"{term}"*' for term in terms)
+        if location_only:
+            match = f'location : ({match})'
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [match]))
+    if vendor == 'postgresql':
+        document = _POSTGRES_LOCATION if location_only else _POSTGRES_DOCUMENT
+        condition = RawSQL(
+            f"{document} @@ to_tsquery('simple', %s)",
+            [' & '.join(f'{term}:*' for term in terms)], output_field=BooleanField())
+        return queryset.filter(condition)
+
+    columns = ('location',) if location_only else SEARCH_COLUMNS
+    for term in terms:
+        queryset = queryset.filter(
+            Q(*[Q(**{f'{column}__icontains': term}) for column in columns], _connector=Q.OR))
+    return queryset
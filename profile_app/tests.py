@@ -1,9 +1,171 @@
+from django.contrib.auth.models import User
+from django.test import override_settings
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
 
+from profile_app.models import UserProfile
+from reviews_app.models import Review
+
 class ReviewsTests(APITestCase):
     def test_get_review(self):
         url = "http://127.0.0.1:8000/api/reviews/"
         response = self.client.get(url)
-        self.assertEqual(response.status_code, status.HTTP_200_OK)
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+class ProfileListValuesSerializerTest(APITestCase):
+
+    def setUp(self):
+        self.customer = User.objects.create(username="Ann")
+        UserProfile.objects.create(user=self.customer, username="Ann", type="customer",
+                                   file="profile-images/ann.png")
+        for index in range(3):
+            business = User.objects.create(username=f"Shop{index}")
+            UserProfile.objects.create(
+                user=business, username=f"Shop{index}", type="business", location="Berlin",
+                file="profile-images/shop.png" if index else None)
+            if index:
+                Review.objects.create(
+                    business_user=business, reviewer=self.customer, rating=index + 2, description="Gut")
+        self.client.force_authenticate(self.customer)
+
+    def test_fast_profile_lists_are_byte_identical(self):
+        for url in ["/api/profiles/business/", "/api/profiles/customer/"]:
+            fast = self.client.get(url)
+            with override_settings(FAST_LIST_SERIALIZERS=False):
+                regular = self.client.get(url)
+
+            self.assertEqual(fast.status_code, status.HTTP_200_OK)
+            self.assertEqual(fast.content, regular.content)
+
+
+class ProfileDetailTest(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username="Ann", first_name="Ann", email="ann@example.com")
+        self.profile = UserProfile.objects.create(
+            user=self.user, username="Ann", first_name="Ann", email="ann@example.com", type="customer")
+        self.url = reverse("profile-detail", kwargs={"user": self.user.id})
+        self.client.force_authenticate(self.user)
+
+    def test_retrieve_is_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["username"], "Ann")
+
+    def test_update_copies_name_fields_to_user(self):
+        response = self.client.patch(
+            self.url, {"first_name": "Anna", "email": "anna@example.com", "location": "Berlin"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.first_name, self.user.email), ("Anna", "anna@example.com"))
+        self.assertEqual(UserProfile.objects.get(pk=self.profile.pk).location, "Berlin")
+
+    def test_update_rejects_taken_username(self):
+        User.objects.create(username="Bob")
+
+        response = self.client.patch(self.url, {"username": "Bob"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.username, "Ann")
+
+    def test_guest_cannot_change_other_profiles(self):
+        guest = User.objects.create(username="GuestCustomer")
+        self.client.force_authenticate(guest)
+
+        response = self.client.patch(
+            self.url, {"username": "hijacked", "email": "evil@example.com"}, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.user.refresh_from_db()
+        self.assertEqual((self.user.username, self.user.email), ("Ann", "ann@example.com"))
+
+
+class BusinessDirectoryTest(APITestCase):
+
+    def setUp(self):
+        self.customer = User.objects.create(username="Ann")
+        UserProfile.objects.create(user=self.customer, username="Ann", type="customer", location="Berlin")
+        self.shops = {}
+        for name, location, description in [
+                ("Pixel", "Berlin Mitte", "Webdesign und Logos"),
+                ("Print", "Hamburg", "Druck für Berliner Firmen"),
+                ("Code", "Berlin", "Backend Entwicklung")]:
+            user = User.objects.create(username=name)
+            UserProfile.objects.create(
+                user=user, username=name, type="business", location=location, description=description)
+            self.shops[name] = user
+        self.url = reverse("profile-directory")
+        self.client.force_authenticate(self.customer)
+
+    def usernames(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [profile["username"] for profile in response.data["results"]]
+
+    def test_search_matches_word_prefixes(self):
+        response = self.client.get(self.url, {"search": "berl"})
+        self.assertEqual(sorted(self.usernames(response)), ["Code", "Pixel", "Print"])
+
+        response = self.client.get(self.url, {"search": "berl web"})
+        self.assertEqual(self.usernames(response), ["Pixel"])
+
+    def test_location_filter_ignores_description(self):
+        response = self.client.get(self.url, {"location": "Berlin"})
+        self.assertEqual(sorted(self.usernames(response)), ["Code", "Pixel"])
+
+    def test_search_follows_profile_updates(self):
+        UserProfile.objects.filter(user=self.shops["Print"]).update(location="München")
+
+        response = self.client.get(self.url, {"location": "münch"})
+        self.assertEqual(self.usernames(response), ["Print"])
+
+    def test_ranked_by_rating_then_completed_orders(self):
+        Review.objects.create(business_user=self.shops["Code"], reviewer=self.customer, rating=5, description="Top")
+        Review.objects.create(business_user=self.shops["Print"], reviewer=self.customer, rating=3, description="Ok")
+        UserProfile.objects.filter(user=self.shops["Pixel"]).update(rating_average=3, completed_order_count=2)
+
+        response = self.client.get(self.url)
+        self.assertEqual(self.usernames(response), ["Code", "Pixel", "Print"])
+        self.assertEqual(response.data["results"][0]["rating_summary"]["average_rating"], 5.0)
+
+    def test_invalid_type(self):
+        response = self.client.get(self.url, {"type": "admin"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class ProfileBatchLookupTest(APITestCase):
+
+    def setUp(self):
+        self.users = [User.objects.create(username=f"user{index}") for index in range(3)]
+        for user in self.users:
+            UserProfile.objects.create(user=user, username=user.username, type="customer")
+        self.client.force_authenticate(self.users[0])
+
+    def test_profiles_keep_requested_order_and_report_missing(self):
+        ids = [self.users[2].id, 999, self.users[0].id, self.users[2].id]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("profile-list"), {"user_ids": ",".join(map(str, ids))})
+
+        self.assertEqual([profile["user"] for profile in response.data["results"]],
+                         [self.users[2].id, self.users[0].id])
+        self.assertEqual(response.data["missing"], [999])
+
+    @override_settings(BATCH_LOOKUP_MAX_IDS=2)
+    def test_batch_size_is_limited(self):
+        too_many = self.client.get(reverse("profile-list"), {"user_ids": "1,2,3"})
+        invalid = self.client.get(reverse("profile-list"), {"user_ids": "1,x"})
+
+        self.assertEqual(too_many.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(invalid.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("user_ids", invalid.data)
+
+    def test_user_ids_are_required(self):
+        response = self.client.get(reverse("profile-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("user_ids", response.data)
@@ -1,6 +1,7 @@
 from django.contrib import admin
-from reviews_app.models import Review
+from reviews_app.models import Review, BusinessRatingSummary
 
 # Register your models here.
 
 admin.site.register(Review)
+admin.site.register(BusinessRatingSummary)
@@ -0,0 +1,31 @@
+from core.async_api import AsyncAPIView
+from reviews_app.models import BusinessRatingSummary
+from .functions import rating_summary_requested
+from .serializers import ReviewsListCreateSerializer, RatingSummarySerializer
+from .views import ReviewsView
+
+
+class AsyncReviewListView(AsyncAPIView):
+    """
+    Async variant of the review list (ReviewsView GET).
+
+    Accepts the same filters, ordering and cursor parameters and returns the
+    same payload. Requires an authenticated user.
+    """
+    authentication_required = True
+
+    async def get(self, request):
+        view = ReviewsView(request=request, format_kwarg=None, args=(), kwargs={})
+        queryset = view.filter_queryset(view.get_queryset())
+        paginator = view.paginator
+        page = await paginator.apaginate_queryset(queryset, request, view=view)
+        serializer = ReviewsListCreateSerializer(
+            page, many=True, context=view.get_serializer_context())
+        data = paginator.get_paginated_response(serializer.data).data
+
+        business_user_param = request.query_params.get('business_user_id')
+        if business_user_param and rating_summary_requested(request):
+            summary = await BusinessRatingSummary.objects.filter(
+                business_user_id=business_user_param).afirst()
+            data['rating_summary'] = RatingSummarySerializer(summary).data
+        return self.render(data)
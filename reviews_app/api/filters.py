@@ -0,0 +1,22 @@
+from rest_framework.filters import OrderingFilter
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    Ordering filter that orders by a single field and always adds the id as
+    tie-breaker in the same direction.
+
+    The resulting ordering `(field, id)` is unique, which keeps cursor
+    pagination stable and matches the composite review indexes.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Return the requested ordering field followed by the id tie-breaker.
+        """
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        field = ordering[0]
+        tie_breaker = '-id' if field.startswith('-') else 'id'
+        return [field, tie_breaker]
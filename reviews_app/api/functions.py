@@ -0,0 +1,23 @@
+from django.core.exceptions import ObjectDoesNotExist
+
+
+def get_rating_summary(user):
+    """
+    Return the precomputed rating summary of a user or None if the user
+    has not been reviewed yet.
+
+    Uses the summary cached by select_related('rating_summary') if present.
+    """
+    try:
+        return user.rating_summary
+    except ObjectDoesNotExist:
+        return None
+
+
+def rating_summary_requested(request):
+    """
+    Return True if the client asked for the rating summary with
+    `?include=rating_summary`.
+    """
+    include = request.query_params.get('include', '')
+    return 'rating_summary' in include.split(',')
@@ -0,0 +1,141 @@
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+"""
+    Keyset (cursor) pagination for reviews.
+
+       The cursor position is the value of the ordering field together with the
+       review id, so every page is fetched with an indexed range condition on
+       (business_user, <ordering field>, id) instead of an OFFSET.
+
+       Attributes:
+           page_size (int): The default number of reviews per page. Default is 20.
+           page_size_query_param (str): The query parameter that allows clients to set a custom page size. Default is 'page_size'.
+           max_page_size (int): The maximum number of reviews allowed per page. Default is 100.
+           ordering (str): The default ordering. Default is '-updated_at' with '-id' as tie-breaker.
+"""
+class ReviewCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-updated_at', '-id')
+    position_separator = '|'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Paginate the queryset like CursorPagination, but filter by the
+        composite (value, id) position so no offset is ever needed.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async variant of paginate_queryset for async views.
+        """
+        queryset = self.get_page_queryset(queryset, request, view)
+        if queryset is None:
+            return None
+        return self.set_page([item async for item in queryset])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the ordered and filtered queryset slice of the requested page,
+        including one extra row to detect a following page.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if current_position is not None:
+            queryset = queryset.filter(
+                self.get_position_filter(current_position, reverse))
+
+        return queryset[offset:offset + self.page_size + 1]
+
+    def set_page(self, results):
+        """
+        Store the page and the next / previous positions from the fetched
+        rows and return the reviews of the page.
+        """
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        self.page = list(results[:self.page_size])
+
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_position_filter(self, position, reverse):
+        """
+        Build the keyset condition `(field, id) > (value, pk)` (or `<`,
+        depending on the direction) for the given cursor position.
+        """
+        try:
+            value, pk = position.rsplit(self.position_separator, 1)
+            pk = int(pk)
+        except ValueError:
+            raise NotFound(self.invalid_cursor_message)
+        order = self.ordering[0]
+        order_attr = order.lstrip('-')
+        lookup = 'lt' if reverse != order.startswith('-') else 'gt'
+        return (
+            Q(**{f'{order_attr}__{lookup}': value})
+            | Q(**{order_attr: value, f'id__{lookup}': pk})
+        )
+
+    def _get_position_from_instance(self, instance, ordering):
+        """
+        Return the composite position `<value>|<id>` of a review, which may
+        also be a `.values()` row.
+        """
+        field_name = ordering[0].lstrip('-')
+        if isinstance(instance, dict):
+            return f'{instance[field_name]}{self.position_separator}{instance["id"]}'
+        value = getattr(instance, field_name)
+        return f'{value}{self.position_separator}{instance.pk}'
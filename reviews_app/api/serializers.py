@@ -1,8 +1,41 @@
 from django.contrib.auth.models import User
-from reviews_app.models import Review
+from django.db import IntegrityError
+from reviews_app.models import Review, BusinessRatingSummary
 from profile_app.models import UserProfile
 from rest_framework import serializers
-from profile_app.api.serializers import UserProfileSerializer
+from rest_framework.settings import api_settings
+from core.fast_serializers import USER_EXPANSION_FIELDS, ValuesSerializer
+
+
+DUPLICATE_REVIEW_MESSAGE = "Du hast diesen Geschäftnutzer shon bewertet"
+
+
+class BusinessUserPrimaryKeyField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field for the reviewed business user.
+
+    Validates the id with a single existence check on the business profile
+    instead of loading the User and returns an unsaved User carrying only
+    the primary key, which is all the Review needs for its foreign key.
+    """
+    default_error_messages = {
+        'does_not_exist': 'Der Geschäftsnutzer mit der ID "{pk_value}" existiert nicht.',
+        'incorrect_type': 'Die ID des Geschäftsnutzers muss eine Zahl sein, nicht {data_type}.',
+    }
+
+    def to_internal_value(self, data):
+        """
+        Return a User stub for the id if a business profile exists for it.
+        """
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if not UserProfile.objects.filter(user_id=pk, type="business").exists():
+            self.fail('does_not_exist', pk_value=data)
+        return User(pk=pk)
 
 
 class ReviewsListCreateSerializer(serializers.ModelSerializer):
@@ -12,9 +45,10 @@ class ReviewsListCreateSerializer(serializers.ModelSerializer):
     Handles:
     - Automatic assignment of the reviewer (read-only)
     - Writable assignment of the business_user
-    - Validation to prevent duplicate reviews by the same reviewer for the same business
+    - Prevention of duplicate reviews by the same reviewer for the same business,
+      enforced by the unique constraint on (reviewer, business_user)
     """
-    business_user = serializers.PrimaryKeyRelatedField(
+    business_user = BusinessUserPrimaryKeyField(
         queryset=User.objects.all())
     reviewer = serializers.PrimaryKeyRelatedField(read_only=True)
 
@@ -33,23 +67,40 @@ class ReviewsListCreateSerializer(serializers.ModelSerializer):
             'updated_at',
         ]
 
-    def validate(self, data):
+    def create(self, validated_data):
         """
-        Ensure that a reviewer cannot create multiple reviews for the same business user.
+        Create the review and map a violation of the unique constraint on
+        (reviewer, business_user) to the duplicate review error.
 
         Raises:
             serializers.ValidationError: If a review by the same reviewer already exists.
         """
-        request = self.context['request']
-        reviewer = request.user
-        business_user = data.get('business_user')
-
-        if Review.objects.filter(reviewer=reviewer, business_user=business_user).exists():
+        try:
+            return super().create(validated_data)
+        except IntegrityError:
+            is_duplicate = Review.objects.filter(
+                reviewer=validated_data['reviewer'],
+                business_user=validated_data['business_user'],
+            ).exists()
+            if not is_duplicate:
+                raise
             raise serializers.ValidationError(
-                "Du hast diesen Geschäftnutzer shon bewertet"
+                {api_settings.NON_FIELD_ERRORS_KEY: [DUPLICATE_REVIEW_MESSAGE]}
             )
 
-        return data
+
+class ReviewValuesSerializer(ValuesSerializer):
+    """
+    Fast read path of ReviewsListCreateSerializer for the review list, built
+    from `.values()` rows (see core/fast_serializers.py).
+
+    `?expand=reviewer,business_user` returns the users instead of their ids.
+    """
+    serializer_class = ReviewsListCreateSerializer
+    expandable = {
+        'reviewer': USER_EXPANSION_FIELDS,
+        'business_user': USER_EXPANSION_FIELDS,
+    }
 
 
 class ReviewRetrieveUpdateDestroySerializer(serializers.ModelSerializer):
@@ -98,3 +149,33 @@ class ReviewRetrieveUpdateDestroySerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(errors)
 
         return data
+
+
+class RatingSummarySerializer(serializers.ModelSerializer):
+    """
+    Serializer for the precomputed rating summary of a business user.
+
+    Business users without any review are represented by an empty summary.
+    """
+    average_rating = serializers.FloatField(read_only=True)
+    histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        """
+        Metadata configuration for the serializer.
+        """
+        model = BusinessRatingSummary
+        fields = [
+            'review_count',
+            'average_rating',
+            'histogram',
+        ]
+
+    def __init__(self, instance=None, *args, **kwargs):
+        """
+        Use an empty summary if none exists yet. Serializer.data would return
+        the initial field values for a missing instance instead.
+        """
+        if instance is None:
+            instance = BusinessRatingSummary()
+        super().__init__(instance, *args, **kwargs)
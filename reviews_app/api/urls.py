@@ -1,14 +1,16 @@
 from django.urls import path, include
 from rest_framework import routers
 from .views import ReviewsView, ReviewsDetailView
+from .async_views import AsyncReviewListView
 
 """URL configuration for Review-related API endpoints.
 
 This module defines routes for managing reviews, including CRUD operations
-via the ReviewsViewSet.
+via the ReviewsViewSet, and an async read-only variant of the review list.
 """
 
 urlpatterns = [
     path('reviews/', ReviewsView.as_view(), name="reviews-list"),
-    path('reviews/<int:pk>/', ReviewsDetailView.as_view(), name="reviews-detail")
+    path('reviews/<int:pk>/', ReviewsDetailView.as_view(), name="reviews-detail"),
+    path('async/reviews/', AsyncReviewListView.as_view(), name="reviews-list-async"),
 ]
@@ -3,27 +3,40 @@ from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, status
 from profile_app.models import UserProfile
 from django.contrib.auth.models import User
-from reviews_app.models import Review
-from .serializers import ReviewsListCreateSerializer, ReviewRetrieveUpdateDestroySerializer
+from reviews_app.models import Review, BusinessRatingSummary
+from .serializers import ReviewsListCreateSerializer, ReviewRetrieveUpdateDestroySerializer, RatingSummarySerializer
+from .serializers import ReviewValuesSerializer
+from core.fast_serializers import FastListMixin
+from .functions import rating_summary_requested
+from .filters import StableOrderingFilter
+from .pagination import ReviewCursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework import filters, generics, permissions
 from .permissions import IsCustomerUserForPostReviewsOrReadOnly, IsReviewOwnerForPatchDelete
 
 
-class ReviewsView(generics.ListCreateAPIView):
+class ReviewsView(FastListMixin, generics.ListCreateAPIView):
     """
     API view for listing and creating Review instances.
 
     Provides endpoints to:
     - List reviews with optional filtering by business user or reviewer.
+      Reviews are cursor-paginated and ordered by `updated_at` or `rating`
+      with the id as tie-breaker. With
+      `?business_user_id=<id>&include=rating_summary` the page also contains
+      the precomputed rating summary of the business user.
     - Create new reviews by authenticated customer users.
     """
     serializer_class = ReviewsListCreateSerializer
+    fast_serializer_class = ReviewValuesSerializer
     permission_classes = [IsCustomerUserForPostReviewsOrReadOnly,permissions.IsAuthenticated]
-    filter_backends = [filters.OrderingFilter]
+    pagination_class = ReviewCursorPagination
+    filter_backends = [StableOrderingFilter]
     ordering_fields = ['updated_at', 'rating']
+    ordering = ['-updated_at']
     lookup_field = "pk"
+    throttle_scopes = {'POST': 'review_create'}
 
     def get_queryset(self):
         """
@@ -48,7 +61,19 @@ class ReviewsView(generics.ListCreateAPIView):
 
         return queryset
 
-    
+    def list(self, request, *args, **kwargs):
+        """
+        List the reviews and add the rating summary of the filtered business
+        user if it was requested.
+        """
+        response = super().list(request, *args, **kwargs)
+        business_user_param = request.query_params.get('business_user_id')
+        if business_user_param and rating_summary_requested(request):
+            summary = BusinessRatingSummary.objects.filter(
+                business_user_id=business_user_param).first()
+            response.data['rating_summary'] = RatingSummarySerializer(summary).data
+        return response
+
     def perform_create(self, serializer):
         reviewer = self.request.user
         serializer.save(reviewer=reviewer)
@@ -0,0 +1,54 @@
+# Generated by Django 5.2.1 on 2026-10-19 08:16
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def build_rating_summaries(apps, schema_editor):
+    """Fill the rating summaries from the reviews that already exist."""
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessRatingSummary = apps.get_model('reviews_app', 'BusinessRatingSummary')
+    summaries = {}
+    rows = (
+        Review.objects.order_by()
+        .values_list('business_user_id', 'rating')
+        .annotate(count=models.Count('id'))
+    )
+    for business_user_id, rating, count in rows:
+        summary = summaries.setdefault(
+            business_user_id, BusinessRatingSummary(business_user_id=business_user_id))
+        setattr(summary, f'rating_{rating}', count)
+        summary.review_count += count
+        summary.rating_sum += rating * count
+    BusinessRatingSummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reviews_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRatingSummary',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating_1', models.PositiveIntegerField(default=0)),
+                ('rating_2', models.PositiveIntegerField(default=0)),
+                ('rating_3', models.PositiveIntegerField(default=0)),
+                ('rating_4', models.PositiveIntegerField(default=0)),
+                ('rating_5', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Business Rating Summary',
+                'verbose_name_plural': 'Business Rating Summaries',
+            },
+        ),
+        migrations.RunPython(build_rating_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.1 on 2026-10-19 08:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def remove_duplicate_reviews(apps, schema_editor):
+    """
+    Keep only the first review of every (reviewer, business_user) pair and
+    recompute the rating summaries of the affected business users.
+    """
+    Review = apps.get_model('reviews_app', 'Review')
+    BusinessRatingSummary = apps.get_model('reviews_app', 'BusinessRatingSummary')
+    duplicates = (
+        Review.objects.order_by()
+        .values('reviewer_id', 'business_user_id')
+        .annotate(first_id=models.Min('id'), count=models.Count('id'))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        Review.objects.filter(
+            reviewer_id=duplicate['reviewer_id'],
+            business_user_id=duplicate['business_user_id'],
+        ).exclude(id=duplicate['first_id']).delete()
+
+        business_user_id = duplicate['business_user_id']
+        counts = dict(
+            Review.objects.filter(business_user_id=business_user_id).order_by()
+            .values_list('rating').annotate(models.Count('id'))
+        )
+        values = {f'rating_{star}': counts.get(star, 0) for star in range(1, 6)}
+        values['review_count'] = sum(counts.values())
+        values['rating_sum'] = sum(star * count for star, count in counts.items())
+        BusinessRatingSummary.objects.update_or_create(
+            business_user_id=business_user_id, defaults=values)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0003_review_keyset_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('reviewer', 'business_user'), name='unique_review_per_business_user'),
+        ),
+    ]
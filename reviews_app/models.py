@@ -1,4 +1,6 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Cast, Coalesce
 from django.contrib.auth.models import User
 from profile_app.models import UserProfile
 from django.core.validators import MaxValueValidator, MinValueValidator
@@ -28,3 +30,154 @@ class Review(models.Model):
 
     def __str__(self):
         return self.description
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['reviewer', 'business_user'],
+                name='unique_review_per_business_user'),
+        ]
+        indexes = [
+            models.Index(
+                fields=['business_user', 'updated_at', 'id'],
+                name='review_business_updated_idx'),
+            models.Index(
+                fields=['business_user', 'rating', 'id'],
+                name='review_business_rating_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        """
+        Save the review, update the rating summary of the business user and
+        record the change event in the same transaction (see
+        reviews_app.signals and events_app.signals).
+        """
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+class BusinessRatingSummary(models.Model):
+    """Precomputed rating aggregates of a single business user.
+
+    The summary is kept up to date by the Review signal handlers, so reading
+    the rating of one or many business users never needs an aggregate over
+    the Review table.
+
+    Attributes:
+        business_user (User): The rated business user (primary key).
+        review_count (int): Number of reviews the business user received.
+        rating_sum (int): Sum of all ratings.
+        rating_1 ... rating_5 (int): Number of reviews per star rating.
+        updated_at (datetime): When the summary was last changed.
+    """
+
+    business_user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="rating_summary")
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating_1 = models.PositiveIntegerField(default=0)
+    rating_2 = models.PositiveIntegerField(default=0)
+    rating_3 = models.PositiveIntegerField(default=0)
+    rating_4 = models.PositiveIntegerField(default=0)
+    rating_5 = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.average_rating}"
+
+    @property
+    def average_rating(self):
+        """Return the average rating rounded to one decimal, 0 without reviews."""
+        if not self.review_count:
+            return 0.0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        """Return the number of reviews per star rating as a dict."""
+        return {str(star): getattr(self, f"rating_{star}") for star in range(1, 6)}
+
+    @classmethod
+    def add_rating(cls, business_user_id, rating, amount=1):
+        """
+        Add (amount=1) or remove (amount=-1) a single rating from the summary
+        of the given business user. Uses F() expressions so concurrent
+        writers never overwrite each other's counts. The profile ranking is
+        updated by a job (see reviews_app/tasks.py).
+        """
+        if amount > 0:
+            cls.objects.get_or_create(business_user_id=business_user_id)
+        cls.objects.filter(business_user_id=business_user_id).update(**{
+            "review_count": F("review_count") + amount,
+            "rating_sum": F("rating_sum") + amount * rating,
+            f"rating_{rating}": F(f"rating_{rating}") + amount,
+        })
+
+    @classmethod
+    def rebuild(cls, business_user_id):
+        """Recompute the summary of a business user from its reviews."""
+        counts = dict(
+            Review.objects.filter(business_user_id=business_user_id)
+            .order_by()
+            .values_list("rating")
+            .annotate(models.Count("id"))
+        )
+        values = {f"rating_{star}": counts.get(star, 0) for star in range(1, 6)}
+        values["review_count"] = sum(counts.values())
+        values["rating_sum"] = sum(star * count for star, count in counts.items())
+        summary, _ = cls.objects.update_or_create(
+            business_user_id=business_user_id, defaults=values)
+        cls.sync_profiles([business_user_id])
+        return summary
+
+    @classmethod
+    def rebuild_many(cls, business_user_ids, batch_size=500):
+        """
+        Recompute the summaries of many business users with one grouped
+        query and one upsert per batch, e.g. after a bulk import that
+        bypassed the Review signals.
+        """
+        business_user_ids = list(business_user_ids)
+        for start in range(0, len(business_user_ids), batch_size):
+            batch = business_user_ids[start:start + batch_size]
+            summaries = {pk: cls(business_user_id=pk) for pk in batch}
+            rows = (
+                Review.objects.filter(business_user_id__in=batch)
+                .order_by()
+                .values_list("business_user_id", "rating")
+                .annotate(models.Count("id"))
+            )
+            for business_user_id, rating, count in rows:
+                summary = summaries[business_user_id]
+                setattr(summary, f"rating_{rating}", count)
+                summary.review_count += count
+                summary.rating_sum += rating * count
+            cls.objects.bulk_create(
+                summaries.values(),
+                update_conflicts=True,
+                unique_fields=["business_user"],
+                update_fields=[
+                    "review_count", "rating_sum", "rating_1", "rating_2",
+                    "rating_3", "rating_4", "rating_5", "updated_at",
+                ],
+            )
+            cls.sync_profiles(batch)
+
+    @classmethod
+    def sync_profiles(cls, business_user_ids):
+        """
+        Copy the average rating of the business users to
+        UserProfile.rating_average (ranking of the business directory) with
+        one UPDATE.
+        """
+        average = (
+            cls.objects.filter(business_user_id=OuterRef("user_id"), review_count__gt=0)
+            .annotate(average=Cast("rating_sum", models.FloatField()) / F("review_count"))
+            .values("average")[:1]
+        )
+        UserProfile.objects.filter(user_id__in=business_user_ids).update(
+            rating_average=Coalesce(Subquery(average), 0.0))
+
+    class Meta:
+        verbose_name = 'Business Rating Summary'
+        verbose_name_plural = 'Business Rating Summaries'
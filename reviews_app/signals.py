@@ -0,0 +1,50 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from reviews_app.models import Review, BusinessRatingSummary
+from reviews_app.tasks import sync_rating_averages
+
+
+@receiver(pre_save, sender=Review)
+def remember_previous_rating(sender, instance, **kwargs):
+    """
+    Store the rating and business user currently saved in the database,
+    so the post_save handler can move the review out of the old bucket.
+    """
+    instance._previous_rating = None
+    if instance.pk and not kwargs.get('raw'):
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk)
+            .values_list('business_user_id', 'rating')
+            .first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def update_rating_summary_on_save(sender, instance, created, raw=False, **kwargs):
+    """
+    Add the saved rating to the business user's rating summary and queue
+    the update of the profile ranking.
+    """
+    if raw:
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    current = (instance.business_user_id, instance.rating)
+    if previous == current:
+        return
+    if previous:
+        BusinessRatingSummary.add_rating(*previous, amount=-1)
+        if previous[0] != current[0]:
+            sync_rating_averages.enqueue(business_user_id=previous[0])
+    BusinessRatingSummary.add_rating(*current)
+    sync_rating_averages.enqueue(business_user_id=instance.business_user_id)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_summary_on_delete(sender, instance, **kwargs):
+    """
+    Remove the deleted rating from the business user's rating summary and
+    queue the update of the profile ranking.
+    """
+    BusinessRatingSummary.add_rating(
+        instance.business_user_id, instance.rating, amount=-1)
+    sync_rating_averages.enqueue(business_user_id=instance.business_user_id)
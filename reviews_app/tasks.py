@@ -0,0 +1,8 @@
+from jobs_app.queue import task
+from reviews_app.models import BusinessRatingSummary
+
+
+@task('reviews.sync_rating_averages', batch=True)
+def sync_rating_averages(payloads):
+    """Copy the average ratings of the business users of the payloads to their profiles."""
+    BusinessRatingSummary.sync_profiles({payload['business_user_id'] for payload in payloads})
@@ -1,3 +1,166 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APITestCase
+from rest_framework import status
 
-# Create your tests here.
+from profile_app.models import UserProfile
+from reviews_app.models import Review, BusinessRatingSummary
+from user_auth_app.models import ExpiringToken
+
+
+class RatingSummaryTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create_user(username="Shop", password="shop123")
+        UserProfile.objects.create(user=self.business, username="Shop", type="business")
+        self.customer = User.objects.create_user(username="Ann", password="ann123")
+        self.other_customer = User.objects.create_user(username="Ben", password="ben123")
+
+    def summary(self):
+        return BusinessRatingSummary.objects.get(business_user=self.business)
+
+    def test_summary_follows_create_update_delete(self):
+        review = Review.objects.create(
+            business_user=self.business, reviewer=self.customer, rating=5, description="Top")
+        Review.objects.create(
+            business_user=self.business, reviewer=self.other_customer, rating=2, description="Meh")
+        self.assertEqual(self.summary().review_count, 2)
+        self.assertEqual(self.summary().average_rating, 3.5)
+
+        review.rating = 4
+        review.save()
+        self.assertEqual(self.summary().histogram, {"1": 0, "2": 1, "3": 0, "4": 1, "5": 0})
+
+        review.delete()
+        self.assertEqual(self.summary().review_count, 1)
+        self.assertEqual(self.summary().rating_sum, 2)
+
+    def test_summary_matches_rebuild_after_reviewer_deletion(self):
+        Review.objects.create(
+            business_user=self.business, reviewer=self.customer, rating=3, description="Ok")
+        self.customer.delete()
+        self.assertEqual(self.summary().review_count, 0)
+        self.assertEqual(
+            BusinessRatingSummary.rebuild(self.business.id).histogram, self.summary().histogram)
+
+    def test_business_without_reviews_has_empty_summary(self):
+        self.client.force_authenticate(self.customer)
+        response = self.client.get(
+            reverse("reviews-list"), {"business_user_id": self.business.id, "include": "rating_summary"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rating_summary"]["review_count"], 0)
+
+    def test_reviews_list_includes_rating_summary(self):
+        Review.objects.create(
+            business_user=self.business, reviewer=self.customer, rating=4, description="Good")
+        self.client.force_authenticate(self.customer)
+        url = reverse("reviews-list")
+        response = self.client.get(
+            url, {"business_user_id": self.business.id, "include": "rating_summary"})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["rating_summary"]["average_rating"], 4.0)
+        self.assertEqual(len(response.data["results"]), 1)
+
+
+class ReviewsPaginationTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create(username="Shop")
+        for index, rating in enumerate([3, 5, 3, 1, 3]):
+            reviewer = User.objects.create(username=f"Customer{index}")
+            Review.objects.create(
+                business_user=self.business, reviewer=reviewer, rating=rating, description="Text")
+        self.client.force_authenticate(self.business)
+
+    def collect_pages(self, params):
+        response = self.client.get(reverse("reviews-list"), params)
+        pages = [response.data]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            pages.append(response.data)
+        return pages
+
+    def test_cursor_pages_follow_rating_and_id(self):
+        pages = self.collect_pages(
+            {"business_user_id": self.business.id, "ordering": "rating", "page_size": 2})
+        reviews = [review for page in pages for review in page["results"]]
+        expected = list(
+            Review.objects.order_by("rating", "id").values_list("id", flat=True))
+
+        self.assertEqual(len(pages), 3)
+        self.assertEqual([review["id"] for review in reviews], expected)
+
+    def test_fast_review_pages_are_byte_identical(self):
+        params = {"business_user_id": self.business.id, "ordering": "rating", "page_size": 2}
+        fast = self.client.get(reverse("reviews-list"), params)
+        second_fast = self.client.get(fast.data["next"])
+        with override_settings(FAST_LIST_SERIALIZERS=False):
+            regular = self.client.get(reverse("reviews-list"), params)
+            second_regular = self.client.get(regular.data["next"])
+
+        self.assertEqual(fast.content, regular.content)
+        self.assertEqual(second_fast.content, second_regular.content)
+
+    def test_sparse_fieldset_keeps_cursor_pagination(self):
+        params = {"fields": "rating", "expand": "reviewer", "ordering": "rating", "page_size": 2}
+        first_page = self.client.get(reverse("reviews-list"), params)
+        second_page = self.client.get(first_page.data["next"])
+
+        self.assertEqual(first_page.json()["results"][0], {
+            "reviewer": {"id": Review.objects.order_by("rating", "id")[0].reviewer_id,
+                         "username": "Customer3", "first_name": "", "last_name": ""},
+            "rating": 1,
+        })
+        self.assertEqual([review["rating"] for review in second_page.json()["results"]], [3, 3])
+
+    def test_previous_link_returns_previous_page(self):
+        first_page, second_page = self.collect_pages(
+            {"ordering": "-rating", "page_size": 3})
+        response = self.client.get(second_page["previous"])
+        self.assertEqual(response.data["results"], first_page["results"])
+
+    def test_async_list_matches_sync_list(self):
+        params = {"business_user_id": self.business.id, "ordering": "rating", "page_size": 2}
+        sync_response = self.client.get(reverse("reviews-list"), params)
+        self.client.force_authenticate(None)
+        token = ExpiringToken.objects.create(user=self.business)
+        async_response = self.client.get(
+            reverse("reviews-list-async"), params, HTTP_AUTHORIZATION=f"Token {token.key}")
+
+        self.assertEqual(async_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            async_response.json()["results"], sync_response.json()["results"])
+        self.assertEqual(
+            async_response.json()["next"].replace("/async", ""), sync_response.json()["next"])
+
+
+class DuplicateReviewTest(APITestCase):
+
+    def setUp(self):
+        self.business = User.objects.create(username="Shop")
+        UserProfile.objects.create(user=self.business, username="Shop", type="business")
+        self.customer = User.objects.create(username="Ann")
+        UserProfile.objects.create(user=self.customer, username="Ann", type="customer")
+        self.client.force_authenticate(self.customer)
+        self.url = reverse("reviews-list")
+        self.payload = {"business_user": self.business.id, "rating": 4, "description": "Good"}
+
+    def test_second_review_for_same_business_is_rejected(self):
+        first = self.client.post(self.url, self.payload, format="json")
+        second = self.client.post(self.url, self.payload, format="json")
+
+        self.assertEqual(first.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(second.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            second.data, {"non_field_errors": ["Du hast diesen Geschäftnutzer shon bewertet"]})
+        self.assertEqual(Review.objects.count(), 1)
+
+    def test_business_user_must_have_business_profile(self):
+        payload = dict(self.payload, business_user=self.customer.id)
+        response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("business_user", response.data)
@@ -0,0 +1,523 @@
+import asyncio
+import bisect
+import http.client
+import io
+import json
+import random
+import threading
+import time
+import uuid
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+from django.urls import Resolver404, resolve
+
+"""
+Load generator and trace replay for the REST API.
+
+A workload yields RequestSpec tuples, a transport sends them to the
+application (in-process WSGI, in-process ASGI or HTTP over a socket) and a
+LatencyRecorder collects per route latencies.
+
+Traces are JSON lines, one request per line:
+
+    {"method": "GET", "path": "/api/offers/", "query": {"search": "logo"}}
+    {"method": "POST", "path": "/api/orders/", "body": {"offer_detail_id": 3}, "token": "..."}
+
+`query`, `body` and `token` are optional. Generated workloads can be written
+to a trace with --record and replayed later with --replay.
+"""
+
+RequestSpec = namedtuple('RequestSpec', ['method', 'path', 'query', 'body', 'token'])
+RequestSpec.__new__.__defaults__ = (None, None, None)
+
+HISTOGRAM_BUCKETS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000]
+
+DEFAULT_MIX = {
+    'browse': 35,
+    'search': 15,
+    'detail': 20,
+    'order': 5,
+    'review': 5,
+    'dashboard': 20,
+}
+
+
+def route_name(path):
+    """
+    Return the URL name of a path (e.g. 'offer-list') to group latencies,
+    or the path itself if it does not resolve to a named route.
+    """
+    try:
+        match = resolve(urlsplit(path).path)
+    except Resolver404:
+        return path
+    return match.url_name or match.route
+
+
+def spec_to_trace_line(spec):
+    """
+    Serialize a RequestSpec to a trace line.
+    """
+    line = {'method': spec.method, 'path': spec.path}
+    for key in ('query', 'body', 'token'):
+        value = getattr(spec, key)
+        if value:
+            line[key] = value
+    return json.dumps(line) + '\n'
+
+
+def spec_from_trace_line(line):
+    """
+    Parse a trace line into a RequestSpec.
+    """
+    data = json.loads(line)
+    return RequestSpec(
+        data.get('method', 'GET').upper(), data['path'],
+        data.get('query'), data.get('body'), data.get('token'))
+
+
+class TraceReplay:
+    """
+    Workload that replays the requests of a JSON lines trace in order.
+    """
+
+    def __init__(self, path, loop=False):
+        with open(path, encoding='utf-8') as trace:
+            self.specs = [spec_from_trace_line(line) for line in trace if line.strip()]
+        self.loop = loop
+
+    def __iter__(self):
+        while True:
+            yield from self.specs
+            if not self.loop:
+                return
+
+
+class MixedWorkload:
+    """
+    Workload that mixes marketplace scenarios by weight.
+
+    Scenarios:
+        browse: page through the offer list.
+        search: search offers by keyword.
+        detail: open an offer and one of its packages.
+        order: a customer orders a package.
+        review: a customer reviews a business.
+        dashboard: a business polls its orders and counters.
+
+    Attributes:
+        actors (dict): Tokens, user ids and offer data created by setup_actors().
+        mix (dict): Scenario name -> weight.
+    """
+    search_terms = ['logo', 'website', 'design', 'app', 'seo', 'video']
+
+    def __init__(self, actors, mix=None, seed=None):
+        self.actors = actors
+        self.mix = mix or DEFAULT_MIX
+        self.random = random.Random(seed)
+        self.scenarios = list(self.mix)
+        self.weights = [self.mix[name] for name in self.scenarios]
+
+    def __iter__(self):
+        while True:
+            scenario = self.random.choices(self.scenarios, self.weights)[0]
+            yield from getattr(self, f'scenario_{scenario}')()
+
+    def customer(self):
+        return self.random.choice(self.actors['customers'])
+
+    def business(self):
+        return self.random.choice(self.actors['businesses'])
+
+    def scenario_browse(self):
+        page = self.random.randint(1, self.actors['offer_pages'])
+        yield RequestSpec('GET', '/api/offers/', {'page': page})
+
+    def scenario_search(self):
+        yield RequestSpec('GET', '/api/offers/', {'search': self.random.choice(self.search_terms)})
+
+    def scenario_detail(self):
+        offer_id = self.random.choice(self.actors['offer_ids'])
+        token = self.customer()['token']
+        yield RequestSpec('GET', f'/api/offers/{offer_id}/', token=token)
+        detail_id = self.random.choice(self.actors['detail_ids'])
+        yield RequestSpec('GET', f'/api/offerdetails/{detail_id}/', token=token)
+
+    def scenario_order(self):
+        detail_id = self.random.choice(self.actors['detail_ids'])
+        yield RequestSpec(
+            'POST', '/api/orders/', body={'offer_detail_id': detail_id},
+            token=self.customer()['token'])
+
+    def scenario_review(self):
+        business = self.business()
+        customer = self.customer()
+        yield RequestSpec(
+            'GET', '/api/reviews/', {'business_user_id': business['user_id']},
+            token=customer['token'])
+        yield RequestSpec(
+            'POST', '/api/reviews/',
+            body={
+                'business_user': business['user_id'],
+                'rating': self.random.randint(1, 5),
+                'description': 'Load test review',
+            },
+            token=customer['token'])
+
+    def scenario_dashboard(self):
+        business = self.business()
+        token = business['token']
+        yield RequestSpec('GET', '/api/orders/', token=token)
+        yield RequestSpec('GET', f"/api/order-count/{business['user_id']}/", token=token)
+        yield RequestSpec('GET', f"/api/completed-order-count/{business['user_id']}/", token=token)
+        yield RequestSpec('GET', '/api/base-info/')
+
+
+def setup_actors(transport, businesses=3, customers=10, offers_per_business=4):
+    """
+    Register business and customer accounts and create offers through the
+    API itself, so the same setup works for every transport.
+
+    Returns:
+        dict: Actors and ids used by MixedWorkload.
+    """
+    prefix = f'load_{uuid.uuid4().hex[:8]}'
+    actors = {'businesses': [], 'customers': [], 'offer_ids': [], 'detail_ids': []}
+
+    def register(kind, index):
+        username = f'{prefix}_{kind}_{index}'
+        status, body = transport.send(RequestSpec('POST', '/api/registration/', body={
+            'username': username,
+            'email': f'{username}@example.com',
+            'password': 'load-test-password',
+            'repeated_password': 'load-test-password',
+            'type': kind,
+        }))
+        if status != 201:
+            raise RuntimeError(f'Registration of {username} failed ({status}): {body[:200]!r}')
+        data = json.loads(body)
+        return {'token': data['token'], 'user_id': data['user_id']}
+
+    for index in range(businesses):
+        business = register('business', index)
+        actors['businesses'].append(business)
+        for offer_index in range(offers_per_business):
+            status, body = transport.send(RequestSpec(
+                'POST', '/api/offers/', body=_offer_payload(offer_index), token=business['token']))
+            if status != 201:
+                raise RuntimeError(f'Offer creation failed ({status}): {body[:200]!r}')
+            offer = json.loads(body)
+            actors['offer_ids'].append(offer['id'])
+            actors['detail_ids'].extend(detail['id'] for detail in offer['details'])
+
+    for index in range(customers):
+        actors['customers'].append(register('customer', index))
+
+    actors['offer_pages'] = max(1, len(actors['offer_ids']) // 6)
+    return actors
+
+
+def _offer_payload(index):
+    term = MixedWorkload.search_terms[index % len(MixedWorkload.search_terms)]
+    return {
+        'title': f'{term.title()} package {index}',
+        'description': f'Professional {term} service for load tests',
+        'details': [
+            {
+                'title': f'{offer_type.title()} {term}',
+                'revisions': revisions,
+                'delivery_time_in_days': days,
+                'price': price,
+                'features': [f'{term} feature'],
+                'offer_type': offer_type,
+            }
+            for offer_type, revisions, days, price in (
+                ('basic', 1, 7, 100), ('standard', 3, 5, 200), ('premium', 5, 3, 400))
+        ],
+    }
+
+
+def _encode(spec):
+    path = spec.path
+    if spec.query:
+        path = f'{path}?{urlencode(spec.query)}'
+    body = json.dumps(spec.body).encode() if spec.body is not None else b''
+    headers = {'content-type': 'application/json'} if spec.body is not None else {}
+    if spec.token:
+        headers['authorization'] = f'Token {spec.token}'
+    return path, body, headers
+
+
+class WSGITransport:
+    """
+    Call the WSGI application of the project in-process.
+    """
+
+    def __init__(self):
+        from core.wsgi import application
+        self.application = application
+
+    def send(self, spec):
+        path, body, headers = _encode(spec)
+        path, _, query = path.partition('?')
+        environ = {
+            'REQUEST_METHOD': spec.method,
+            'PATH_INFO': path,
+            'QUERY_STRING': query,
+            'SERVER_NAME': 'localhost',
+            'SERVER_PORT': '80',
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'CONTENT_LENGTH': str(len(body)),
+            'CONTENT_TYPE': headers.get('content-type', ''),
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': io.StringIO(),
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        if 'authorization' in headers:
+            environ['HTTP_AUTHORIZATION'] = headers['authorization']
+        status = []
+
+        def start_response(status_line, response_headers, exc_info=None):
+            status.append(int(status_line.split(' ', 1)[0]))
+
+        result = self.application(environ, start_response)
+        try:
+            content = b''.join(result)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        return status[0], content
+
+    def close(self):
+        pass
+
+
+class ASGITransport:
+    """
+    Call the ASGI application of the project in-process on an event loop
+    running in a background thread.
+    """
+
+    def __init__(self):
+        from core.asgi import application
+        self.application = application
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    def send(self, spec):
+        return asyncio.run_coroutine_threadsafe(self.send_async(spec), self.loop).result()
+
+    async def send_async(self, spec):
+        path, body, headers = _encode(spec)
+        path, _, query = path.partition('?')
+        headers['content-length'] = str(len(body))
+        scope = {
+            'type': 'http',
+            'asgi': {'version': '3.0'},
+            'http_version': '1.1',
+            'method': spec.method,
+            'scheme': 'http',
+            'path': path,
+            'raw_path': path.encode(),
+            'query_string': query.encode(),
+            'root_path': '',
+            'headers': [(key.encode(), value.encode()) for key, value in headers.items()],
+            'server': ('localhost', 80),
+            'client': ('127.0.0.1', 0),
+        }
+        finished = asyncio.Event()
+        request_sent = False
+        status = []
+        chunks = []
+
+        async def receive():
+            nonlocal request_sent
+            if not request_sent:
+                request_sent = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            await finished.wait()
+            return {'type': 'http.disconnect'}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif message['type'] == 'http.response.body':
+                chunks.append(message.get('body', b''))
+                if not message.get('more_body'):
+                    finished.set()
+
+        await self.application(scope, receive, send)
+        finished.set()
+        return status[0], b''.join(chunks)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join()
+
+
+class HTTPTransport:
+    """
+    Send requests over a local socket with one keep-alive connection per
+    worker thread.
+    """
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.local = threading.local()
+
+    def connection(self):
+        if not hasattr(self.local, 'connection'):
+            self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        return self.local.connection
+
+    def send(self, spec):
+        path, body, headers = _encode(spec)
+        connection = self.connection()
+        try:
+            connection.request(spec.method, path, body=body or None, headers=headers)
+            response = connection.getresponse()
+            return response.status, response.read()
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            del self.local.connection
+            raise
+
+    def close(self):
+        pass
+
+
+class RouteStats:
+    """
+    Latencies and status codes of one route.
+    """
+
+    def __init__(self):
+        self.latencies_ms = []
+        self.statuses = {}
+        self.failures = 0
+
+    def percentile(self, fraction):
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        index = min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))
+        return ordered[index]
+
+    def histogram(self):
+        counts = [0] * (len(HISTOGRAM_BUCKETS_MS) + 1)
+        for latency in self.latencies_ms:
+            counts[bisect.bisect_left(HISTOGRAM_BUCKETS_MS, latency)] += 1
+        labels = [f'<={bound}ms' for bound in HISTOGRAM_BUCKETS_MS] + [f'>{HISTOGRAM_BUCKETS_MS[-1]}ms']
+        return dict(zip(labels, counts))
+
+
+class LatencyRecorder:
+    """
+    Thread-safe collector of per route statistics.
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.finished = None
+
+    def record(self, route, latency_ms, status=None):
+        with self.lock:
+            stats = self.routes.setdefault(route, RouteStats())
+            stats.latencies_ms.append(latency_ms)
+            if status is None:
+                stats.failures += 1
+            else:
+                stats.statuses[status] = stats.statuses.get(status, 0) + 1
+
+    def stop(self):
+        self.finished = time.perf_counter()
+
+    @property
+    def elapsed(self):
+        return (self.finished or time.perf_counter()) - self.started
+
+    def report(self):
+        """
+        Return throughput, latency percentiles and histograms per route.
+        """
+        elapsed = self.elapsed
+        routes = {}
+        for route, stats in sorted(self.routes.items()):
+            count = len(stats.latencies_ms)
+            routes[route] = {
+                'requests': count,
+                'throughput_rps': round(count / elapsed, 2) if elapsed else 0,
+                'statuses': {str(key): value for key, value in sorted(stats.statuses.items())},
+                'failures': stats.failures,
+                'p50_ms': round(stats.percentile(0.50), 2),
+                'p90_ms': round(stats.percentile(0.90), 2),
+                'p99_ms': round(stats.percentile(0.99), 2),
+                'max_ms': round(max(stats.latencies_ms, default=0), 2),
+                'histogram': stats.histogram(),
+            }
+        total = sum(route['requests'] for route in routes.values())
+        return {
+            'elapsed_s': round(elapsed, 3),
+            'requests': total,
+            'throughput_rps': round(total / elapsed, 2) if elapsed else 0,
+            'routes': routes,
+        }
+
+
+def run_load(workload, transport, concurrency=8, max_requests=None, duration=None, record_to=None):
+    """
+    Send the requests of a workload with a pool of worker threads until
+    max_requests were sent, the duration elapsed or the workload ended.
+
+    Returns:
+        LatencyRecorder: The collected statistics.
+    """
+    recorder = LatencyRecorder()
+    specs = iter(workload)
+    lock = threading.Lock()
+    sent = 0
+    deadline = time.perf_counter() + duration if duration else None
+
+    def next_spec():
+        nonlocal sent
+        with lock:
+            if max_requests is not None and sent >= max_requests:
+                return None
+            if deadline is not None and time.perf_counter() >= deadline:
+                return None
+            spec = next(specs, None)
+            if spec is not None:
+                sent += 1
+                if record_to is not None:
+                    record_to.write(spec_to_trace_line(spec))
+            return spec
+
+    def worker():
+        while True:
+            spec = next_spec()
+            if spec is None:
+                return
+            route = f'{spec.method} {route_name(spec.path)}'
+            started = time.perf_counter()
+            try:
+                status, _ = transport.send(spec)
+            except Exception:
+                status = None
+            recorder.record(route, (time.perf_counter() - started) * 1000, status)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(worker)
+    recorder.stop()
+    return recorder
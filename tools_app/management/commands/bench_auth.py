@@ -0,0 +1,111 @@
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from tools_app.loadtest import LatencyRecorder, RequestSpec, WSGITransport, run_load
+
+
+class LoginWorkload:
+    """
+    Login requests, round robin over the given accounts.
+    """
+
+    def __init__(self, usernames, password, count):
+        self.usernames = usernames
+        self.password = password
+        self.count = count
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield RequestSpec('POST', '/api/login/', body={
+                'username': self.usernames[index % len(self.usernames)],
+                'password': self.password,
+            })
+
+
+class Command(BaseCommand):
+    """
+    Measure login and registration latency during a login burst, with the
+    password hashes computed on the request threads ('inline') and on the
+    bounded hashing pool ('pool', see core/password_hashing.py).
+
+    While the burst runs, a probe thread requests /api/base-info/ to show
+    how much a login burst slows down requests that do not hash. Requests
+    run in-process against the configured database with throttling
+    disabled; the created accounts stay there, so do not point it at
+    production data.
+    """
+    help = "Benchmark login and registration latency with and without the hashing pool."
+    password = 'bench-auth-password'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=16)
+        parser.add_argument('--logins', type=int, default=100)
+        parser.add_argument('--accounts', type=int, default=10)
+        parser.add_argument('--modes', default='inline,pool', help="Comma separated: inline, pool.")
+
+    def handle(self, *args, **options):
+        rates = {scope: None for scope in settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']}
+        rest_framework = {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': rates}
+        modes = {
+            'inline': {'PASSWORD_HASHING_WORKERS': 0, 'PASSWORD_HASHING_QUEUE': options['concurrency']},
+            'pool': {},
+        }
+        transport = WSGITransport()
+
+        self.stdout.write(
+            f"{'mode':<8}{'route':<24}{'count':>7}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  statuses")
+        for mode in options['modes'].split(','):
+            with override_settings(REST_FRAMEWORK=rest_framework, **modes[mode]):
+                report = self.run_mode(transport, options)
+            for route, stats in report['routes'].items():
+                statuses = ' '.join(f'{code}:{count}' for code, count in stats['statuses'].items())
+                self.stdout.write(
+                    f"{mode:<8}{route:<24}{stats['requests']:>7}{stats['p50_ms']:>9}"
+                    f"{stats['p90_ms']:>9}{stats['p99_ms']:>9}{stats['max_ms']:>9}  {statuses}")
+
+    def run_mode(self, transport, options):
+        recorder = LatencyRecorder()
+        prefix = f'bench_{uuid.uuid4().hex[:8]}'
+        usernames = [f'{prefix}_{index}' for index in range(options['accounts'])]
+        for username in usernames:
+            self.timed(recorder, 'registration', transport, RequestSpec('POST', '/api/registration/', body={
+                'username': username,
+                'email': f'{username}@example.com',
+                'password': self.password,
+                'repeated_password': self.password,
+                'type': 'customer',
+            }))
+
+        done = threading.Event()
+
+        def probe():
+            while not done.is_set():
+                self.timed(recorder, 'base-info (probe)', transport, RequestSpec('GET', '/api/base-info/'))
+                time.sleep(0.01)
+
+        prober = threading.Thread(target=probe)
+        prober.start()
+        try:
+            burst = run_load(
+                LoginWorkload(usernames, self.password, options['logins']), transport,
+                concurrency=options['concurrency'])
+        finally:
+            done.set()
+            prober.join()
+
+        report = recorder.report()
+        report['routes'].update(burst.report()['routes'])
+        return report
+
+    def timed(self, recorder, route, transport, spec):
+        started = time.perf_counter()
+        try:
+            status, _ = transport.send(spec)
+        except Exception:
+            status = None
+        recorder.record(route, (time.perf_counter() - started) * 1000, status)
@@ -0,0 +1,100 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connections, transaction
+
+from core.database import sqlite_config
+
+
+class Command(BaseCommand):
+    """
+    Compare concurrent write throughput of plain SQLite settings with the
+    tuned SQLite profile of core/database.py.
+
+    Every profile gets a fresh temporary database. Writer threads run
+    transactions that read before they write (like creating an order or a
+    review after validating it) while reader threads keep querying, which
+    is the pattern that fails with "database is locked" on default settings.
+    """
+    help = "Benchmark concurrent SQLite writes with default and tuned settings."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--writers', type=int, default=8)
+        parser.add_argument('--readers', type=int, default=4)
+        parser.add_argument('--transactions', type=int, default=200,
+                            help="Write transactions per writer thread.")
+
+    def handle(self, *args, **options):
+        profiles = {
+            'default': {'DB_SQLITE_TUNED': '0'},
+            'tuned': {},
+        }
+        for name, env in profiles.items():
+            with tempfile.TemporaryDirectory() as directory:
+                env = dict(env, DB_NAME=os.path.join(directory, 'bench.sqlite3'))
+                result = self.run_profile(f'bench_{name}', sqlite_config(env, settings.BASE_DIR), options)
+            self.stdout.write(
+                f"{name:<8} {result['committed']:>6} committed  {result['locked']:>6} locked  "
+                f"{result['writes_per_s']:>8.0f} writes/s  {result['reads']:>7} reads")
+
+    def run_profile(self, alias, config, options):
+        configured = connections.configure_settings({'default': config})
+        connections.settings[alias] = configured['default']
+        with connections[alias].cursor() as cursor:
+            cursor.execute(
+                'CREATE TABLE bench_order (id INTEGER PRIMARY KEY, customer INTEGER, status TEXT)')
+
+        counters = {'committed': 0, 'locked': 0, 'reads': 0}
+        lock = threading.Lock()
+        stop_reading = threading.Event()
+
+        def count(key):
+            with lock:
+                counters[key] += 1
+
+        def writer(customer):
+            for _ in range(options['transactions']):
+                try:
+                    with transaction.atomic(using=alias):
+                        with connections[alias].cursor() as cursor:
+                            cursor.execute(
+                                'SELECT COUNT(*) FROM bench_order WHERE customer = %s', [customer])
+                            cursor.execute(
+                                'INSERT INTO bench_order (customer, status) VALUES (%s, %s)',
+                                [customer, 'in_progress'])
+                    count('committed')
+                except OperationalError:
+                    count('locked')
+            connections[alias].close()
+
+        def reader():
+            while not stop_reading.is_set():
+                try:
+                    with connections[alias].cursor() as cursor:
+                        cursor.execute("SELECT COUNT(*) FROM bench_order WHERE status = 'in_progress'")
+                        cursor.fetchone()
+                    count('reads')
+                except OperationalError:
+                    pass
+            connections[alias].close()
+
+        readers = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        writers = [threading.Thread(target=writer, args=(index,)) for index in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in readers + writers:
+            thread.start()
+        for thread in writers:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        stop_reading.set()
+        for thread in readers:
+            thread.join()
+
+        connections[alias].close()
+        del connections.settings[alias]
+        counters['writes_per_s'] = counters['committed'] / elapsed if elapsed else 0
+        return counters
@@ -0,0 +1,87 @@
+import time
+from io import BytesIO
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+from core.renderers import FastJSONParser, FastJSONRenderer
+from offers_app.api.serializers import OfferDetailsSerializer
+from offers_app.models import OfferDetails
+from orders_app.api.serializers import OrderListSerializer
+from orders_app.models import Order
+
+
+class Command(BaseCommand):
+    """
+    Compare DRF's JSONRenderer/JSONParser with FastJSONRenderer/FastJSONParser
+    on large list payloads.
+
+    The payloads are built from unsaved model instances and the real list
+    serializers, so they have the shape of /api/orders/ and offer detail
+    lists. A third payload holds raw model values (Decimal, datetime,
+    JSONField lists), as they come from `.values()` querysets.
+    """
+    help = "Benchmark JSON rendering and parsing of large list responses."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        if renderers.orjson is None:
+            self.stdout.write("orjson is not installed, FastJSONRenderer falls back to json.")
+
+        payloads = self.build_payloads(options['rows'])
+        self.stdout.write(f"{'payload':<14} {'op':<7} {'drf ms':>8} {'fast ms':>8} {'speedup':>8} {'KiB':>7}")
+        for name, data in payloads.items():
+            body = JSONRenderer().render(data)
+            results = [
+                ('render', lambda: JSONRenderer().render(data), lambda: FastJSONRenderer().render(data)),
+                ('parse', lambda: JSONParser().parse(BytesIO(body)), lambda: FastJSONParser().parse(BytesIO(body))),
+            ]
+            for operation, drf, fast in results:
+                drf_ms = self.measure(drf, options['repeat'])
+                fast_ms = self.measure(fast, options['repeat'])
+                self.stdout.write(
+                    f"{name:<14} {operation:<7} {drf_ms:>8.2f} {fast_ms:>8.2f} "
+                    f"{drf_ms / fast_ms:>7.1f}x {len(body) / 1024:>7.0f}")
+
+    def measure(self, function, repeat):
+        function()
+        started = time.perf_counter()
+        for _ in range(repeat):
+            function()
+        return (time.perf_counter() - started) * 1000 / repeat
+
+    def build_payloads(self, rows):
+        now = timezone.now()
+        orders = [
+            Order(
+                id=index, customer_user_id=index % 50 + 1, business_user_id=index % 7 + 1,
+                title=f"Logo Design #{index}", revisions=3, delivery_time_in_days=5,
+                price=Decimal('150.00') + index, features=['Logo', 'Visitenkarte', 'Briefpapier'],
+                offer_type='premium', status='in_progress',
+                created_at=now - timedelta(minutes=index), updated_at=now)
+            for index in range(rows)
+        ]
+        details = [
+            OfferDetails(
+                id=index, offer_id=index // 3 + 1, title='Grafikdesign – Premium', revisions=-1,
+                delivery_time_in_days=10, price=Decimal('499.90'),
+                features=['Logo', 'Flyer', 'Social Media'], offer_type='premium')
+            for index in range(rows)
+        ]
+        return {
+            'orders': OrderListSerializer(orders, many=True).data,
+            'offer_details': OfferDetailsSerializer(details, many=True).data,
+            'order_values': [
+                {field.attname: getattr(order, field.attname) for field in Order._meta.concrete_fields}
+                for order in orders
+            ],
+        }
+
@@ -0,0 +1,45 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand
+
+from tools_app.transfer import MARKETPLACE_MODELS, export_model_rows, get_marketplace_models
+
+
+class Command(BaseCommand):
+    """
+    Export users, profiles, offers, offer details, orders, reviews and tokens
+    as streaming NDJSON.
+
+    The dump contains password hashes and token keys, keep it private.
+    """
+    help = "Export the marketplace data as NDJSON (one row per line)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '-o', '--output', help="File to write to. Defaults to stdout.")
+        parser.add_argument(
+            '--models', nargs='+', choices=MARKETPLACE_MODELS, metavar='MODEL',
+            help=f"Only export these models. Choices: {', '.join(MARKETPLACE_MODELS)}")
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help="Rows fetched per database round trip.")
+
+    def handle(self, *args, **options):
+        output = options['output']
+        stream = open(output, 'w', encoding='utf-8') if output else sys.stdout
+        log = self.stdout if output else self.stderr
+        try:
+            for model in get_marketplace_models(options['models']):
+                started = time.perf_counter()
+                count = 0
+                for line in export_model_rows(model, options['chunk_size']):
+                    stream.write(line)
+                    count += 1
+                elapsed = time.perf_counter() - started
+                log.write(
+                    f"{model._meta.label}: {count} rows in {elapsed:.2f}s "
+                    f"({count / elapsed if elapsed else 0:.0f} rows/s)")
+        finally:
+            if output:
+                stream.close()
@@ -0,0 +1,89 @@
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import DEFAULT_DB_ALIAS, IntegrityError, connections, transaction
+
+from orders_app.models import Order
+from profile_app.search import analyze_profiles
+from reviews_app.models import BusinessRatingSummary
+from tools_app.transfer import MarketplaceImporter, get_marketplace_models, preserved_timestamps
+
+
+class Command(BaseCommand):
+    """
+    Import an NDJSON dump written by export_marketplace.
+
+    The whole import runs in one transaction with constraint checks deferred
+    until all rows are inserted, like loaddata. Rows are inserted with chunked
+    bulk_create and get new primary keys (foreign keys are remapped) unless
+    --keep-pks is given. Rows referring to users, offers etc. that are not
+    in the dump are rejected unless --link-existing is given.
+    """
+    help = "Import marketplace data from an NDJSON dump."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'input', nargs='?', help="File to read from. Defaults to stdin.")
+        parser.add_argument(
+            '--chunk-size', type=int, default=1000,
+            help="Rows inserted per bulk_create call.")
+        parser.add_argument(
+            '--keep-pks', action='store_true',
+            help="Keep the exported primary keys instead of remapping them.")
+        parser.add_argument(
+            '--link-existing', action='store_true',
+            help="Link foreign keys to rows missing from the dump to the local "
+                 "rows with the exported ids.")
+        parser.add_argument(
+            '--database', default=DEFAULT_DB_ALIAS,
+            help="Database to import into.")
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if not options['keep_pks'] and not connection.features.can_return_rows_from_bulk_insert:
+            raise CommandError(
+                "This database cannot return the ids of bulk inserted rows, use --keep-pks.")
+
+        importer = MarketplaceImporter(
+            options['chunk_size'], options['keep_pks'], options['link_existing'])
+        models_to_import = get_marketplace_models()
+        stream = open(options['input'], encoding='utf-8') if options['input'] else sys.stdin
+        started = time.perf_counter()
+        try:
+            with transaction.atomic(using=options['database']), preserved_timestamps(models_to_import):
+                with connection.constraint_checks_disabled():
+                    for number, line in enumerate(stream, 1):
+                        if line.strip():
+                            importer.add_line(line, number)
+                    importer.flush()
+                table_names = [model._meta.db_table for model in models_to_import]
+                connection.check_constraints(table_names=table_names)
+                if options['keep_pks']:
+                    self.reset_sequences(connection, models_to_import)
+                BusinessRatingSummary.rebuild_many(importer.business_user_ids)
+                Order.sync_profiles(importer.order_business_user_ids)
+        except IntegrityError as error:
+            raise CommandError(f"Import rolled back: {error}")
+        finally:
+            if options['input']:
+                stream.close()
+        analyze_profiles(connection)
+
+        elapsed = time.perf_counter() - started
+        total = sum(importer.counts.values())
+        for label, count in importer.counts.items():
+            self.stdout.write(f"{label}: {count} rows")
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {total} rows in {elapsed:.2f}s "
+            f"({total / elapsed if elapsed else 0:.0f} rows/s)"))
+
+    def reset_sequences(self, connection, models_to_import):
+        """
+        Move the id sequences past the imported primary keys.
+        """
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), models_to_import)
+        with connection.cursor() as cursor:
+            for sql in sequence_sql:
+                cursor.execute(sql)
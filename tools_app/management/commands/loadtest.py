@@ -0,0 +1,115 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tools_app.loadtest import (
+    DEFAULT_MIX, ASGITransport, HTTPTransport, MixedWorkload, TraceReplay, WSGITransport,
+    run_load, setup_actors,
+)
+
+
+class Command(BaseCommand):
+    """
+    Generate a mixed marketplace workload or replay a trace against the API
+    and report throughput and latency histograms per route.
+
+    In the in-process modes (wsgi, asgi) the requests run against the database
+    configured in the settings and the generated accounts and offers stay
+    there, so do not point it at production data.
+    """
+    help = "Run a load test against the API and report latencies per route."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--mode', choices=['wsgi', 'asgi', 'http'], default='wsgi',
+            help="Call the app in-process (wsgi/asgi) or over HTTP (http).")
+        parser.add_argument(
+            '--url', default='http://127.0.0.1:8000',
+            help="Server address for --mode http.")
+        parser.add_argument('--concurrency', type=int, default=8)
+        parser.add_argument(
+            '--requests', type=int, default=1000,
+            help="Stop after this many requests (0 for no limit).")
+        parser.add_argument(
+            '--duration', type=float,
+            help="Stop after this many seconds.")
+        parser.add_argument(
+            '--replay', metavar='TRACE',
+            help="Replay a JSON lines trace instead of generating a workload.")
+        parser.add_argument(
+            '--loop', action='store_true',
+            help="Restart the trace when it ends (with --replay).")
+        parser.add_argument(
+            '--record', metavar='TRACE',
+            help="Write the sent requests to a JSON lines trace.")
+        parser.add_argument(
+            '--mix', default=','.join(f'{name}={weight}' for name, weight in DEFAULT_MIX.items()),
+            help="Scenario weights, e.g. browse=50,search=20,dashboard=30.")
+        parser.add_argument('--businesses', type=int, default=3)
+        parser.add_argument('--customers', type=int, default=10)
+        parser.add_argument('--seed', type=int, help="Random seed of the workload.")
+        parser.add_argument('--json', action='store_true', help="Print the report as JSON.")
+
+    def handle(self, *args, **options):
+        transport = self.get_transport(options)
+        record_to = open(options['record'], 'w', encoding='utf-8') if options['record'] else None
+        try:
+            if options['replay']:
+                workload = TraceReplay(options['replay'], loop=options['loop'])
+            else:
+                actors = setup_actors(transport, options['businesses'], options['customers'])
+                workload = MixedWorkload(actors, self.parse_mix(options['mix']), options['seed'])
+            recorder = run_load(
+                workload, transport,
+                concurrency=options['concurrency'],
+                max_requests=options['requests'] or None,
+                duration=options['duration'],
+                record_to=record_to,
+            )
+        finally:
+            transport.close()
+            if record_to:
+                record_to.close()
+
+        report = recorder.report()
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_report(report)
+
+    def get_transport(self, options):
+        if options['mode'] == 'http':
+            return HTTPTransport(options['url'])
+        if options['mode'] == 'asgi':
+            return ASGITransport()
+        return WSGITransport()
+
+    def parse_mix(self, value):
+        mix = {}
+        for part in value.split(','):
+            name, _, weight = part.partition('=')
+            if name not in DEFAULT_MIX or not weight.isdigit():
+                raise CommandError(
+                    f"Invalid mix entry '{part}'. Scenarios: {', '.join(DEFAULT_MIX)}")
+            mix[name] = int(weight)
+        return mix
+
+    def write_report(self, report):
+        self.stdout.write(
+            f"{report['requests']} requests in {report['elapsed_s']}s "
+            f"({report['throughput_rps']} req/s)\n")
+        header = f"{'route':<42}{'count':>7}{'req/s':>9}{'p50':>9}{'p90':>9}{'p99':>9}{'max':>9}  statuses"
+        self.stdout.write(header)
+        self.stdout.write('-' * len(header))
+        for route, stats in report['routes'].items():
+            statuses = ' '.join(f'{code}:{count}' for code, count in stats['statuses'].items())
+            if stats['failures']:
+                statuses += f" failed:{stats['failures']}"
+            self.stdout.write(
+                f"{route:<42}{stats['requests']:>7}{stats['throughput_rps']:>9}"
+                f"{stats['p50_ms']:>9}{stats['p90_ms']:>9}{stats['p99_ms']:>9}{stats['max_ms']:>9}  {statuses}")
+        self.stdout.write('\nLatency histograms (ms):')
+        for route, stats in report['routes'].items():
+            buckets = ' '.join(
+                f'{bound}:{count}' for bound, count in stats['histogram'].items() if count)
+            self.stdout.write(f'  {route}: {buckets}')
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+
+from user_auth_app.guests import provision_guests, reset_guest_data
+
+
+class Command(BaseCommand):
+    """
+    Create the guest accounts of the demo login (GuestBusiness,
+    GuestCustomer) with profile and token. Run it on deployment, so the
+    first guest login does not have to create them.
+
+    With --reset the offers, orders and reviews of the guests are deleted and
+    their names and profiles restored. Other users keep their data; only
+    orders and reviews they exchanged with a guest are removed.
+    """
+    help = "Create the guest accounts and optionally reset their demo data."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help="Delete the offers, orders and reviews of the guests.")
+
+    def handle(self, *args, **options):
+        usernames = provision_guests()
+        self.stdout.write(f"Guest accounts ready: {', '.join(usernames)}")
+        if options['reset']:
+            deleted = reset_guest_data()
+            summary = ', '.join(f'{label}: {count}' for label, count in sorted(deleted.items()))
+            self.stdout.write(f"Guest data reset ({summary or 'nothing to delete'})")
@@ -0,0 +1,42 @@
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from events_app.models import ChangeEvent
+
+
+class Command(BaseCommand):
+    """
+    Delete change events older than EVENTS_KEEP_SECONDS in chunks.
+
+    Like purge_tokens, every chunk is a short transaction, so the command
+    can run from cron while the API serves requests. Feed clients that were
+    offline for longer than the retention have to reload the full lists.
+    """
+    help = "Delete old change events in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--sleep', type=float, default=0.1,
+            help="Seconds to pause between chunks.")
+
+    def handle(self, *args, **options):
+        before = timezone.now() - timedelta(seconds=settings.EVENTS_KEEP_SECONDS)
+        deleted = 0
+        while True:
+            ids = list(
+                ChangeEvent.objects.filter(created_at__lt=before).order_by('id')
+                .values_list('id', flat=True)[:options['chunk_size']]
+            )
+            if not ids:
+                break
+            count, _ = ChangeEvent.objects.filter(id__in=ids).delete()
+            deleted += count
+            if len(ids) < options['chunk_size']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write(f"Deleted {deleted} change events.")
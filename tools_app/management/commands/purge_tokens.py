@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from user_auth_app.models import ExpiringToken
+
+
+class Command(BaseCommand):
+    """
+    Delete expired tokens in chunks.
+
+    Every chunk is deleted in its own short transaction by primary key, with
+    a pause in between, so the command can run (e.g. from cron) while the
+    API serves requests without holding the write lock for long.
+    """
+    help = "Delete expired authentication tokens in chunks."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=1000)
+        parser.add_argument(
+            '--sleep', type=float, default=0.1,
+            help="Seconds to pause between chunks.")
+
+    def handle(self, *args, **options):
+        deleted = 0
+        while True:
+            keys = list(
+                ExpiringToken.objects.expired().order_by('expires')
+                .values_list('key', flat=True)[:options['chunk_size']]
+            )
+            if not keys:
+                break
+            count, _ = ExpiringToken.objects.filter(key__in=keys).delete()
+            deleted += count
+            if len(keys) < options['chunk_size']:
+                break
+            time.sleep(options['sleep'])
+        self.stdout.write(f"Deleted {deleted} expired tokens.")
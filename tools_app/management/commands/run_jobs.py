@@ -0,0 +1,54 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from jobs_app.queue import purge_finished_jobs, release_stale_jobs, run_due_jobs, worker_name
+
+
+class Command(BaseCommand):
+    """
+    Run the queued jobs (see jobs_app/queue.py).
+
+    The worker claims batches of due jobs until the queue is empty, then
+    polls every JOBS_POLL_SECONDS. While idle it requeues the jobs of dead
+    workers and deletes old finished jobs. SIGINT and SIGTERM stop it after
+    the current batch. Several workers can run side by side.
+    """
+    help = "Run queued background jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help="Run the due jobs and exit instead of polling.")
+        parser.add_argument('--batch-size', type=int, default=settings.JOBS_BATCH_SIZE)
+        parser.add_argument(
+            '--poll-interval', type=float, default=settings.JOBS_POLL_SECONDS,
+            help="Seconds to wait while the queue is empty.")
+
+    def handle(self, *args, **options):
+        self.stopping = False
+        signal.signal(signal.SIGINT, self.stop)
+        signal.signal(signal.SIGTERM, self.stop)
+        worker = worker_name()
+        processed = 0
+        idle_tasks_due = 0
+
+        while not self.stopping:
+            count = run_due_jobs(worker, options['batch_size'])
+            processed += count
+            if count:
+                continue
+            if time.monotonic() >= idle_tasks_due:
+                release_stale_jobs()
+                purge_finished_jobs()
+                idle_tasks_due = time.monotonic() + 60
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
+
+        self.stdout.write(f"Worker {worker} ran {processed} jobs.")
+
+    def stop(self, signum, frame):
+        self.stopping = True
@@ -0,0 +1,107 @@
+import os
+import tempfile
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.test import SimpleTestCase, TestCase
+
+from offers_app.models import Offer, OfferDetails
+from orders_app.models import Order
+from profile_app.models import UserProfile
+from reviews_app.models import Review, BusinessRatingSummary
+from user_auth_app.models import ExpiringToken
+from tools_app.loadtest import (
+    LatencyRecorder, RequestSpec, route_name, spec_from_trace_line, spec_to_trace_line,
+)
+
+
+class MarketplaceTransferTest(TestCase):
+
+    def setUp(self):
+        business = User.objects.create(username="Shop")
+        customer = User.objects.create(username="Ann")
+        UserProfile.objects.create(user=business, username="Shop", type="business")
+        UserProfile.objects.create(user=customer, username="Ann", type="customer")
+        offer = Offer.objects.create(user=business, title="Logo", description="A logo", min_price=50)
+        detail = OfferDetails.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price="50.00", features=["1 logo"], offer_type="basic")
+        Order.objects.create(
+            offer_detail=detail, customer_user=customer, business_user=business, title="Basic",
+            revisions=1, delivery_time_in_days=3, price="50.00", features=["1 logo"],
+            offer_type="basic")
+        Review.objects.create(business_user=business, reviewer=customer, rating=5, description="Top")
+        ExpiringToken.objects.create(user=customer)
+        self.dump = os.path.join(tempfile.mkdtemp(), "dump.ndjson")
+
+    def test_export_and_import_with_remapped_ids(self):
+        offer_created_at = Offer.objects.get().created_at
+        token_key = ExpiringToken.objects.get().key
+        call_command("export_marketplace", output=self.dump, stdout=StringIO())
+        User.objects.all().delete()
+
+        call_command("import_marketplace", self.dump, stdout=StringIO())
+
+        customer = User.objects.get(username="Ann")
+        order = Order.objects.select_related("offer_detail__offer").get()
+        self.assertEqual(order.customer_user, customer)
+        self.assertEqual(order.offer_detail.offer.user.username, "Shop")
+        self.assertEqual(order.offer_detail.offer.created_at, offer_created_at)
+        self.assertEqual(ExpiringToken.objects.get(key=token_key).user, customer)
+        self.assertEqual(BusinessRatingSummary.objects.get().review_count, 1)
+
+    def test_import_keeps_primary_keys(self):
+        offer_ids = list(Offer.objects.values_list("id", flat=True))
+        call_command("export_marketplace", output=self.dump, stdout=StringIO())
+        User.objects.all().delete()
+
+        call_command("import_marketplace", self.dump, keep_pks=True, stdout=StringIO())
+
+        self.assertEqual(list(Offer.objects.values_list("id", flat=True)), offer_ids)
+        self.assertEqual(Review.objects.count(), 1)
+
+    def test_import_rejects_rows_of_users_missing_from_dump(self):
+        business_id = User.objects.get(username="Shop").id
+        call_command("export_marketplace", output=self.dump, stdout=StringIO())
+        with open(self.dump) as dump:
+            lines = [line for line in dump if f'"username": "Shop"' not in line or '"auth.user"' not in line]
+        with open(self.dump, "w") as dump:
+            dump.writelines(lines)
+        User.objects.all().delete()
+
+        with self.assertRaisesMessage(CommandError, f"auth.User {business_id} is not in the dump"):
+            call_command("import_marketplace", self.dump, stdout=StringIO())
+        self.assertFalse(User.objects.exists())
+
+    def test_partial_dump_links_existing_rows_only_on_request(self):
+        call_command("export_marketplace", output=self.dump, models=["offers_app.Offer"], stdout=StringIO())
+
+        with self.assertRaisesMessage(CommandError, "Line 1: auth.User"):
+            call_command("import_marketplace", self.dump, stdout=StringIO())
+        call_command("import_marketplace", self.dump, link_existing=True, stdout=StringIO())
+
+        self.assertEqual(Offer.objects.filter(user__username="Shop").count(), 2)
+
+
+class LoadTestReportTest(SimpleTestCase):
+
+    def test_trace_line_round_trip(self):
+        spec = RequestSpec("POST", "/api/orders/", body={"offer_detail_id": 3}, token="abc")
+        self.assertEqual(spec_from_trace_line(spec_to_trace_line(spec)), spec)
+
+    def test_report_groups_latencies_by_route(self):
+        recorder = LatencyRecorder()
+        for latency in (3, 4, 30):
+            recorder.record("GET offer-list", latency, 200)
+        recorder.record("POST orders-list", 12, None)
+        recorder.stop()
+
+        report = recorder.report()
+        offers = report["routes"]["GET offer-list"]
+        self.assertEqual(report["requests"], 4)
+        self.assertEqual(offers["p50_ms"], 4)
+        self.assertEqual(offers["histogram"]["<=5ms"], 2)
+        self.assertEqual(offers["histogram"]["<=50ms"], 1)
+        self.assertEqual(report["routes"]["POST orders-list"]["failures"], 1)
+        self.assertEqual(route_name("/api/offers/"), "offer-list")
@@ -0,0 +1,212 @@
+import datetime
+import json
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.management.base import CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+
+"""
+Streaming NDJSON export and import of the marketplace data.
+
+Every line of a dump is one row:
+
+    {"model": "offers_app.offer", "pk": 7, "fields": {"user_id": 3, ...}}
+
+Rows are written model by model in dependency order (see MARKETPLACE_MODELS),
+so an import can always resolve foreign keys against rows it has already
+inserted.
+"""
+
+MARKETPLACE_MODELS = [
+    'auth.User',
+    'profile_app.UserProfile',
+    'offers_app.Offer',
+    'offers_app.OfferDetails',
+    'orders_app.Order',
+    'reviews_app.Review',
+    'user_auth_app.ExpiringToken',
+]
+
+
+class TransferJSONEncoder(DjangoJSONEncoder):
+    """
+    DjangoJSONEncoder that keeps the microseconds of datetimes and times,
+    so exported timestamps survive a round trip unchanged.
+    """
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_marketplace_models(labels=None):
+    """
+    Return the model classes to transfer, in dependency order.
+
+    Args:
+        labels (list): Optional subset of MARKETPLACE_MODELS (case-insensitive).
+    """
+    wanted = {label.lower() for label in labels} if labels else None
+    return [
+        apps.get_model(label) for label in MARKETPLACE_MODELS
+        if wanted is None or label.lower() in wanted
+    ]
+
+
+def get_transfer_fields(model):
+    """
+    Return the concrete, non primary key fields of a model.
+    """
+    return [field for field in model._meta.concrete_fields if not field.primary_key]
+
+
+def export_model_rows(model, chunk_size=2000):
+    """
+    Yield one NDJSON line per row of the model.
+
+    Rows are read with QuerySet.iterator(), which uses a server-side cursor
+    where the database supports it, so memory stays constant.
+    """
+    label = model._meta.label_lower
+    fields = get_transfer_fields(model)
+    columns = [model._meta.pk.attname] + [field.attname for field in fields]
+    rows = model._default_manager.order_by('pk').values_list(*columns).iterator(chunk_size=chunk_size)
+    for row in rows:
+        yield json.dumps({
+            'model': label,
+            'pk': row[0],
+            'fields': {field.attname: value for field, value in zip(fields, row[1:])},
+        }, cls=TransferJSONEncoder) + '\n'
+
+
+@contextmanager
+def preserved_timestamps(models_to_import):
+    """
+    Disable auto_now / auto_now_add while importing, so the exported
+    timestamps are written instead of the current time.
+    """
+    changed = []
+    for model in models_to_import:
+        for field in model._meta.concrete_fields:
+            if isinstance(field, models.DateField) and (field.auto_now or field.auto_now_add):
+                changed.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in changed:
+            field.auto_now = auto_now
+            field.auto_now_add = auto_now_add
+
+
+class MarketplaceImporter:
+    """
+    Import NDJSON rows with chunked bulk_create.
+
+    Unless keep_pks is set, every row gets a new primary key and foreign keys
+    are remapped from the exported ids to the new ids, so a dump can be loaded
+    into a database that already contains data. A foreign key to a
+    marketplace model whose row is not in the dump is an error, unless
+    link_existing is set.
+
+    Attributes:
+        chunk_size (int): Number of rows per bulk_create call.
+        keep_pks (bool): Insert rows with their exported primary keys.
+        link_existing (bool): Keep foreign keys to rows that are not in the
+            dump, so they point to the local rows with the exported ids.
+        id_maps (dict): Exported pk -> new pk for every imported model.
+        counts (dict): Number of imported rows per model label.
+        business_user_ids (set): Business users of imported reviews.
+        order_business_user_ids (set): Business users of imported orders.
+    """
+
+    def __init__(self, chunk_size=1000, keep_pks=False, link_existing=False):
+        self.chunk_size = chunk_size
+        self.keep_pks = keep_pks
+        self.link_existing = link_existing
+        self.id_maps = {}
+        self.counts = {}
+        self.business_user_ids = set()
+        self.order_business_user_ids = set()
+        self._model = None
+        self._buffer = []
+
+    def add_line(self, line, number=None):
+        """
+        Parse one NDJSON line and buffer it, flushing full chunks. `number`
+        is the line number reported in errors.
+        """
+        row = json.loads(line)
+        model = apps.get_model(row['model'])
+        if model is not self._model:
+            self.flush()
+            self._model = model
+        self._buffer.append((number, row))
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        """
+        Insert the buffered rows of the current model with one bulk_create.
+        """
+        if not self._buffer:
+            return
+        model = self._model
+        objects = [self.build_instance(model, row, number) for number, row in self._buffer]
+        model._default_manager.bulk_create(objects, batch_size=self.chunk_size)
+
+        id_map = self.id_maps.setdefault(model, {})
+        for (_, row), obj in zip(self._buffer, objects):
+            id_map[row['pk']] = obj.pk
+        if model._meta.label == 'reviews_app.Review':
+            self.business_user_ids.update(obj.business_user_id for obj in objects)
+        elif model._meta.label == 'orders_app.Order':
+            self.order_business_user_ids.update(obj.business_user_id for obj in objects)
+
+        label = model._meta.label_lower
+        self.counts[label] = self.counts.get(label, 0) + len(objects)
+        self._buffer = []
+
+    def build_instance(self, model, row, number=None):
+        """
+        Build an unsaved model instance from a row, remapping foreign keys.
+        """
+        values = {}
+        for field in get_transfer_fields(model):
+            if field.attname not in row['fields']:
+                continue
+            value = row['fields'][field.attname]
+            if field.is_relation and value is not None:
+                value = self.remap(field.related_model, value, number)
+            elif value is not None:
+                value = field.to_python(value)
+            values[field.attname] = value
+
+        pk_field = model._meta.pk
+        if self.keep_pks or not isinstance(pk_field, models.AutoField):
+            values[pk_field.attname] = pk_field.to_python(row['pk'])
+        return model(**values)
+
+    def remap(self, related_model, pk, number=None):
+        """
+        Return the new pk of an imported row. Foreign keys to models outside
+        MARKETPLACE_MODELS, and with link_existing to rows not in the dump,
+        are kept unchanged.
+
+        Raises:
+            CommandError: If the row of a marketplace model is not in the
+                dump, which would otherwise link to an unrelated local row.
+        """
+        if self.keep_pks:
+            return pk
+        id_map = self.id_maps.get(related_model, {})
+        if pk in id_map:
+            return id_map[pk]
+        if related_model._meta.label not in MARKETPLACE_MODELS or self.link_existing:
+            return pk
+        raise CommandError(
+            f"Line {number}: {related_model._meta.label} {pk} is not in the dump. "
+            f"Export it too, or use --link-existing to link to the local row with this id.")
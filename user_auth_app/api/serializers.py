@@ -1,14 +1,36 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
+from django.db import IntegrityError, transaction
+from django.db.models import BooleanField
+from django.db.models.expressions import RawSQL
+from core.password_hashing import make_password
 from profile_app.models import UserProfile
+from user_auth_app.models import ExpiringToken
+
+# Matches the partial index auth_user_email_lower_uniq (see the
+# user_auth_app migrations); the `email <> ''` has to be literal SQL for the
+# index to be used.
+EMAIL_LOWER_SQL = "LOWER(email) = %s AND email <> ''"
+
+
+def email_taken(email, exclude_user_id=None):
+    """
+    Return True if an account (other than exclude_user_id) uses the email
+    address, ignoring case.
+    """
+    if not email:
+        return False
+    condition = RawSQL(EMAIL_LOWER_SQL, [email.lower()], output_field=BooleanField())
+    return User.objects.filter(condition).exclude(pk=exclude_user_id).exists()
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """
     Serializer for user registration.
 
-    Handles creation of new User instances along with associated UserProfile.
-    Includes validation for email uniqueness and password confirmation.
+    Handles creation of new User instances along with associated UserProfile
+    and ExpiringToken. Includes validation for email uniqueness (ignoring
+    case) and password confirmation.
     """
     repeated_password = serializers.CharField(write_only=True)
 
@@ -39,7 +61,7 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         password = data.get('password')
         repeated_password = data.get('repeated_password')
 
-        if User.objects.filter(email=email).exists():
+        if email_taken(email):
             raise serializers.ValidationError('Email already exist')
 
         if password != repeated_password:
@@ -49,30 +71,44 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 
     def save(self):
         """
-        Create a new User and associated UserProfile.
+        Create a new User with its UserProfile and ExpiringToken.
 
-        Automatically sets the password and assigns a user type (default 'customer').
+        The password is hashed on the password hashing pool before the
+        transaction starts, so the write lock is only held for the three
+        inserts. The token is available as `serializer.token`.
 
         Returns:
             User: The newly created User instance.
+
+        Raises:
+            serializers.ValidationError: If a concurrent registration took the
+                username or email in the meantime.
         """
         username = self.validated_data['username']
         email = self.validated_data['email']
         password = self.validated_data['password']
 
-        account = User(username=username, email=email)
-        account.set_password(password)
-        account.save()
-
+        account = User(username=username, email=email, password=make_password(password))
         user_type = self.context.get('type', 'customer')
-        UserProfile.objects.create(
-            user=account,
-            username=account.username,
-            first_name=account.first_name,
-            last_name=account.last_name,
-            email=account.email,
-            type=user_type
-        )
+        try:
+            with transaction.atomic():
+                account.save()
+                UserProfile.objects.create(
+                    user=account,
+                    username=account.username,
+                    first_name=account.first_name,
+                    last_name=account.last_name,
+                    email=account.email,
+                    type=user_type
+                )
+                self.token = ExpiringToken.objects.create(user=account)
+        except IntegrityError:
+            if email_taken(email):
+                raise serializers.ValidationError({'non_field_errors': ['Email already exist']})
+            if User.objects.filter(username=username).exists():
+                raise serializers.ValidationError(
+                    {'username': ['A user with that username already exists.']})
+            raise
         return account
 
 
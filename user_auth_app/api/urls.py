@@ -8,6 +8,6 @@ This module defines routes for user registration and login.
 """
 
 urlpatterns = [
-    path('registration/', RegistrationView.as_view()),
-    path('login/', CustomLoginView.as_view())
+    path('registration/', RegistrationView.as_view(), name='registration'),
+    path('login/', CustomLoginView.as_view(), name='login')
 ]
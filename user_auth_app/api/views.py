@@ -1,13 +1,37 @@
 from profile_app.api.serializers import UserProfileSerializer
 from profile_app.models import UserProfile
 from .serializers import UserRegistrationSerializer
-from .functions import fill_user_data_dict, guest_user_data_dict
+from .functions import fill_user_data_dict
+from core.db_routers import pin_client
+from user_auth_app.guests import guest_login_data, is_guest
+from user_auth_app.models import ExpiringToken
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
-from rest_framework.authtoken.models import Token
 from rest_framework.authtoken.views import ObtainAuthToken
-from django.contrib.auth.models import User
+from rest_framework.settings import api_settings
+
+
+def register_account(request):
+    """Register a user from the request data and return the 201 response
+    with token and user data, or 400 with the validation errors.
+
+    User, UserProfile and ExpiringToken are created in one transaction, see
+    UserRegistrationSerializer.save(). The client is pinned to the primary
+    database with the new token (see core/db_routers.py).
+    """
+    serializer = UserRegistrationSerializer(
+        data=request.data, context={'type': request.data['type']}
+    )
+    try:
+        serializer.is_valid(raise_exception=True)
+        saved_account = serializer.save()
+    except ValidationError as exc:
+        return Response({'error': exc.detail}, status=status.HTTP_400_BAD_REQUEST)
+    pin_client(f'Token {serializer.token.key}')
+    data = fill_user_data_dict(serializer.token, saved_account)
+    return Response(data, status=status.HTTP_201_CREATED)
 
 
 class RegistrationView(APIView):
@@ -23,43 +47,39 @@ class RegistrationView(APIView):
         Routes requests based on the username to guest customer/business
         handlers or normal registration.
         """
-        serializer = UserRegistrationSerializer(
-            data=request.data, context={'type': request.data['type']}
-        )
-        data = {}
-        if serializer.is_valid():
-            saved_account = serializer.save()
-            token, created = Token.objects.get_or_create(user=saved_account)
-            data = fill_user_data_dict(token, saved_account)
-        else:
-            data = {
-                'error': serializer.errors
-            }
-            return Response(data, status=status.HTTP_400_BAD_REQUEST)
-        return Response(data, status=status.HTTP_201_CREATED)
+        return register_account(request)
 
 
 class CustomLoginView(ObtainAuthToken):
-    """API view to handle user login and return authentication token."""
+    """API view to handle user login and return authentication token.
+
+    ObtainAuthToken disables throttling, the login attempts of a client are
+    limited by the 'login' rate instead.
+    """
+    throttle_classes = api_settings.DEFAULT_THROTTLE_CLASSES
+    throttle_scope = 'login'
 
     def post(self, request):
         """Authenticate a user and return token and user profile data.
 
+        Guest logins (GuestBusiness, GuestCustomer) need no password and are
+        answered from memory, see user_auth_app/guests.py. The client is
+        pinned to the primary database with the returned token, so a
+        replica that has not received a new token yet does not reject it.
+
         Returns:
             Response: HTTP 200 with user data on success, or 400 with errors.
         """
         username = request.data.get('username')
-        if username == 'GuestBusiness':
-            return self.process_guest_business_reg_or_login(username, request)
-
-        if username == 'GuestCustomer':
-            return self.process_guest_customer_reg_or_login(username, request)
+        if is_guest(username):
+            return Response(guest_login_data(username), status=status.HTTP_200_OK)
 
         serializer = self.serializer_class(data=request.data)
         data = {}
         if serializer.is_valid():
             user = serializer.validated_data['user']
-            token, _ = Token.objects.get_or_create(user=user)
+            token = ExpiringToken.objects.for_login(user)
+            pin_client(f'Token {token.key}')
             data = fill_user_data_dict(token, user)
         else:
             data = {
@@ -67,52 +87,3 @@ class CustomLoginView(ObtainAuthToken):
             }
             return Response(data, status=status.HTTP_400_BAD_REQUEST)
         return Response(data, status=status.HTTP_200_OK)
-
-    def register_user(self, request):
-        serializer = UserRegistrationSerializer(
-            data=request.data, context={'type': request.data['type']})
-        if serializer.is_valid():
-            saved_account = serializer.save()
-            token, _ = Token.objects.get_or_create(user=saved_account)
-            data = fill_user_data_dict(token, saved_account)
-        else:
-            data = {
-                'error': serializer.errors
-            }
-            return Response(data, status=status.HTTP_400_BAD_REQUEST)
-        return Response(data, status=status.HTTP_201_CREATED)
-    
-
-    def process_guest_customer_reg_or_login(self, username, request):
-        """Handle registration or login for a guest customer user."""
-        try:
-            data = self.get_guest_customer_user_data(username)
-            return Response(data, status=status.HTTP_200_OK)
-        except User.DoesNotExist:
-            return self.register_user(request)
-    
-
-    def process_guest_business_reg_or_login(self, username, request):
-        """Handle registration or login for a guest business user."""
-        try:
-            data = self.get_guest_business_user_data(username)
-            return Response(data, status=status.HTTP_200_OK)
-        except User.DoesNotExist:
-            return self.register_user(request)
-
-    def get_guest_customer_user_data(self, username):
-        """Return data dict for an existing guest customer user."""
-        guest_customer_user = User.objects.get(username=username)
-        token, _ = Token.objects.get_or_create(user=guest_customer_user)
-        data = guest_user_data_dict(
-            token, guest_customer_user)
-        return data
-    
-
-    def get_guest_business_user_data(self, username):
-        """Return data dict for an existing guest business user."""
-        guest_business_user = User.objects.get(username=username)
-        token, created = Token.objects.get_or_create(user=guest_business_user)
-        data = guest_user_data_dict(
-            token, guest_business_user)
-        return data
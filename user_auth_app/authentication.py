@@ -0,0 +1,138 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from .models import ExpiringToken
+
+"""
+Authentication with ExpiringTokens.
+
+Validated tokens (with their user) are kept in process memory for
+TOKEN_CACHE_SECONDS, at most TOKEN_CACHE_SIZE of them (least recently used
+are dropped first), so repeated requests with the same token need no query.
+Deleting a token or changing a user drops the cached entries right away in
+the same process (see user_auth_app/signals.py), other processes see the
+change after TOKEN_CACHE_SECONDS at the latest. Expiry is checked on every
+request.
+
+`last_used` is written at most once per TOKEN_LAST_USED_INTERVAL seconds per
+token instead of on every request.
+"""
+
+_tokens = OrderedDict()
+_tokens_lock = threading.Lock()
+
+
+def _cached_token(key):
+    with _tokens_lock:
+        entry = _tokens.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _tokens[key]
+            return None
+        _tokens.move_to_end(key)
+        return entry[1]
+
+
+def _remember_token(token):
+    expires = time.monotonic() + getattr(settings, 'TOKEN_CACHE_SECONDS', 60)
+    with _tokens_lock:
+        _tokens[token.key] = (expires, token)
+        _tokens.move_to_end(token.key)
+        while len(_tokens) > getattr(settings, 'TOKEN_CACHE_SIZE', 10000):
+            _tokens.popitem(last=False)
+
+
+def forget_tokens(key=None, user_id=None):
+    """
+    Drop a token, all tokens of a user, or (without arguments) all tokens
+    from the cache.
+    """
+    with _tokens_lock:
+        if key is None and user_id is None:
+            _tokens.clear()
+        elif key is not None:
+            _tokens.pop(key, None)
+        else:
+            for cached_key, (_, token) in list(_tokens.items()):
+                if token.user_id == user_id:
+                    del _tokens[cached_key]
+
+
+def _check_token(token):
+    """
+    Raise AuthenticationFailed for expired tokens and inactive users and
+    return (user, token). The user is a copy, so requests do not share
+    the cached instance.
+    """
+    if token.is_expired:
+        forget_tokens(key=token.key)
+        raise exceptions.AuthenticationFailed('Token has expired.')
+    if not token.user.is_active:
+        raise exceptions.AuthenticationFailed('User inactive or deleted.')
+    return copy.copy(token.user), token
+
+
+def _last_used_outdated(token, now):
+    interval = timedelta(seconds=getattr(settings, 'TOKEN_LAST_USED_INTERVAL', 300))
+    return token.last_used is None or now - token.last_used >= interval
+
+
+def authenticate_key(key):
+    """
+    Return (user, token) for a token key.
+
+    Raises:
+        AuthenticationFailed: If the token is unknown or expired, or the user
+            is inactive (messages as TokenAuthentication).
+    """
+    token = _cached_token(key)
+    if token is None:
+        token = ExpiringToken.objects.select_related('user').filter(key=key).first()
+        if token is None:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        _remember_token(token)
+    user, token = _check_token(token)
+
+    now = timezone.now()
+    if _last_used_outdated(token, now):
+        token.last_used = now
+        ExpiringToken.objects.filter(key=key).update(last_used=now)
+    return user, token
+
+
+async def aauthenticate_key(key):
+    """
+    Async variant of authenticate_key().
+    """
+    token = _cached_token(key)
+    if token is None:
+        token = await ExpiringToken.objects.select_related('user').filter(key=key).afirst()
+        if token is None:
+            raise exceptions.AuthenticationFailed('Invalid token.')
+        _remember_token(token)
+    user, token = _check_token(token)
+
+    now = timezone.now()
+    if _last_used_outdated(token, now):
+        token.last_used = now
+        await ExpiringToken.objects.filter(key=key).aupdate(last_used=now)
+    return user, token
+
+
+class ExpiringTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication with ExpiringTokens, see the module docstring.
+    """
+    model = ExpiringToken
+
+    def authenticate_credentials(self, key):
+        return authenticate_key(key)
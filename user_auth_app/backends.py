@@ -0,0 +1,57 @@
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+from core.password_hashing import averify_password, make_password, verify_password
+
+UserModel = get_user_model()
+
+
+class PooledModelBackend(ModelBackend):
+    """
+    ModelBackend that checks passwords on the password hashing pool
+    (see core/password_hashing.py) instead of the request thread.
+
+    Only the hash runs on the pool, the user is loaded and an outdated hash
+    is upgraded on the calling thread, so no database connection is opened
+    by the pool threads.
+    """
+
+    def authenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = UserModel._default_manager.get_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            # Hash once anyway, so unknown usernames take as long as wrong passwords.
+            verify_password(password, '')
+            return None
+        is_correct, must_update = verify_password(password, user.password)
+        if not is_correct or not self.user_can_authenticate(user):
+            return None
+        if must_update:
+            self.upgrade_password(user, make_password(password))
+        return user
+
+    async def aauthenticate(self, request, username=None, password=None, **kwargs):
+        if username is None:
+            username = kwargs.get(UserModel.USERNAME_FIELD)
+        if username is None or password is None:
+            return None
+        try:
+            user = await UserModel._default_manager.aget_by_natural_key(username)
+        except UserModel.DoesNotExist:
+            await averify_password(password, '')
+            return None
+        is_correct, _ = await averify_password(password, user.password)
+        if is_correct and self.user_can_authenticate(user):
+            return user
+        return None
+
+    def upgrade_password(self, user, encoded):
+        """
+        Store a hash computed with the current hasher and work factor.
+        """
+        user.password = encoded
+        user.save(update_fields=['password'])
@@ -0,0 +1,163 @@
+import threading
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from offers_app.models import Offer
+from orders_app.models import Order
+from profile_app.models import UserProfile
+from reviews_app.models import Review
+from .api.functions import guest_user_data_dict
+from .models import ExpiringToken
+
+"""
+Guest accounts of the demo login.
+
+The frontend logs in as GuestBusiness or GuestCustomer without a password.
+The accounts are created by `python manage.py provision_guests` (or on the
+first guest login) with an unusable password, and the login response of each
+guest is kept in process memory, so a guest login costs no query and no
+password hash.
+
+Cached responses expire after GUEST_LOGIN_CACHE_SECONDS and are dropped
+right away in the process that changes or deletes a guest user or token
+(see user_auth_app/signals.py), and never outlive the token they contain.
+Resetting the demo data keeps the users and tokens, so cached responses stay
+valid.
+"""
+
+GUEST_ACCOUNTS = {
+    'GuestBusiness': {
+        'type': 'business',
+        'first_name': 'Guest',
+        'last_name': 'Business',
+        'email': 'guest.business@coderr.example',
+    },
+    'GuestCustomer': {
+        'type': 'customer',
+        'first_name': 'Guest',
+        'last_name': 'Customer',
+        'email': 'guest.customer@coderr.example',
+    },
+}
+
+# Profile fields a guest may have edited, restored by reset_guest_data().
+_PROFILE_DEFAULTS = {
+    'file': None,
+    'location': '',
+    'tel': '',
+    'description': '',
+    'working_hours': '',
+}
+
+_login_data = {}
+_login_data_lock = threading.Lock()
+
+
+def is_guest(username):
+    return username in GUEST_ACCOUNTS
+
+
+def guest_login_data(username):
+    """
+    Return the login response data of a guest, from memory if possible.
+    Creates the guest account if it does not exist yet.
+    """
+    cached = _login_data.get(username)
+    if cached is not None and cached[0] > time.monotonic():
+        return cached[1]
+
+    user = User.objects.filter(username=username).first()
+    token = provision_guest(username) if user is None else ExpiringToken.objects.for_login(user)
+    data = guest_user_data_dict(token, token.user)
+    # Never hand out a token from memory after it expired.
+    lifetime = (token.expires - timezone.now()).total_seconds()
+    expires = time.monotonic() + min(getattr(settings, 'GUEST_LOGIN_CACHE_SECONDS', 300), lifetime)
+    with _login_data_lock:
+        _login_data[username] = (expires, data)
+    return data
+
+
+def forget_guest_login_data(user_id=None):
+    """
+    Drop the cached login data of the guest with the user id, or of all
+    guests.
+    """
+    with _login_data_lock:
+        for username, (_, data) in list(_login_data.items()):
+            if user_id is None or data['user_id'] == user_id:
+                del _login_data[username]
+
+
+def provision_guest(username):
+    """
+    Create or complete the user, profile and token of a guest account.
+
+    Returns:
+        ExpiringToken: A valid token of the guest, with the user attached.
+    """
+    account = GUEST_ACCOUNTS[username]
+    with transaction.atomic():
+        user, _ = User.objects.get_or_create(username=username, defaults={
+            'first_name': account['first_name'],
+            'last_name': account['last_name'],
+            'email': account['email'],
+            'password': make_password(None),
+        })
+        UserProfile.objects.get_or_create(user=user, defaults={
+            'username': username,
+            'first_name': user.first_name,
+            'last_name': user.last_name,
+            'email': user.email,
+            'type': account['type'],
+        })
+        token = ExpiringToken.objects.for_login(user)
+    return token
+
+
+def provision_guests():
+    """
+    Create all missing guest accounts.
+
+    Returns:
+        list: The usernames of the guest accounts.
+    """
+    for username in GUEST_ACCOUNTS:
+        provision_guest(username)
+    return list(GUEST_ACCOUNTS)
+
+
+def reset_guest_data():
+    """
+    Delete everything the guests created (offers, orders, reviews) and
+    restore their names and profiles. Users and tokens are kept, so logged
+    in demo sessions continue to work. Other users are not changed; their
+    rating summaries are updated for deleted guest reviews.
+
+    Returns:
+        dict: Number of deleted rows per model label.
+    """
+    guest_ids = list(User.objects.filter(username__in=GUEST_ACCOUNTS).values_list('id', flat=True))
+    deleted = {}
+    with transaction.atomic():
+        for queryset in (
+            Review.objects.filter(Q(reviewer__in=guest_ids) | Q(business_user__in=guest_ids)),
+            Order.objects.filter(Q(customer_user__in=guest_ids) | Q(business_user__in=guest_ids)),
+            Offer.objects.filter(user__in=guest_ids),
+        ):
+            _, per_model = queryset.delete()
+            for label, count in per_model.items():
+                deleted[label] = deleted.get(label, 0) + count
+
+        for username, account in GUEST_ACCOUNTS.items():
+            names = {key: account[key] for key in ('first_name', 'last_name', 'email')}
+            User.objects.filter(username=username).update(**names)
+            UserProfile.objects.filter(user__username=username).update(
+                username=username, type=account['type'], **names, **_PROFILE_DEFAULTS)
+    forget_guest_login_data()
+    return deleted
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.1 on 2026-10-19 10:02
+
+from django.db import migrations, models
+from django.db.models.functions import Lower
+
+
+def check_duplicate_emails(apps, schema_editor):
+    """
+    Stop before creating the index if two accounts share an email address
+    (ignoring case), these have to be merged or changed by hand.
+    """
+    User = apps.get_model('auth', 'User')
+    duplicates = list(
+        User.objects.exclude(email='').order_by()
+        .values(email_lower=Lower('email'))
+        .annotate(count=models.Count('id'))
+        .filter(count__gt=1)
+        .values_list('email_lower', flat=True)
+    )
+    if duplicates:
+        raise RuntimeError(
+            'Email addresses used by several accounts: ' + ', '.join(duplicates))
+
+
+class Migration(migrations.Migration):
+    """
+    Case-insensitive unique index on the email of auth.User. Accounts
+    without email are not indexed.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicate_emails, migrations.RunPython.noop),
+        migrations.RunSQL(
+            "CREATE UNIQUE INDEX auth_user_email_lower_uniq ON auth_user (LOWER(email)) WHERE email <> ''",
+            "DROP INDEX auth_user_email_lower_uniq",
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.2.1 on 2026-10-19 08:48
+
+import django.db.models.deletion
+import user_auth_app.models
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def copy_authtoken_tokens(apps, schema_editor):
+    """
+    Keep existing sessions: every rest_framework token becomes an expiring
+    token with the same key, valid for a full lifetime from now on.
+    """
+    Token = apps.get_model('authtoken', 'Token')
+    ExpiringToken = apps.get_model('user_auth_app', 'ExpiringToken')
+    # Keep the creation dates (historical model, nothing else is affected).
+    ExpiringToken._meta.get_field('created').auto_now_add = False
+    expires = timezone.now() + user_auth_app.models.token_lifetime()
+    tokens = Token.objects.order_by('created').values_list('key', 'user_id', 'created').iterator(chunk_size=2000)
+    batch = []
+    for key, user_id, created in tokens:
+        batch.append(ExpiringToken(key=key, user_id=user_id, created=created, expires=expires))
+        if len(batch) >= 2000:
+            ExpiringToken.objects.bulk_create(batch)
+            batch = []
+    ExpiringToken.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth_app', '0001_user_email_lower_unique'),
+        ('authtoken', '0004_alter_tokenproxy_options'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExpiringToken',
+            fields=[
+                ('key', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('last_used', models.DateTimeField(blank=True, null=True)),
+                ('expires', models.DateTimeField(db_index=True, default=user_auth_app.models.default_expiry)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='auth_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Token',
+                'verbose_name_plural': 'Tokens',
+                'indexes': [models.Index(fields=['user', '-created'], name='token_user_created_idx')],
+            },
+        ),
+        migrations.RunPython(copy_authtoken_tokens, migrations.RunPython.noop),
+    ]
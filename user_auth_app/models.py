@@ -1,6 +1,80 @@
-from django.db import models
+import secrets
+from datetime import timedelta
+
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
+
+
+def token_lifetime():
+    return timedelta(seconds=getattr(settings, 'TOKEN_TTL_SECONDS', 14 * 24 * 3600))
+
+
+def default_expiry():
+    return timezone.now() + token_lifetime()
+
+
+class ExpiringTokenQuerySet(models.QuerySet):
+
+    def valid(self):
+        return self.filter(expires__gt=timezone.now())
+
+    def expired(self):
+        return self.filter(expires__lte=timezone.now())
+
+
+class ExpiringTokenManager(models.Manager.from_queryset(ExpiringTokenQuerySet)):
+
+    def for_login(self, user):
+        """
+        Return the newest valid token of the user if it was issued less than
+        TOKEN_ROTATION_SECONDS ago, otherwise issue a new one. Older tokens
+        stay valid until they expire, so other devices stay logged in.
+        """
+        rotation = timedelta(seconds=getattr(settings, 'TOKEN_ROTATION_SECONDS', 24 * 3600))
+        token = (
+            self.filter(user=user, created__gt=timezone.now() - rotation)
+            .valid().order_by('-created').first()
+        )
+        if token is None:
+            return self.create(user=user)
+        token.user = user
+        return token
+
+
+class ExpiringToken(models.Model):
+    """Authentication token with an expiry date.
+
+    Replaces the never expiring rest_framework.authtoken Token. The key is
+    the primary key, so the lookup of every authenticated request is a
+    primary key lookup; `expires` is indexed for the purge_tokens command.
+    `last_used` is written at most once per TOKEN_LAST_USED_INTERVAL (see
+    user_auth_app/authentication.py).
+    """
+    key = models.CharField(max_length=40, primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='auth_tokens')
+    created = models.DateTimeField(auto_now_add=True)
+    last_used = models.DateTimeField(null=True, blank=True)
+    expires = models.DateTimeField(default=default_expiry, db_index=True)
+
+    objects = ExpiringTokenManager()
+
+    class Meta:
+        verbose_name = 'Token'
+        verbose_name_plural = 'Tokens'
+        indexes = [
+            models.Index(fields=['user', '-created'], name='token_user_created_idx'),
+        ]
 
-# Create your models here.
+    def save(self, *args, **kwargs):
+        if not self.key:
+            self.key = secrets.token_hex(20)
+        return super().save(*args, **kwargs)
 
+    @property
+    def is_expired(self):
+        return self.expires <= timezone.now()
 
+    def __str__(self):
+        return self.key
@@ -0,0 +1,27 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import forget_tokens
+from .guests import forget_guest_login_data
+from .models import ExpiringToken
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_changed_user(sender, instance, **kwargs):
+    """
+    Drop the cached tokens and guest login data of a changed or deleted user.
+    """
+    forget_tokens(user_id=instance.pk)
+    forget_guest_login_data(instance.pk)
+
+
+@receiver(post_save, sender=ExpiringToken)
+@receiver(post_delete, sender=ExpiringToken)
+def forget_changed_token(sender, instance, **kwargs):
+    """
+    Drop a changed or deleted token from the caches.
+    """
+    forget_tokens(key=instance.key)
+    forget_guest_login_data(instance.user_id)
@@ -1,3 +1,184 @@
-from django.test import TestCase
+import threading
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.password_hashing import PasswordHashingBusy, PasswordHashingPool, get_hashing_pool
+from offers_app.models import Offer
+from profile_app.models import UserProfile
+from user_auth_app.guests import forget_guest_login_data, provision_guests, reset_guest_data
+from user_auth_app.authentication import authenticate_key, forget_tokens
+from user_auth_app.models import ExpiringToken
+
+
+class RegistrationLoginTest(APITestCase):
+
+    def register(self, username, email):
+        return self.client.post(reverse('registration'), {
+            'username': username,
+            'email': email,
+            'password': 'secret-pass',
+            'repeated_password': 'secret-pass',
+            'type': 'business',
+        }, format='json')
+
+    def test_registration_creates_user_profile_and_token(self):
+        response = self.register('anna', 'Anna@Example.com')
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        user = User.objects.get(username='anna')
+        self.assertEqual(response.data['token'], ExpiringToken.objects.get(user=user).key)
+        self.assertEqual(UserProfile.objects.get(user=user).type, 'business')
+        self.assertTrue(user.check_password('secret-pass'))
+
+    def test_email_is_unique_ignoring_case(self):
+        self.register('anna', 'Anna@Example.com')
+        response = self.register('anna2', 'anna@example.COM')
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error']['non_field_errors'], ['Email already exist'])
+        self.assertFalse(User.objects.filter(username='anna2').exists())
+
+    def test_login(self):
+        self.register('anna', 'anna@example.com')
+        url = reverse('login')
+
+        response = self.client.post(url, {'username': 'anna', 'password': 'secret-pass'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['username'], 'anna')
+
+        response = self.client.post(url, {'username': 'anna', 'password': 'wrong'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    @override_settings(PASSWORD_HASHING_WORKERS=1, PASSWORD_HASHING_QUEUE=0,
+                       PASSWORD_HASHING_WAIT_SECONDS=0.01)
+    def test_full_hashing_pool_answers_503(self):
+        release = threading.Event()
+        busy = get_hashing_pool().submit(release.wait)
+        try:
+            response = self.client.post(
+                reverse('login'), {'username': 'anna', 'password': 'secret-pass'}, format='json')
+        finally:
+            release.set()
+            busy.result()
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '1')
+
+
+class PasswordHashingPoolTest(APITestCase):
+
+    def test_pool_rejects_work_beyond_workers_and_queue(self):
+        pool = PasswordHashingPool(workers=1, queue_size=1, wait_seconds=0.01)
+        release = threading.Event()
+        running = pool.submit(release.wait)
+        queued = pool.submit(lambda: 'queued')
+
+        with self.assertRaises(PasswordHashingBusy):
+            pool.submit(lambda: 'rejected')
+
+        release.set()
+        running.result()
+        self.assertEqual(queued.result(), 'queued')
+        self.assertEqual(pool.run(lambda: 'after'), 'after')
+        pool.shutdown()
+
+
+class GuestLoginTest(APITestCase):
+
+    def setUp(self):
+        forget_guest_login_data()
+        provision_guests()
+
+    def login(self, username):
+        return self.client.post(reverse('login'), {'username': username}, format='json')
+
+    def test_guest_login_is_served_from_memory(self):
+        response = self.login('GuestBusiness')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        guest = User.objects.get(username='GuestBusiness')
+        self.assertEqual(response.data['token'], ExpiringToken.objects.get(user=guest).key)
+        self.assertFalse(guest.has_usable_password())
+        self.assertEqual(guest.profile.type, 'business')
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.login('GuestBusiness').data, response.data)
+
+    def test_new_token_is_not_served_from_memory(self):
+        self.login('GuestCustomer')
+        guest = User.objects.get(username='GuestCustomer')
+        ExpiringToken.objects.filter(user=guest).delete()
+        ExpiringToken.objects.create(user=guest)
+
+        response = self.login('GuestCustomer')
+        self.assertEqual(response.data['token'], ExpiringToken.objects.get(user=guest).key)
+
+    def test_reset_deletes_guest_data_only(self):
+        guest = User.objects.get(username='GuestBusiness')
+        other = User.objects.create_user(username='real', password='secret-pass')
+        Offer.objects.create(user=guest, title='Guest offer', description='Demo')
+        Offer.objects.create(user=other, title='Real offer', description='Real')
+        UserProfile.objects.filter(user=guest).update(location='Somewhere')
+
+        reset_guest_data()
+
+        self.assertEqual(list(Offer.objects.values_list('title', flat=True)), ['Real offer'])
+        self.assertEqual(UserProfile.objects.get(user=guest).location, '')
+        self.assertTrue(ExpiringToken.objects.filter(user=guest).exists())
+
+
+class ExpiringTokenTest(APITestCase):
+
+    def setUp(self):
+        forget_tokens()
+        self.user = User.objects.create_user(username='anna', password='secret-pass')
+        UserProfile.objects.create(user=self.user, username='anna', type='customer')
+        self.token = ExpiringToken.objects.create(user=self.user)
+
+    def get_orders(self, token):
+        return self.client.get(reverse('orders-list'), HTTP_AUTHORIZATION=f'Token {token.key}')
+
+    def test_expired_token_is_rejected(self):
+        self.assertEqual(self.get_orders(self.token).status_code, status.HTTP_200_OK)
+
+        self.token.expires = timezone.now() - timedelta(seconds=1)
+        self.token.save()
+        self.assertEqual(self.get_orders(self.token).status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_cached_lookup_writes_last_used_once_per_interval(self):
+        authenticate_key(self.token.key)
+        first_use = ExpiringToken.objects.get(key=self.token.key).last_used
+        self.assertIsNotNone(first_use)
+
+        with self.assertNumQueries(0):
+            user, _ = authenticate_key(self.token.key)
+        self.assertEqual(user, self.user)
+        self.assertEqual(ExpiringToken.objects.get(key=self.token.key).last_used, first_use)
+
+    def test_login_reuses_recent_token(self):
+        response = self.client.post(
+            reverse('login'), {'username': 'anna', 'password': 'secret-pass'}, format='json')
+        self.assertEqual(response.data['token'], self.token.key)
+
+        ExpiringToken.objects.filter(key=self.token.key).update(
+            created=timezone.now() - timedelta(days=2))
+        response = self.client.post(
+            reverse('login'), {'username': 'anna', 'password': 'secret-pass'}, format='json')
+        self.assertNotEqual(response.data['token'], self.token.key)
+        self.assertEqual(ExpiringToken.objects.filter(user=self.user).count(), 2)
+
+    def test_purge_deletes_expired_tokens(self):
+        expired = ExpiringToken.objects.create(
+            user=self.user, expires=timezone.now() - timedelta(days=1))
+
+        call_command('purge_tokens', chunk_size=1, sleep=0, stdout=StringIO())
+
+        self.assertFalse(ExpiringToken.objects.filter(key=expired.key).exists())
+        self.assertTrue(ExpiringToken.objects.filter(key=self.token.key).exists())